@@ -1,6 +1,15 @@
+"""
+新闻机器人 Serverless 入口（Vercel Cron 调用）
+
+冷启动时只导入标准库；首次请求才导入 enhanced_newsbot 并创建机器人实例，
+之后同一容器内的请求复用这个实例（连接池、限速器、翻译缓存、本地数据库
+连接保持打开），不再重复初始化。鉴权失败的请求不会触发任何导入。
+"""
+
 import json
 import os
 import sys
+import threading
 from http.server import BaseHTTPRequestHandler
 from typing import Any, Dict
 
@@ -11,22 +20,25 @@ SRC_LIB_PATH = os.path.join(PROJECT_ROOT, "src", "lib")
 if SRC_LIB_PATH not in sys.path:
     sys.path.append(SRC_LIB_PATH)
 
-try:
-    from enhanced_newsbot import EnhancedNewsBot
-except Exception as import_error:  # pragma: no cover - defensive logging for deployment issues
-    EnhancedNewsBot = None  # type: ignore
-    _IMPORT_ERROR = import_error
-else:
-    _IMPORT_ERROR = None
+_bot = None  # 同一容器内复用的机器人实例
+_bot_lock = threading.Lock()  # 同一实例不并发运行
 
 
-def _run_newsbot() -> Dict[str, Any]:
-    if EnhancedNewsBot is None:
-        raise RuntimeError(f"无法导入新闻机器人模块: {_IMPORT_ERROR}")
+def _get_bot():
+    """首次调用时导入模块并创建机器人；创建失败不缓存，下次请求重试"""
+    global _bot
+    if _bot is None:
+        try:
+            from enhanced_newsbot import EnhancedNewsBot
+        except Exception as import_error:  # pragma: no cover - defensive logging for deployment issues
+            raise RuntimeError(f"无法导入新闻机器人模块: {import_error}") from import_error
+        _bot = EnhancedNewsBot()
+    return _bot
+
 
-    bot = EnhancedNewsBot()
-    result = bot.run_once()
-    return result
+def _run_newsbot() -> Dict[str, Any]:
+    with _bot_lock:
+        return _get_bot().run_once()
 
 
 class handler(BaseHTTPRequestHandler):
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+正文提取基准测试
+在保存的新闻页面上比较各 HTML 解析后端的耗时，并检查输出与原实现一致
+
+运行方式:
+python benchmarks/bench_extract.py [--repeat 20] [--backend selectolax --backend bs4]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "src", "lib"))
+
+from newsbot_extract import CONTENT_SELECTORS, available_backends, extract_text, get_backend  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "html")
+
+
+def baseline_extract(html: bytes) -> str:
+    """原先 EnhancedNewsBot._parse_article_html 的实现：完整 html.parser 解析"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for script in soup(["script", "style", "nav", "footer", "aside"]):
+        script.decompose()
+
+    for selector in CONTENT_SELECTORS:
+        elements = soup.select(selector)
+        if elements:
+            return ' '.join([elem.get_text().strip() for elem in elements])
+
+    paragraphs = soup.find_all('p')
+    return ' '.join([p.get_text().strip() for p in paragraphs[:10]])
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def _time(func, repeat: int) -> float:
+    """返回单次调用的最短耗时（毫秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="正文提取后端基准测试")
+    parser.add_argument("--repeat", type=int, default=20, help="每个页面的重复次数")
+    parser.add_argument("--backend", action="append", help="只测试指定后端（可重复）")
+    args = parser.parse_args()
+
+    backends = args.backend or available_backends()
+    pages = {
+        name: open(os.path.join(FIXTURES, name), 'rb').read()
+        for name in sorted(os.listdir(FIXTURES)) if name.endswith('.html')
+    }
+
+    columns = ["baseline"] + backends
+    print(f"{'页面':<22}{'大小':>8}" + ''.join(f"{name:>12}" for name in columns))
+    totals = dict.fromkeys(columns, 0.0)
+    mismatches = []
+
+    for name, html in pages.items():
+        expected = _normalize(baseline_extract(html))
+        timings = {"baseline": _time(lambda: baseline_extract(html), args.repeat)}
+        for backend_name in backends:
+            backend = get_backend(backend_name)
+            if _normalize(extract_text(html, CONTENT_SELECTORS, backend)) != expected:
+                mismatches.append((name, backend_name))
+            timings[backend_name] = _time(lambda: extract_text(html, CONTENT_SELECTORS, backend), args.repeat)
+
+        for column in columns:
+            totals[column] += timings[column]
+        print(f"{name:<22}{len(html) // 1024:>6}KB" + ''.join(f"{timings[c]:>10.2f}ms" for c in columns))
+
+    print(f"{'合计':<22}{'':>8}" + ''.join(f"{totals[c]:>10.2f}ms" for c in columns))
+    print(f"{'相对 baseline':<22}{'':>8}" + ''.join(f"{totals['baseline'] / totals[c]:>11.1f}x" for c in columns))
+
+    if mismatches:
+        print("⚠️ 以下页面的提取结果与原实现不一致:")
+        for name, backend_name in mismatches:
+            print(f"   {name} ({backend_name})")
+        sys.exit(1)
+    print("✅ 所有后端的提取结果与原实现一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+新闻机器人冷启动基准测试
+在全新的解释器进程中测量 Serverless 入口的导入耗时与首次创建机器人的耗时，
+并用 ``-X importtime`` 列出其中耗时最多的顶层导入；可为各项设置预算
+（毫秒），超出时以非零状态退出。
+
+测量项:
+- handler: 导入 api/newsbot_python（Vercel 冷启动时执行的部分）
+- newsbot: 导入 enhanced_newsbot
+- bot: 导入入口并创建机器人实例（首次请求时的初始化，不含网络请求）
+
+运行方式:
+python benchmarks/bench_import.py [--repeat 5] [--top 8]
+python benchmarks/bench_import.py --budget handler=80 --budget bot=800 --json import.json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(ROOT)
+PATHS = [os.path.join(PROJECT_ROOT, "api"), os.path.join(PROJECT_ROOT, "src", "lib")]
+
+TARGETS = {
+    'handler': "import newsbot_python",
+    'newsbot': "import enhanced_newsbot",
+    'bot': "import newsbot_python; newsbot_python._get_bot()",
+}
+
+# 创建机器人只需要环境变量格式正确，不会连接这些地址
+BOT_ENV = {
+    'SUPABASE_URL': 'http://127.0.0.1:9',
+    'SUPABASE_SERVICE_ROLE_KEY': 'eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.bench',
+    'NEWS_BOT_USER_ID': '00000000-0000-0000-0000-000000000000',
+    'DEEPSEEK_API_KEY': 'bench',
+}
+
+_SCRIPT = """
+import sys, time
+sys.path[:0] = {paths!r}
+start = time.perf_counter()
+{statement}
+print("elapsed_ms=%.3f" % ((time.perf_counter() - start) * 1000))
+"""
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def run_target(statement: str, env: Dict[str, str], importtime: bool = False) -> Tuple[float, str]:
+    """在新进程中执行一次，返回 (耗时毫秒, -X importtime 输出)"""
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + \
+        ['-c', _SCRIPT.format(paths=PATHS, statement=statement)]
+    result = subprocess.run(command, env=env, capture_output=True, text=True, check=True)
+    elapsed = re.search(r'elapsed_ms=([\d.]+)', result.stdout)
+    return float(elapsed.group(1)), result.stderr
+
+
+def heaviest_imports(importtime_output: str, top: int) -> List[Tuple[str, float]]:
+    """被测语句直接触发的导入（不含解释器启动时的 site 等），按累计耗时排序"""
+    lines = importtime_output.splitlines()
+    # 解释器启动阶段的导入在 site 之前（含 site 本身）
+    start = next((i + 1 for i, line in enumerate(lines) if line.endswith('| site')), 0)
+    entries = []
+    for line in lines[start:]:
+        match = _IMPORTTIME_RE.match(line)
+        if match and len(match.group(3)) == 1:
+            entries.append((match.group(4), int(match.group(2)) / 1000))
+    return sorted(entries, key=lambda item: -item[1])[:top]
+
+
+def measure(repeat: int = 5, top: int = 8, targets: Dict[str, str] = TARGETS) -> Dict[str, Dict]:
+    """各测量项的中位数/最大耗时与最重的导入"""
+    workdir = tempfile.mkdtemp(prefix="newsbot_import_")
+    env = dict(os.environ, **BOT_ENV, NEWSBOT_CACHE_DB=os.path.join(workdir, "cache.sqlite3"))
+    results = {}
+    for name, statement in targets.items():
+        run_target(statement, env)  # 先编译 .pyc，与部署后的情况一致
+        samples = [run_target(statement, env)[0] for _ in range(repeat)]
+        _, importtime = run_target(statement, env, importtime=True)
+        results[name] = {
+            'p50_ms': round(statistics.median(samples), 1),
+            'max_ms': round(max(samples), 1),
+            'heaviest': [{'module': module, 'ms': round(ms, 1)} for module, ms in heaviest_imports(importtime, top)]
+        }
+    return results
+
+
+def parse_budget(value: str) -> Tuple[str, float]:
+    name, _, budget = value.partition('=')
+    if name not in TARGETS:
+        raise argparse.ArgumentTypeError(f"未知的测量项: {name}（可选 {', '.join(TARGETS)}）")
+    return name, float(budget)
+
+
+def print_report(results: Dict[str, Dict]) -> None:
+    print(f"{'测量项':<10}{'p50':>10}{'最大':>10}   最重的导入")
+    for name, result in results.items():
+        heaviest = ", ".join(f"{item['module']} {item['ms']:.0f}ms" for item in result['heaviest'][:4])
+        print(f"{name:<10}{result['p50_ms']:>8.1f}ms{result['max_ms']:>8.1f}ms   {heaviest}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="新闻机器人冷启动（导入耗时）基准测试")
+    parser.add_argument("--repeat", type=int, default=5, help="每项测量的进程数")
+    parser.add_argument("--top", type=int, default=8, help="列出的最重导入个数")
+    parser.add_argument("--budget", action="append", type=parse_budget, default=[], metavar="NAME=MS",
+                        help="测量项的 p50 预算（毫秒，可重复）")
+    parser.add_argument("--json", help="把结果保存为 JSON")
+    args = parser.parse_args()
+
+    results = measure(args.repeat, args.top)
+    print_report(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 结果已保存到 {args.json}")
+
+    over = [(name, budget) for name, budget in args.budget if results[name]['p50_ms'] > budget]
+    for name, budget in over:
+        print(f"⚠️ {name} 耗时 {results[name]['p50_ms']:.1f}ms 超出预算 {budget:g}ms")
+    if over:
+        sys.exit(1)
+    if args.budget:
+        print("✅ 全部测量项在预算内")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+新闻机器人完整流程基准测试（离线）
+在本地模拟服务（见 mock_services.py）上重复执行 EnhancedNewsBot.run_once，
+报告每轮耗时的分位数、吞吐量（篇/秒）以及各阶段耗时；结果可保存为 JSON，
+并与之前保存的基线比较，超出容差时以非零状态退出，便于发现性能回退。
+
+每轮使用全新的本地缓存与空的模拟数据库，各轮互不影响；连接池与限速器
+在进程内共享，与常驻进程的情况一致。默认关闭同主机请求间隔与 AI 接口
+限速（所有模拟源都在 127.0.0.1 上），可用参数恢复。
+
+运行方式:
+python benchmarks/bench_pipeline.py [--sources 5] [--articles 4] [--runs 5] [--json result.json]
+python benchmarks/bench_pipeline.py --compare result.json --tolerance 0.2
+python benchmarks/bench_pipeline.py --llm-latency 1200,400 --set batch_translation=false
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(ROOT), "src", "lib"))
+
+from mock_services import add_latency_arguments, create_services  # noqa: E402
+
+# 模拟服务不校验密钥，Supabase 客户端只检查格式
+BENCH_ENV = {
+    'SUPABASE_SERVICE_ROLE_KEY': 'eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.bench',
+    'NEWS_BOT_USER_ID': '00000000-0000-0000-0000-000000000000',
+    'DEEPSEEK_API_KEY': 'bench',
+    'OPENAI_API_KEY': 'bench'
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """最近秩法分位数"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def parse_override(value: str):
+    """--set key=value，value 按 JSON 解析（解析失败时作为字符串）"""
+    key, _, raw = value.partition('=')
+    try:
+        return key, json.loads(raw)
+    except ValueError:
+        return key, raw
+
+
+def bench_config(args, cache_db_path: str) -> Dict:
+    config = {
+        'max_articles_per_source': args.articles,
+        'total_max_articles': args.sources * args.articles,
+        'per_host_delay': args.per_host_delay,
+        'translation_providers': args.providers,
+        'cache_db_path': cache_db_path,
+        'persist_metrics': False
+    }
+    if not args.rate_limits:
+        config['rate_limits'] = {provider: {'rpm': 0, 'tpm': 0} for provider in ('deepseek', 'openai')}
+    config.update(dict(parse_override(value) for value in args.set))
+    return config
+
+
+def run_once(bot_class, services, args, workdir: str, index: int) -> Dict:
+    services.reset()
+    cache_db_path = os.path.join(workdir, f"run_{index}.sqlite3")
+    bot = bot_class(config=bench_config(args, cache_db_path), news_sources=services.corpus.news_sources(services.url))
+
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+        stats = bot.run_once()
+    wall = time.perf_counter() - start
+
+    if not stats['success']:
+        print(output.getvalue()[-2000:])
+        raise RuntimeError(f"第 {index} 轮运行失败: {stats.get('error')}")
+    return {
+        'wall_s': round(wall, 3),
+        'articles_posted': stats['articles_posted'],
+        'throughput': round(stats['articles_posted'] / wall, 2) if wall else 0.0,
+        'stages': stats['metrics']['stages'],
+        'tokens': stats['metrics']['tokens'],
+        'requests': services.stats()
+    }
+
+
+def summarize(runs: List[Dict]) -> Dict:
+    walls = [run['wall_s'] for run in runs]
+    stages: Dict[str, Dict[str, List[float]]] = {}
+    for run in runs:
+        for name, stage in run['stages'].items():
+            values = stages.setdefault(name, {'count': [], 'p50_ms': [], 'p95_ms': [], 'max_ms': []})
+            for field in values:
+                values[field].append(stage[field])
+
+    requests: Dict[str, List[int]] = {}
+    for run in runs:
+        for name, value in run['requests'].items():
+            requests.setdefault(name, []).append(value)
+
+    return {
+        'runs': len(runs),
+        'wall_p50_s': round(percentile(walls, 0.5), 3),
+        'wall_p95_s': round(percentile(walls, 0.95), 3),
+        'wall_max_s': round(max(walls), 3),
+        'throughput': round(statistics.mean(run['throughput'] for run in runs), 2),
+        'articles_posted': round(statistics.mean(run['articles_posted'] for run in runs), 1),
+        # 各阶段取各轮数值的中位数
+        'stages': {
+            name: {field: round(statistics.median(samples), 1) for field, samples in values.items()}
+            for name, values in stages.items()
+        },
+        'requests': {name: round(statistics.median(values)) for name, values in sorted(requests.items())}
+    }
+
+
+def print_report(args, runs: List[Dict], summary: Dict) -> None:
+    print(f"{'轮次':<6}{'耗时':>10}{'发帖':>8}{'吞吐':>12}{'AI请求':>10}")
+    for index, run in enumerate(runs, 1):
+        print(f"{index:<6}{run['wall_s']:>9.2f}s{run['articles_posted']:>8}{run['throughput']:>9.2f}篇/s"
+              f"{run['requests'].get('llm_requests', 0):>10}")
+
+    print(f"\n📊 {args.sources} 个源 × {args.articles} 篇，{summary['runs']} 轮:")
+    print(f"   单轮耗时 p50 {summary['wall_p50_s']:.2f}s / p95 {summary['wall_p95_s']:.2f}s / 最大 {summary['wall_max_s']:.2f}s")
+    print(f"   吞吐量 {summary['throughput']:.2f} 篇/秒（平均每轮发帖 {summary['articles_posted']:.1f} 篇）")
+
+    print(f"\n{'阶段':<18}{'次数':>8}{'p50':>10}{'p95':>10}{'最大':>10}")
+    for name, stage in sorted(summary['stages'].items(), key=lambda item: -item[1]['p95_ms']):
+        print(f"{name:<18}{stage['count']:>8.0f}{stage['p50_ms']:>8.1f}ms{stage['p95_ms']:>8.1f}ms{stage['max_ms']:>8.1f}ms")
+
+    print("\n模拟服务请求（每轮中位数）: " + ", ".join(f"{name} {value}" for name, value in summary['requests'].items()))
+
+
+def compare(summary: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """与基线比较，返回超出容差的指标说明"""
+    regressions = []
+    for field in ('wall_p50_s', 'wall_p95_s'):
+        if summary[field] > baseline[field] * (1 + tolerance):
+            regressions.append(f"{field}: {baseline[field]} → {summary[field]}")
+    if summary['throughput'] < baseline['throughput'] * (1 - tolerance):
+        regressions.append(f"throughput: {baseline['throughput']} → {summary['throughput']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="新闻机器人完整流程离线基准测试")
+    parser.add_argument("--sources", type=int, default=5, help="模拟新闻源个数 N")
+    parser.add_argument("--articles", type=int, default=4, help="每个源处理的文章数 M")
+    parser.add_argument("--runs", type=int, default=5, help="计入统计的轮数")
+    parser.add_argument("--warmup", type=int, default=1, help="预热轮数（不计入统计）")
+    parser.add_argument("--providers", nargs='+', default=['deepseek'], help="翻译服务优先级")
+    parser.add_argument("--per-host-delay", type=float, default=0.0, help="同一主机两次请求的最小间隔（秒）")
+    parser.add_argument("--rate-limits", action="store_true", help="保留默认的AI接口限速额度")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="覆盖机器人配置（可重复）")
+    parser.add_argument("--json", help="把结果保存为 JSON")
+    parser.add_argument("--compare", help="与之前保存的 JSON 结果比较")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="比较时允许的相对变化")
+    parser.add_argument("--verbose", action="store_true", help="显示机器人的运行输出")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    services = create_services(args).start()
+    os.environ.update(BENCH_ENV)
+    os.environ.update({
+        'SUPABASE_URL': services.url,
+        'DEEPSEEK_BASE_URL': services.url,
+        'OPENAI_BASE_URL': f"{services.url}/v1"
+    })
+    # 接口地址在模块加载时读取，需在设置环境变量之后导入
+    from enhanced_newsbot import EnhancedNewsBot
+
+    print(f"🧪 模拟服务 {services.url}: RSS {args.feed_latency}, 文章页 {args.article_latency}, "
+          f"AI接口 {args.llm_latency} + {args.llm_token_ms:g}ms/token, 数据库 {args.db_latency}")
+
+    workdir = tempfile.mkdtemp(prefix="newsbot_bench_")
+    try:
+        for index in range(args.warmup):
+            run_once(EnhancedNewsBot, services, args, workdir, -index - 1)
+        runs = [run_once(EnhancedNewsBot, services, args, workdir, index) for index in range(args.runs)]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        services.stop()
+
+    summary = summarize(runs)
+    print_report(args, runs, summary)
+
+    if args.json:
+        parameters = {key: value for key, value in vars(args).items() if key not in ('json', 'compare', 'verbose')}
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'parameters': parameters, 'summary': summary, 'runs': runs}, f,
+                      ensure_ascii=False, indent=2, default=repr)
+        print(f"💾 结果已保存到 {args.json}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['summary']
+        regressions = compare(summary, baseline, args.tolerance)
+        if regressions:
+            print(f"⚠️ 相比基线 {args.compare} 超出 {args.tolerance:.0%} 容差:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print(f"✅ 与基线 {args.compare} 相比在 {args.tolerance:.0%} 容差内")
+
+
+if __name__ == "__main__":
+    main()
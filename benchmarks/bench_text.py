@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+正文清理与关键词计数微基准
+在不同长度的真实正文上比较原实现（逐个 re.sub / 逐个关键词扫描）与
+newsbot_text.TextCleaner / KeywordCounter 的耗时，并检查结果一致
+
+运行方式:
+python benchmarks/bench_text.py [--repeat 2000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(ROOT), "src", "lib"))
+
+from newsbot_extract import CONTENT_SELECTORS, extract_text  # noqa: E402
+from newsbot_text import KeywordCounter, TextCleaner  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, "fixtures", "html")
+KEYWORDS = [
+    'politics', 'economy', 'technology', 'science', 'climate',
+    'international', 'global', 'world', 'breaking'
+]
+# 追加到正文末尾的典型页脚，使样板规则确实有内容可删
+FOOTER = "\n\n  Subscribe to our World newsletter.   Copyright 2024 Example News. All rights reserved. "
+
+
+def baseline_clean(text: str) -> str:
+    """原先 EnhancedNewsBot._clean_text 的实现"""
+    if not text:
+        return ""
+    text = re.sub(r'\s+', ' ', text).strip()
+    patterns_to_remove = [
+        r'subscribe to.*?newsletter',
+        r'follow us on.*?twitter',
+        r'copyright.*?\d{4}',
+        r'all rights reserved',
+        r'terms of use',
+        r'privacy policy'
+    ]
+    for pattern in patterns_to_remove:
+        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    return text.strip()
+
+
+def baseline_keywords(content: str) -> int:
+    """原先 _calculate_quality_score 中的关键词扫描"""
+    content_lower = content.lower()
+    return sum(1 for keyword in KEYWORDS if keyword in content_lower)
+
+
+def sample_texts():
+    """由保存的页面拼出三种典型长度的正文：RSS 描述、普通报道、长篇报道"""
+    corpus = []
+    for name in sorted(os.listdir(FIXTURES)):
+        if name.endswith('.html'):
+            with open(os.path.join(FIXTURES, name), 'rb') as f:
+                corpus.append(extract_text(f.read(), CONTENT_SELECTORS, max_paragraphs=50))
+    text = "\n\n".join(corpus)
+    while len(text) < 24000:
+        text += "\n\n" + text
+    return {
+        "1KB": text[:1000] + FOOTER,
+        "6KB": text[:6000] + FOOTER,
+        "24KB": text[:24000] + FOOTER,
+    }
+
+
+def _per_call_us(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=repeat, repeat=3)) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="正文清理与关键词计数微基准")
+    parser.add_argument("--repeat", type=int, default=2000, help="每项测试的调用次数")
+    args = parser.parse_args()
+
+    cleaner = TextCleaner()
+    counter = KeywordCounter(KEYWORDS)
+    mismatches = []
+
+    print(f"{'正文':<8}{'清理(原)':>12}{'清理(新)':>12}{'加速':>8}{'关键词(原)':>14}{'关键词(新)':>14}")
+    for label, text in sample_texts().items():
+        if cleaner.clean(text) != baseline_clean(text):
+            mismatches.append(f"{label} 清理")
+        if counter.count(text) != baseline_keywords(text):
+            mismatches.append(f"{label} 关键词")
+
+        old_clean = _per_call_us(lambda: baseline_clean(text), args.repeat)
+        new_clean = _per_call_us(lambda: cleaner.clean(text), args.repeat)
+        old_keywords = _per_call_us(lambda: baseline_keywords(text), args.repeat)
+        new_keywords = _per_call_us(lambda: counter.count(text), args.repeat)
+        print(f"{label:<8}{old_clean:>10.1f}us{new_clean:>10.1f}us{old_clean / new_clean:>7.1f}x"
+              f"{old_keywords:>12.1f}us{new_keywords:>12.1f}us")
+
+    if mismatches:
+        print(f"⚠️ 结果与原实现不一致: {', '.join(mismatches)}")
+        sys.exit(1)
+    print("✅ 结果与原实现一致")
+
+
+if __name__ == "__main__":
+    main()
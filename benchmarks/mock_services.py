@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+离线基准测试用的本地模拟服务
+在一个本地 HTTP 服务中同时模拟新闻机器人依赖的全部外部服务：
+
+- RSS 源与文章页：由 fixtures/rss 与 fixtures/html 中保存的真实格式页面生成，
+  每个源、每篇文章的正文各不相同（避免被去重逻辑过滤），页面结构保持原样
+- DeepSeek / OpenAI chat-completions 接口：返回伪中文译文，支持批量 JSON、
+  流式响应与 AI 摘要，响应耗时随输出 token 数增长
+- Supabase REST（PostgREST）：内存中的表，支持 select/insert/upsert 及 eq 过滤
+
+各类请求的耗时可分别配置（均值与抖动），便于复现线上的网络与接口延迟。
+
+单独运行（供手动调试）:
+python benchmarks/mock_services.py --port 8765 --sources 5 --articles 4
+"""
+
+import argparse
+import email.utils
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 模拟源使用的页面模板：RSS 与文章页来自同一媒体，提取规则与线上配置一致
+TEMPLATES = [
+    {
+        'id': 'bbc_world',
+        'name': 'BBC World News',
+        'extraction': {'selectors': ['[data-component="text-block"]']}
+    },
+    {
+        'id': 'guardian_world',
+        'name': 'Guardian World',
+        'extraction': {'selectors': ['.article-body-commercial-selector p', '.article-body'], 'max_paragraphs': 40}
+    },
+    {
+        'id': 'reuters_world',
+        'name': 'Reuters World',
+        'extraction': {'selectors': ['[data-testid^="paragraph-"]', '.StandardArticleBody_body']}
+    },
+]
+
+PLACES = [
+    'Geneva', 'Nairobi', 'Jakarta', 'Lima', 'Oslo', 'Seoul', 'Cairo', 'Madrid', 'Ottawa', 'Manila',
+    'Warsaw', 'Santiago', 'Hanoi', 'Lagos', 'Dublin', 'Athens', 'Doha', 'Quito', 'Tbilisi', 'Accra'
+]
+EXTRA_WORDS = """
+global world international economy politics technology science climate markets election government
+officials ministers parliament ceasefire negotiations sanctions investors inflation growth energy
+drought flooding storm satellite vaccine researchers universities hospitals exports shipping ports
+regional summit agreement opposition coalition budget currency farmers workers protest court ruling
+""".split()
+# 伪译文使用的常用汉字
+CJK_CHARS = "的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面而方后多定行学法所民得经十三之进着等部度家电力里如水化高自二理起小物现实加量都两体制机当使点从业本去把性好应开它合还因由其些然前外天政四日那社义事平形相全表间样与关各重新线内数正心反你明看原又么利比或但质气第向道命此变条只没结解问意建月公无系军很情者最立代想已通并提直题党程展五果料象员革位入常文总次品式活设及管特件长求老头基资边流路级少图山统接知较将组见计别她手角期根论运农指几九区强放决西被干做必战先回则任取据处理世车"
+SENTENCE_END_RE = re.compile(r'[.!?]+')
+WORD_RE = re.compile(r"[A-Za-z][A-Za-z'-]*")
+TEXT_NODE_RE = re.compile(r'>([^<]{40,})<')
+SCRIPT_RE = re.compile(r'(<script\b.*?</script>|<style\b.*?</style>)', re.S | re.I)
+ITEM_RE = re.compile(r'<item>.*?</item>', re.S)
+SUMMARY_MARKER = '【摘要】'
+
+
+class Latency:
+    """请求耗时：``mean_ms`` ± ``jitter_ms`` 内均匀分布"""
+
+    def __init__(self, mean_ms: float = 0, jitter_ms: float = 0):
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+
+    @classmethod
+    def parse(cls, value: str) -> "Latency":
+        """解析命令行参数 "200" 或 "200,50"（毫秒）"""
+        mean, _, jitter = value.partition(',')
+        return cls(float(mean), float(jitter or 0))
+
+    def sample(self, rng: random.Random) -> float:
+        """返回本次请求应等待的秒数"""
+        return max(0.0, rng.uniform(self.mean_ms - self.jitter_ms, self.mean_ms + self.jitter_ms)) / 1000
+
+    def __repr__(self):
+        return f"{self.mean_ms:g}±{self.jitter_ms:g}ms"
+
+
+def pseudo_translate(text: str) -> str:
+    """确定性的"伪译文"：每个英文单词映射为两个汉字，句末标点换成中文标点"""
+    parts = []
+    for sentence in SENTENCE_END_RE.split(text):
+        words = WORD_RE.findall(sentence)
+        if not words:
+            continue
+        chars = []
+        for word in words:
+            code = zlib.crc32(word.lower().encode())
+            chars.append(CJK_CHARS[code % len(CJK_CHARS)] + CJK_CHARS[(code >> 8) % len(CJK_CHARS)])
+            if len(chars) % 9 == 0:
+                chars.append('，')
+        parts.append(''.join(chars).rstrip('，') + '。')
+    return ''.join(parts)
+
+
+class FixtureCorpus:
+    """``sources`` 个模拟新闻源，每个源的 RSS 含 ``articles`` 个条目
+
+    源 ``k`` 使用第 ``k % 3`` 个媒体的 RSS 与文章页模板；文章页中较长的文本
+    节点替换为按 (源, 编号, seed) 确定生成的句子，页面大小与结构不变。
+    """
+
+    def __init__(self, sources: int = 5, articles: int = 4, seed: int = 0):
+        self.sources = sources
+        self.articles = articles
+        self.seed = seed
+        self._feeds = []
+        self._pages = []
+        vocabulary = set(EXTRA_WORDS)
+        for template in TEMPLATES:
+            with open(os.path.join(FIXTURES, "rss", f"{template['id']}.xml"), encoding='utf-8') as f:
+                self._feeds.append(f.read())
+            with open(os.path.join(FIXTURES, "html", f"{template['id']}.html"), encoding='utf-8', errors='replace') as f:
+                page = f.read()
+            self._pages.append(page)
+            for text in TEXT_NODE_RE.findall(SCRIPT_RE.sub('', page)):
+                vocabulary.update(word.lower() for word in WORD_RE.findall(text) if len(word) > 2)
+        self._vocabulary = sorted(vocabulary)
+        self._cache: Dict[Tuple[int, int], bytes] = {}
+        self._lock = threading.Lock()
+
+    def news_sources(self, base_url: str) -> List[Dict]:
+        """与模拟源对应的 ``news_sources`` 配置"""
+        sources = []
+        for k in range(self.sources):
+            template = TEMPLATES[k % len(TEMPLATES)]
+            sources.append({
+                'id': f"bench_{k}",
+                'name': f"{template['name']} #{k}",
+                'rss_url': f"{base_url}/feeds/{k}.xml",
+                'category': '国际新闻',
+                'enabled': True,
+                'extraction': template['extraction']
+            })
+        return sources
+
+    def feed(self, k: int, base_url: str) -> bytes:
+        """源 ``k`` 的 RSS：模板条目循环使用，链接指向本地文章页，发布时间为最近几小时内"""
+        xml = self._feeds[k % len(self._feeds)]
+        templates = ITEM_RE.findall(xml)
+        head, tail = xml[:xml.index('<item>')], xml[xml.rindex('</item>') + len('</item>'):]
+        place = PLACES[k % len(PLACES)]
+        now = time.time()
+        items = []
+        for i in range(self.articles):
+            item, cycle = templates[i % len(templates)], i // len(templates)
+            link = f"{base_url}/articles/{k}/{i}"
+            suffix = f" ({cycle + 1})" if cycle else ''
+            item = re.sub(r'(<title>(?:<!\[CDATA\[)?)(.*?)((?:\]\]>)?</title>)',
+                          lambda m: f"{m.group(1)}{place}: {m.group(2)}{suffix}{m.group(3)}", item, count=1, flags=re.S)
+            item = re.sub(r'<link>.*?</link>', f'<link>{link}</link>', item, count=1, flags=re.S)
+            item = re.sub(r'(<guid\b[^>]*>).*?(</guid>)', rf'\g<1>{link}\g<2>', item, count=1, flags=re.S)
+            item = re.sub(r'<pubDate>.*?</pubDate>',
+                          f'<pubDate>{email.utils.formatdate(now - (i + 1) * 600, usegmt=True)}</pubDate>', item, count=1)
+            items.append(item)
+        return (head + '\n'.join(items) + tail).encode('utf-8')
+
+    def article(self, k: int, i: int) -> bytes:
+        key = (k, i)
+        with self._lock:
+            page = self._cache.get(key)
+        if page is None:
+            page = self._render_article(k, i)
+            with self._lock:
+                self._cache[key] = page
+        return page
+
+    def _render_article(self, k: int, i: int) -> bytes:
+        rng = random.Random(f"{self.seed}:{k}:{i}")
+
+        def rewrite(match) -> str:
+            text = match.group(1)
+            if not text.strip():
+                return match.group(0)
+            return '>' + self._sentences(rng, len(text)) + '<'
+
+        parts = SCRIPT_RE.split(self._pages[k % len(self._pages)])
+        # split 的奇数位是 script/style 块，保持原样
+        html = ''.join(part if index % 2 else TEXT_NODE_RE.sub(rewrite, part) for index, part in enumerate(parts))
+        return html.encode('utf-8')
+
+    def _sentences(self, rng: random.Random, length: int) -> str:
+        sentences = []
+        total = 0
+        while total < length:
+            words = [rng.choice(self._vocabulary) for _ in range(rng.randint(8, 22))]
+            sentence = ' '.join(words).capitalize() + '.'
+            sentences.append(sentence)
+            total += len(sentence) + 1
+        return ' '.join(sentences)
+
+
+class MockServices:
+    """本地模拟服务；``latencies`` 的键为 feed / article / llm / db，``llm_token_ms`` 为每个输出 token 的生成耗时"""
+
+    def __init__(self, corpus: FixtureCorpus, latencies: Optional[Dict[str, Latency]] = None,
+                 llm_token_ms: float = 0.0, llm_error_rate: float = 0.0, seed: int = 0,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.corpus = corpus
+        self.latencies = latencies or {}
+        self.llm_token_ms = llm_token_ms
+        self.llm_error_rate = llm_error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.tables: Dict[str, List[Dict]] = {}
+        self.counts: Dict[str, int] = {}
+        self._next_id = 1
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.services = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockServices":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name="mock-services")
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self) -> None:
+        """清空模拟数据库与请求计数（每轮基准测试前调用）"""
+        with self._lock:
+            self.tables = {}
+            self.counts = {}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    def delay(self, route: str, extra: float = 0.0) -> None:
+        latency = self.latencies.get(route)
+        with self._lock:
+            seconds = latency.sample(self._rng) if latency else 0.0
+        if seconds + extra > 0:
+            time.sleep(seconds + extra)
+
+    def llm_fails(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.llm_error_rate
+
+    # Supabase 表操作
+    def select(self, table: str, filters: Dict[str, str]) -> List[Dict]:
+        with self._lock:
+            return [dict(row) for row in self.tables.get(table, []) if _matches(row, filters)]
+
+    def insert(self, table: str, rows: List[Dict], on_conflict: Optional[str] = None,
+               ignore_duplicates: bool = False) -> List[Dict]:
+        inserted = []
+        with self._lock:
+            stored = self.tables.setdefault(table, [])
+            for row in rows:
+                if on_conflict:
+                    existing = next((r for r in stored if r.get(on_conflict) == row.get(on_conflict)), None)
+                    if existing is not None:
+                        if not ignore_duplicates:
+                            existing.update(row)
+                            inserted.append(dict(existing))
+                        continue
+                row = dict(row)
+                row.setdefault('id', str(self._next_id))
+                row.setdefault('created_at', email.utils.formatdate(usegmt=True))
+                self._next_id += 1
+                stored.append(row)
+                inserted.append(dict(row))
+        return inserted
+
+    def update(self, table: str, filters: Dict[str, str], values: Dict) -> List[Dict]:
+        with self._lock:
+            rows = [row for row in self.tables.get(table, []) if _matches(row, filters)]
+            for row in rows:
+                row.update(values)
+            return [dict(row) for row in rows]
+
+    def delete(self, table: str, filters: Dict[str, str]) -> List[Dict]:
+        with self._lock:
+            rows = self.tables.get(table, [])
+            removed = [row for row in rows if _matches(row, filters)]
+            self.tables[table] = [row for row in rows if not _matches(row, filters)]
+            return removed
+
+
+def _matches(row: Dict, filters: Dict[str, str]) -> bool:
+    """只实现 PostgREST 的 eq 过滤，其余运算符忽略"""
+    for column, condition in filters.items():
+        if condition.startswith('eq.') and str(row.get(column)).lower() != condition[3:].lower():
+            return False
+    return True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 保持长连接，与线上的连接复用情况一致
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def services(self) -> MockServices:
+        return self.server.services
+
+    def _send(self, body, content_type: str = "application/json", status: int = 200,
+              headers: Optional[Dict[str, str]] = None) -> None:
+        if not isinstance(body, bytes):
+            body = (body if isinstance(body, str) else json.dumps(body, ensure_ascii=False)).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'null') if length else None
+
+    def _route(self) -> Tuple[str, Dict[str, str]]:
+        parts = urlsplit(self.path)
+        return parts.path, dict(parse_qsl(parts.query, keep_blank_values=True))
+
+    def do_GET(self):
+        path, params = self._route()
+        match = re.fullmatch(r'/feeds/(\d+)\.xml', path)
+        if match:
+            return self._serve_page('feed', self.services.corpus.feed(int(match.group(1)), self.services.url),
+                                    "application/rss+xml; charset=utf-8", f'"feed-{match.group(1)}"')
+        match = re.fullmatch(r'/articles/(\d+)/(\d+)', path)
+        if match:
+            k, i = int(match.group(1)), int(match.group(2))
+            return self._serve_page('article', self.services.corpus.article(k, i),
+                                    "text/html; charset=utf-8", f'"article-{k}-{i}"')
+        if path.startswith('/rest/v1/'):
+            return self._rest('GET', path, params)
+        self._send({"message": "not found"}, status=404)
+
+    def do_POST(self):
+        path, params = self._route()
+        if path.endswith('/chat/completions'):
+            return self._chat(self._read_json() or {})
+        if path.startswith('/rest/v1/'):
+            return self._rest('POST', path, params)
+        self._send({"message": "not found"}, status=404)
+
+    def do_PATCH(self):
+        path, params = self._route()
+        self._rest('PATCH', path, params)
+
+    def do_DELETE(self):
+        path, params = self._route()
+        self._rest('DELETE', path, params)
+
+    def _serve_page(self, route: str, body: bytes, content_type: str, etag: str) -> None:
+        self.services.delay(route)
+        self.services.count(f"{route}_requests")
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.services.count(f"{route}_bytes", len(body))
+        self._send(body, content_type, headers={"ETag": etag})
+
+    # Supabase REST
+    def _rest(self, method: str, path: str, params: Dict[str, str]) -> None:
+        services = self.services
+        table = path[len('/rest/v1/'):].strip('/')
+        body = self._read_json() if method in ('POST', 'PATCH') else None
+        services.delay('db')
+        services.count('db_requests')
+        prefer = self.headers.get('Prefer', '')
+        reserved = {'select', 'order', 'limit', 'offset', 'on_conflict', 'columns'}
+        filters = {key: value for key, value in params.items() if key not in reserved}
+
+        if method == 'GET':
+            rows = services.select(table, filters)
+            offset = int(params.get('offset', 0))
+            limit = int(params['limit']) if 'limit' in params else len(rows)
+            page = rows[offset:offset + limit]
+            content_range = f"{offset}-{offset + len(page) - 1}/{len(rows)}" if page else f"*/{len(rows)}"
+            return self._send(page, headers={"Content-Range": content_range})
+
+        if method == 'POST':
+            rows = body if isinstance(body, list) else [body or {}]
+            services.count('db_rows_written', len(rows))
+            result = services.insert(table, rows, params.get('on_conflict'), 'ignore-duplicates' in prefer)
+            status = 201
+        elif method == 'PATCH':
+            result = services.update(table, filters, body or {})
+            status = 200
+        else:
+            result = services.delete(table, filters)
+            status = 200
+
+        if 'return=representation' in prefer:
+            return self._send(result, status=status)
+        self._send(b'', status=204 if method != 'POST' else status)
+
+    # DeepSeek / OpenAI chat completions
+    def _chat(self, request: Dict) -> None:
+        services = self.services
+        services.count('llm_requests')
+        prompt = (request.get('messages') or [{}])[-1].get('content') or ''
+        if services.llm_fails():
+            services.delay('llm')
+            return self._send({"error": {"message": "mock upstream error", "type": "server_error"}}, status=503)
+
+        if (request.get('response_format') or {}).get('type') == 'json_object':
+            content = self._batch_content(prompt)
+        else:
+            content = pseudo_translate(prompt)
+            if SUMMARY_MARKER in prompt:
+                content += f"\n{SUMMARY_MARKER}{content[:60]}"
+
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = len(content)
+        services.count('llm_prompt_tokens', prompt_tokens)
+        services.count('llm_completion_tokens', completion_tokens)
+        if request.get('stream'):
+            return self._stream(request, content)
+
+        services.delay('llm', completion_tokens * services.llm_token_ms / 1000)
+        self._send({
+            "id": f"chatcmpl-mock-{zlib.crc32(prompt.encode())}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get('model', 'mock'),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+    @staticmethod
+    def _batch_content(prompt: str) -> str:
+        items = json.loads(prompt[prompt.rindex('\n\n[') + 2:])
+        translations = []
+        for item in items:
+            text = pseudo_translate(item.get('text', ''))
+            if SUMMARY_MARKER in prompt and '摘要' in str(item.get('type', '')):
+                text += f"\n{SUMMARY_MARKER}{text[:60]}"
+            translations.append({"id": item.get('id'), "text": text})
+        return json.dumps({"translations": translations}, ensure_ascii=False)
+
+    def _stream(self, request: Dict, content: str) -> None:
+        """SSE 流式响应：首包等待接口延迟，之后按每 token 耗时逐段输出"""
+        services = self.services
+        services.delay('llm')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def write(data: Dict) -> None:
+            event = f"data: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8')
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(event), event))
+            self.wfile.flush()
+
+        step = 16
+        for start in range(0, len(content), step):
+            piece = content[start:start + step]
+            write({"id": "chatcmpl-mock", "object": "chat.completion.chunk", "model": request.get('model', 'mock'),
+                   "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]})
+            if services.llm_token_ms:
+                time.sleep(len(piece) * services.llm_token_ms / 1000)
+        done = b"data: [DONE]\n\n"
+        self.wfile.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(done), done))
+        self.wfile.flush()
+
+
+def add_latency_arguments(parser: argparse.ArgumentParser) -> None:
+    """模拟服务的延迟参数（bench_pipeline.py 共用）"""
+    parser.add_argument("--feed-latency", type=Latency.parse, default=Latency(150, 50), help="RSS请求耗时，毫秒 \"均值[,抖动]\"")
+    parser.add_argument("--article-latency", type=Latency.parse, default=Latency(250, 100), help="文章页请求耗时")
+    parser.add_argument("--llm-latency", type=Latency.parse, default=Latency(600, 200), help="AI接口首包耗时")
+    parser.add_argument("--llm-token-ms", type=float, default=2.0, help="AI接口每个输出token的生成耗时（毫秒）")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="AI接口返回503的比例")
+    parser.add_argument("--db-latency", type=Latency.parse, default=Latency(40, 10), help="Supabase REST 请求耗时")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子（正文生成与延迟抖动）")
+
+
+def create_services(args, port: int = 0) -> MockServices:
+    corpus = FixtureCorpus(args.sources, args.articles, args.seed)
+    latencies = {
+        'feed': args.feed_latency,
+        'article': args.article_latency,
+        'llm': args.llm_latency,
+        'db': args.db_latency
+    }
+    return MockServices(corpus, latencies, args.llm_token_ms, args.llm_error_rate, args.seed, port=port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="新闻机器人本地模拟服务")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口")
+    parser.add_argument("--sources", type=int, default=5, help="模拟新闻源个数")
+    parser.add_argument("--articles", type=int, default=4, help="每个源的RSS条目数")
+    add_latency_arguments(parser)
+    args = parser.parse_args()
+
+    services = create_services(args, port=args.port).start()
+    print(f"🧪 模拟服务已启动: {services.url}")
+    print("   可设置以下环境变量让新闻机器人使用模拟服务:")
+    print(f"   SUPABASE_URL={services.url}")
+    print(f"   DEEPSEEK_BASE_URL={services.url}")
+    print(f"   OPENAI_BASE_URL={services.url}/v1")
+    print(f"   RSS 源: {services.url}/feeds/0.xml ... /feeds/{args.sources - 1}.xml")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        services.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,4 +5,13 @@ implementation located in ``src/lib/enhanced_newsbot.py`` so that
 ``import enhanced_newsbot`` continues to work as expected.
 """
 
-from src.lib.enhanced_newsbot import *  # noqa: F401,F403
+import os
+import sys
+
+# The implementation imports its sibling helper modules (``newsbot_store`` ...)
+# by absolute name, so ``src/lib`` must be importable.
+_SRC_LIB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "lib")
+if _SRC_LIB_PATH not in sys.path:
+    sys.path.append(_SRC_LIB_PATH)
+
+from src.lib.enhanced_newsbot import *  # noqa: F401,F403,E402
@@ -54,6 +54,40 @@ def run_newsbot():
     
     return 0
 
+def run_newsbot_daemon(args):
+    """Run the newsbot continuously with one warm EnhancedNewsBot instance"""
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(prog="main.py newsbot --daemon")
+    parser.add_argument("--daemon", action="store_true")
+    parser.add_argument("--min-interval", type=float, default=120,
+                        help="Minimum seconds between the starts of two runs")
+    parser.add_argument("--shutdown-timeout", type=float, default=120,
+                        help="Seconds to wait for the current run on SIGTERM/SIGINT")
+    options = parser.parse_args(args)
+
+    try:
+        from enhanced_newsbot import EnhancedNewsBot
+        from newsbot_daemon import NewsBotDaemon
+    except ImportError as e:
+        print(f"❌ Failed to import NewsBot module: {e}")
+        print("💡 Make sure all dependencies are installed: pip install -r requirements.txt")
+        return 1
+
+    print("🤖 Starting Enhanced NewsBot in daemon mode...")
+    try:
+        daemon = NewsBotDaemon(
+            EnhancedNewsBot(),
+            min_interval=options.min_interval,
+            shutdown_timeout=options.shutdown_timeout
+        )
+        asyncio.run(daemon.run())
+    except Exception as e:
+        print(f"❌ NewsBot daemon failed: {e}")
+        return 1
+    return 0
+
 def show_info():
     """Display information about this project"""
     print("🚀 dem-fre.chat - Democratic Free Chat Platform")
@@ -66,6 +100,8 @@ def show_info():
     print()
     print("Available commands:")
     print("  python main.py newsbot  - Run the newsbot processing pipeline")
+    print("  python main.py newsbot --daemon [--min-interval SECONDS]")
+    print("                          - Keep running, crawling each source on its own interval")
     print("  python main.py info     - Show this information")
     print()
     print("For web development:")
@@ -80,6 +116,8 @@ def main():
         command = sys.argv[1].lower()
         
         if command == "newsbot":
+            if "--daemon" in sys.argv[2:]:
+                return run_newsbot_daemon(sys.argv[2:])
             return run_newsbot()
         elif command == "info":
             show_info()
@@ -14,19 +14,67 @@ import os
 import re
 import json
 import time
-import hashlib
+import asyncio
+import calendar
 import logging
-import feedparser
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING, AsyncIterator, List, Dict, Optional, Tuple
 from urllib.parse import urljoin, urlparse
-from supabase import create_client, Client
 
-_supabase_client: Optional[Client] = None
+from newsbot_dedup import (
+    ContentHashIndex, NearDuplicateIndex, content_signature, minhash_column_enabled, signature_to_hex
+)
+from newsbot_extract import ExtractionProfile, ProfileRegistry, get_backend
+from newsbot_http import get_pools
+from newsbot_metrics import RunMetrics, timed
+from newsbot_publish import insert_rows
+from newsbot_ratelimit import get_limiter, request_tokens
+from newsbot_router import TranslationRouter, sent
+from newsbot_sources import DEFAULT_SOURCES, SourceRegistry, SourceScheduler, load_registry
+from newsbot_store import FeedIndex, HTTPCache, SourceSchedule, TranslationCache, default_cache_path
+from newsbot_summary import AI_SUMMARY_INSTRUCTION, ExtractiveSummarizer, split_ai_summary
+from newsbot_text import KeywordCounter, TextCleaner, estimate_tokens, join_chunks, split_chunks
+
+# feedparser、supabase、bs4、requests 与 httpx 在首次用到的阶段才导入，缩短 Serverless 冷启动
+if TYPE_CHECKING:
+    import httpx
+    from supabase import Client
+
+_supabase_client: Optional["Client"] = None
 logger = logging.getLogger(__name__)
 
+# 接口地址可用环境变量指向代理或本地模拟服务（OPENAI_BASE_URL 与 OpenAI SDK 的含义相同）
+DEEPSEEK_CHAT_URL = os.getenv('DEEPSEEK_BASE_URL', 'https://api.deepseek.com').rstrip('/') + '/v1/chat/completions'
+OPENAI_CHAT_URL = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1').rstrip('/') + '/chat/completions'
+DEEPSEEK_MODEL = 'deepseek-chat'
+OPENAI_MODEL = 'gpt-3.5-turbo'
+PROVIDER_MODELS = {'deepseek': DEEPSEEK_MODEL, 'openai': OPENAI_MODEL}
+# 翻译正文时同时请求AI摘要所用的文本类型（与普通正文分开缓存）
+CONTENT_WITH_SUMMARY = '内容（附摘要）'
+
+# news_bot_config（含 crawler_config）在运行中可以修改的配置：每次使用时才读取，或由
+# refresh_sources 重新派生。其余配置在构造时用于创建连接池、限速器、翻译路由和本地
+# 缓存等对象，只能通过构造参数设置，配置表中的值会被忽略
+RELOADABLE_CONFIG_KEYS = frozenset({
+    'max_articles_per_source', 'max_entry_age_hours', 'total_max_articles', 'min_content_length',
+    'quality_threshold', 'auto_translate', 'auto_post', 'max_concurrent_sources', 'max_sources_per_run',
+    'per_host_delay', 'max_concurrent_downloads', 'max_concurrent_translations', 'insert_batch_size',
+    'batch_translation', 'batch_max_segments', 'batch_max_chars', 'batch_body_max_chars',
+    'chunk_max_tokens', 'chunk_max_retries', 'stream_translations', 'stream_inactivity_timeout',
+    'near_duplicate_days', 'near_duplicate_threshold', 'store_minhash',
+    'summary_max_sentences', 'summary_max_chars', 'ai_summary', 'persist_metrics',
+})
+
+# 每篇抓取的文章都要清理和评分，规则在模块加载时编译一次
+_TEXT_CLEANER = TextCleaner()
+_QUALITY_KEYWORDS = KeywordCounter([
+    'politics', 'economy', 'technology', 'science', 'climate',
+    'international', 'global', 'world', 'breaking'
+])
+
 
 def _mask_secret(value: Optional[str], keep_start: int = 4, keep_end: int = 2) -> str:
     if not value:
@@ -51,7 +99,7 @@ def _summarize_supabase_url(url: str) -> str:
     return _mask_secret(url, keep_start=8, keep_end=0)
 
 
-def _get_supabase_client() -> Client:
+def _get_supabase_client() -> "Client":
     """Create (or reuse) the Supabase client using environment variables."""
     global _supabase_client
 
@@ -99,385 +147,756 @@ def _get_supabase_client() -> Client:
     if used_fallback_key:
         print("⚠️ 使用匿名密钥作为后备凭证，可能无法执行需要 Service Role 权限的操作。")
 
+    from supabase import create_client
+
     _supabase_client = create_client(supabase_url, supabase_key)
     return _supabase_client
 
+
+class _HostThrottle:
+    """按主机限速：同一主机两次请求之间至少间隔 ``delay`` 秒，不同主机互不等待。"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._next_allowed: Dict[str, float] = {}
+
+    def reserve(self, url: str) -> float:
+        """预约该主机的下一个请求时间片，返回需要等待的秒数。"""
+        if self.delay <= 0:
+            return 0.0
+
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(host, 0.0))
+            self._next_allowed[host] = slot + self.delay
+
+        return slot - now
+
+    async def async_wait(self, url: str) -> None:
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _run_sync(coro):
+    """在同步代码中运行协程；若当前线程已有事件循环，则放到独立线程中执行。"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
 class EnhancedNewsBot:
-    def __init__(self):
+    def __init__(self, config: Optional[Dict] = None, news_sources: Optional[List[Dict]] = None):
+        """``config`` 中的键覆盖默认爬取配置，``news_sources`` 替换默认新闻源列表"""
         # API配置
         self.openai_key = os.getenv("OPENAI_API_KEY")
         self.deepseek_key = os.getenv("DEEPSEEK_API_KEY")
+        self._async_openai = None    # (httpx 客户端, AsyncOpenAI)，随异步流水线的客户端更换
+        self._async_client: Optional["httpx.AsyncClient"] = None  # 常驻进程中跨运行复用的异步客户端（见 aopen）
+        self._ai_slots = None        # (事件循环, 名额数, Semaphore)，见 _translation_slots
         
-        # 英美新闻源配置 - 使用RSS确保稳定性
-        self.news_sources = [
-            {
-                'id': 'bbc_world',
-                'name': 'BBC World News',
-                'rss_url': 'http://feeds.bbci.co.uk/news/world/rss.xml',
-                'category': '国际新闻',
-                'enabled': True
-            },
-            {
-                'id': 'cnn_world',
-                'name': 'CNN World',
-                'rss_url': 'http://rss.cnn.com/rss/cnn_world.rss',
-                'category': '国际新闻',
-                'enabled': True
-            },
-            {
-                'id': 'reuters_world',
-                'name': 'Reuters World',
-                'rss_url': 'https://www.reuters.com/tools/rss/world',
-                'category': '国际新闻',
-                'enabled': True
-            },
-            {
-                'id': 'guardian_world',
-                'name': 'Guardian World',
-                'rss_url': 'https://www.theguardian.com/world/rss',
-                'category': '国际新闻',
-                'enabled': True
-            },
-            {
-                'id': 'ap_news',
-                'name': 'Associated Press',
-                'rss_url': 'https://apnews.com/index.rss',
-                'category': '国际新闻',
-                'enabled': True
-            }
-        ]
+        # 新闻源：内置默认源，运行时由 refresh_sources 按注册表（本地文件或 news_bot_config 表）更新
+        self.news_sources = [dict(source) for source in DEFAULT_SOURCES]
         
         # 爬取配置
         self.config = {
             'max_articles_per_source': 2,  # 每个源最多2篇
+            'max_entry_age_hours': 48,     # 发布超过该时长的RSS条目不再下载
+            'incremental_crawl': True,     # 记录每个源已处理的条目，每次只处理新条目
+            'feed_cursor_grace_hours': 6,  # 早于游标该时长以内的条目仍按GUID判断是否为新条目
             'total_max_articles': 8,       # 总共最多8篇
             'min_content_length': 200,     # 最小内容长度
             'quality_threshold': 0.75,     # 质量阈值
             'auto_translate': True,        # 自动翻译
-            'auto_post': True             # 自动发布
+            'auto_post': True,            # 自动发布
+            'max_concurrent_sources': 5,   # 并发抓取的最大源数（1 为串行）
+            'sources_file': os.getenv('NEWSBOT_SOURCES_FILE'),  # 本地新闻源配置文件（JSON），优先于 news_bot_config 表
+            'remote_config': True,         # 每次运行开始时从 news_bot_config 表读取新闻源与配置
+            'source_scheduling': True,     # 按各源的 fetch_interval_minutes 只抓取到期的源
+            'max_sources_per_run': 50,     # 每次运行最多抓取的源数（到期的源更多时按优先级选取）
+            'per_host_delay': 1.0,         # 同一主机两次请求的最小间隔（秒）
+            'max_concurrent_downloads': 8,     # 异步流水线：并发下载文章页数
+            'max_concurrent_translations': 4,  # 异步流水线：并发翻译请求数
+            'translation_providers': ['deepseek', 'openai'],  # 翻译服务优先级（仅使用已配置密钥的），失败时依次切换
+            'hedge_translations': True,        # 首选服务超过其 p95 耗时未返回时向下一个服务发对冲请求
+            'hedge_min_samples': 20,           # 积累到该样本数后才开始对冲
+            'provider_cooldown': 60,           # 连续出错的服务暂停秒数
+            'rate_limits': {                   # AI接口每分钟额度（请求数/token数，0为不限），响应头会校正
+                'deepseek': {'rpm': 120, 'tpm': 200000},
+                'openai': {'rpm': 500, 'tpm': 60000}
+            },
+            'insert_batch_size': 50,           # 发帖时每个多行 insert 请求的行数
+            'html_parser': 'auto',             # 文章页解析后端：auto/selectolax/lxml/bs4
+            'http_pool_maxsize': 10,           # 每个主机保持的长连接数（AI接口主机单独配置）
+            'http2': False,                    # 异步客户端启用HTTP/2（需安装 h2）
+            'http_cache': True,                # RSS与文章页使用条件请求缓存
+            'cache_db_path': default_cache_path(),  # 本地缓存数据库位置
+            'translation_cache': True,          # 缓存翻译结果，避免重复调用AI
+            'translation_cache_size': 512,      # 进程内LRU条目数
+            'translation_cache_ttl': 7 * 24 * 3600,  # 翻译缓存有效期（秒）
+            'batch_translation': True,          # 多篇文章的标题/短正文合并为一次请求翻译
+            'batch_max_segments': 12,           # 每个批量请求最多片段数
+            'batch_max_chars': 6000,            # 每个批量请求的原文字符上限
+            'batch_body_max_chars': 1200,       # 正文不超过该长度时随标题一起批量翻译
+            'chunk_max_tokens': 600,            # 长文按该token预算分段并行翻译
+            'chunk_max_retries': 2,             # 单个分段翻译失败后的重试次数
+            'stream_translations': False,       # 逐条翻译时使用流式响应（可提前中止卡住的请求）
+            'stream_inactivity_timeout': 10,    # 流式响应超过该秒数无新内容即中止
+            'dedup_window_days': 30,            # 去重哈希的回溯天数（与 cleanup_old_news_data 一致）
+            'near_duplicate_days': 7,           # 近似去重比对最近几天的机器人帖子
+            'near_duplicate_threshold': 0.5,    # MinHash 相似度达到该值视为同一新闻
+            'store_minhash': minhash_column_enabled(),  # 签名写入 posts.minhash（需先执行该列的迁移）
+            'summary_max_sentences': 3,         # 抽取式摘要最多句数
+            'summary_max_chars': 200,           # 抽取式摘要最多字数
+            'ai_summary': False,                # 翻译正文的同一请求中让AI附带摘要（长文分段翻译时仍用抽取式摘要）
+            'persist_metrics': False            # 把运行统计与各阶段耗时写入 news_task_logs.result_data
         }
+        self._config_overrides = dict(config or {})
+        self._ignored_remote_keys: List[str] = []  # 上次警告过的、配置表中不能在运行时修改的键
+        self._fixed_sources = news_sources is not None
+        if news_sources is not None:
+            self.news_sources = news_sources
+        self.config.update(self._config_overrides)
+        
+        # 各阶段耗时、下载字节数与token用量，每次运行开始时重置
+        self.metrics = RunMetrics()
         
-        # HTTP会话
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # 进程内共享的HTTP连接池：RSS、文章页与AI接口请求都复用长连接
+        self.http = get_pools(pool_maxsize=self.config['http_pool_maxsize'], http2=self.config['http2'])
+        self._host_throttle = _HostThrottle(self.config['per_host_delay'])
+        self.rate_limiters = {
+            provider: get_limiter(provider, budget.get('rpm'), budget.get('tpm'))
+            for provider, budget in self.config['rate_limits'].items()
+        }
+        self.translation_router = TranslationRouter(
+            self._translation_providers(),
+            hedge=self.config['hedge_translations'],
+            hedge_min_samples=self.config['hedge_min_samples'],
+            cooldown=self.config['provider_cooldown']
+        )
+        self.summarizer = ExtractiveSummarizer(self.config['summary_max_sentences'], self.config['summary_max_chars'])
+        self.html_backend = self._select_html_backend()
+        self._set_sources(SourceRegistry(self.news_sources))
+        self.source_scheduler = SourceScheduler(self._open_source_schedule())
+        self._crawled_sources = 0
+        self._pending_entries: List[Dict] = []   # 本次运行参与排名的RSS条目，运行成功后记入增量抓取索引
+        self._retry_entries = set()              # 其中下次运行仍需处理的条目 (source_id, guid)
+        self._pending_feeds: Dict[str, Tuple] = {}  # 本次下载的RSS的缓存校验头，条目处理完后才保存
+        self.http_cache = self._open_http_cache()
+        self.translation_cache = self._open_translation_cache()
+        self.feed_index = self._open_feed_index()
 
         # Supabase 客户端
         self.supabase = _get_supabase_client()
+        self.dedup_index = ContentHashIndex(self.supabase, window_days=self.config['dedup_window_days'])
+        self.near_duplicates = NearDuplicateIndex(self.config['near_duplicate_threshold'])
         
-    def fetch_rss_articles(self) -> List[Dict]:
-        """从所有RSS源获取新闻文章"""
-        all_articles = []
-        
-        for source in self.news_sources:
-            if not source['enabled']:
-                continue
-                
-            try:
-                print(f"📡 正在爬取 {source['name']}...")
-                articles = self._fetch_single_rss(source)
-                all_articles.extend(articles)
-                time.sleep(2)  # 避免请求过于频繁
-                
-            except Exception as e:
-                print(f"❌ 爬取失败 {source['name']}: {e}")
-                continue
-        
-        # 按质量和时间排序，选择最好的文章
-        all_articles.sort(key=lambda x: (x.get('quality_score', 0), x.get('published_time', 0)), reverse=True)
-        return all_articles[:self.config['total_max_articles']]
-    
-    def _fetch_single_rss(self, source: Dict) -> List[Dict]:
-        """从单个RSS源获取文章"""
+    def _select_html_backend(self):
         try:
-            feed = feedparser.parse(source['rss_url'])
-            articles = []
-            
-            for entry in feed.entries[:self.config['max_articles_per_source']]:
-                article = {
-                    'title': entry.title,
-                    'link': entry.link,
-                    'description': getattr(entry, 'description', ''),
-                    'published': getattr(entry, 'published', ''),
-                    'source_name': source['name'],
-                    'source_id': source['id'],
-                    'category': source['category'],
-                    'language': 'en'
-                }
-                
-                # 获取完整内容
-                content = self._extract_article_content(entry.link)
-                if content and len(content) >= self.config['min_content_length']:
-                    article['content'] = content
-                    article['quality_score'] = self._calculate_quality_score(article)
-                    articles.append(article)
-                    
-            return articles
-            
+            return get_backend(self.config['html_parser'])
+        except ImportError as e:
+            print(f"⚠️ HTML解析后端 {self.config['html_parser']} 不可用，改用自动选择: {e}")
+            return get_backend()
+
+    def _open_http_cache(self) -> Optional[HTTPCache]:
+        if not self.config['http_cache']:
+            return None
+        try:
+            return HTTPCache(self.config['cache_db_path'])
         except Exception as e:
-            print(f"RSS解析失败: {e}")
-            return []
-    
-    def _extract_article_content(self, url: str) -> Optional[str]:
-        """提取文章完整内容"""
+            print(f"⚠️ HTTP缓存不可用，将不使用条件请求: {e}")
+            return None
+
+    def _open_feed_index(self) -> Optional[FeedIndex]:
+        if not self.config['incremental_crawl']:
+            return None
         try:
-            response = self.session.get(url, timeout=30)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 移除脚本和样式
-            for script in soup(["script", "style", "nav", "footer", "aside"]):
-                script.decompose()
-            
-            # 尝试多种内容选择器
-            content_selectors = [
-                '[data-component="text-block"]',  # BBC
-                '.article-content',               # 通用
-                '.story-body',                   # CNN
-                '.article-body',                 # Guardian
-                '.StandardArticleBody_body'      # Reuters
-            ]
-            
-            content = ""
-            for selector in content_selectors:
-                elements = soup.select(selector)
-                if elements:
-                    content = ' '.join([elem.get_text().strip() for elem in elements])
-                    break
-            
-            if not content:
-                # 后备方案：查找主要段落
-                paragraphs = soup.find_all('p')
-                content = ' '.join([p.get_text().strip() for p in paragraphs[:10]])
-            
-            return self._clean_text(content)
-            
+            return FeedIndex(self.config['cache_db_path'], grace=self.config['feed_cursor_grace_hours'] * 3600)
         except Exception as e:
-            print(f"内容提取失败 {url}: {e}")
+            print(f"⚠️ 增量抓取索引不可用，每次将处理RSS中的全部条目: {e}")
+            return None
+
+    def _open_translation_cache(self) -> Optional[TranslationCache]:
+        if not self.config['translation_cache']:
             return None
+        try:
+            return TranslationCache(
+                self.config['cache_db_path'],
+                max_entries=self.config['translation_cache_size'],
+                ttl=self.config['translation_cache_ttl']
+            )
+        except Exception as e:
+            print(f"⚠️ 翻译缓存不可用: {e}")
+            return None
+
+    def _open_source_schedule(self) -> Optional[SourceSchedule]:
+        if not self.config['source_scheduling']:
+            return None
+        try:
+            return SourceSchedule(self.config['cache_db_path'])
+        except Exception as e:
+            print(f"⚠️ 抓取调度状态不可用，每次将抓取全部新闻源: {e}")
+            return None
+
+    def _set_sources(self, registry: SourceRegistry) -> None:
+        self.source_registry = registry
+        self.news_sources = registry.sources('rss')
+        self.extraction_profiles = ProfileRegistry.from_sources(self.news_sources)
+
+    @timed('sources')
+    def refresh_sources(self) -> None:
+        """重新加载新闻源注册表与 news_bot_config 中的配置（每次运行开始时调用）
+
+        本地文件（``sources_file``）优先于配置表；构造时传入的 ``config`` 仍优先于
+        配置表中的值，传入了 ``news_sources`` 时不加载注册表。配置表只能修改
+        :data:`RELOADABLE_CONFIG_KEYS` 中的配置。
+        """
+        if self._fixed_sources or not (self.config['sources_file'] or self.config['remote_config']):
+            return
+        path = self.config['sources_file']
+        registry, overrides = load_registry(None if path else self.supabase, path)
+        self._apply_remote_config(overrides)
+        # 构造时由配置派生的对象同步更新
+        self._host_throttle.delay = self.config['per_host_delay']
+        self.summarizer.max_sentences = self.config['summary_max_sentences']
+        self.summarizer.max_chars = self.config['summary_max_chars']
+        self._set_sources(registry)
+
+    def _apply_remote_config(self, overrides: Dict) -> None:
+        """应用配置表中的覆盖值；不能在运行时修改的键与当前值不同时警告并忽略（同一组键只警告一次）"""
+        ignored = sorted(
+            key for key, value in overrides.items()
+            if key not in RELOADABLE_CONFIG_KEYS and key not in self._config_overrides and self.config.get(key) != value
+        )
+        if ignored and ignored != self._ignored_remote_keys:
+            print(f"⚠️ news_bot_config 中的 {', '.join(ignored)} 不能在运行时修改（启动时已用于创建连接池、缓存等），"
+                  f"已忽略；请通过构造参数或环境变量配置")
+        self._ignored_remote_keys = ignored
+        self.config.update((key, value) for key, value in overrides.items() if key in RELOADABLE_CONFIG_KEYS)
+        self.config.update(self._config_overrides)
+
+    def _due_sources(self) -> List[Dict]:
+        """本次运行要抓取的源：已启用且到期的源，最多 ``max_sources_per_run`` 个"""
+        sources = self.source_registry.enabled()
+        if self.config['source_scheduling']:
+            due = self.source_scheduler.due(sources, limit=self.config['max_sources_per_run'])
+            if len(due) < len(sources):
+                print(f"🗓️ {len(sources)} 个启用的新闻源中 {len(due)} 个到期，本次只抓取这些源")
+            sources = due
+        self._crawled_sources = len(sources)
+        return sources
+
+    def _source_limit(self, source_id: str) -> int:
+        source = self.source_registry.get(source_id) or {}
+        return source.get('max_articles') or self.config['max_articles_per_source']
+
+    def _cache_headers(self, url: str) -> Dict[str, str]:
+        return self.http_cache.conditional_headers(url) if self.http_cache else {}
+
+    def _cache_store(self, url: str, headers, payload: Optional[str] = None) -> None:
+        if self.http_cache:
+            self.http_cache.store(url, headers, payload)
+
+    def _cache_touch(self, url: str, headers) -> None:
+        if self.http_cache:
+            self.http_cache.touch(url, headers)
+
+    def _cached_payload(self, url: str) -> Optional[str]:
+        return self.http_cache.payload(url) if self.http_cache else None
+
+    @staticmethod
+    def _parse_feed(response):
+        import feedparser
+        return feedparser.parse(response.content, response_headers=dict(response.headers))
+
+    def _entries_to_articles(self, feed, source: Dict) -> List[Dict]:
+        """把RSS条目转换为文章字典"""
+        articles = []
+        for entry in feed.entries:
+            published = getattr(entry, 'published_parsed', None) or getattr(entry, 'updated_parsed', None)
+            articles.append({
+                'title': entry.title,
+                'link': entry.link,
+                'guid': getattr(entry, 'id', None) or entry.link,
+                'description': getattr(entry, 'description', ''),
+                'published': getattr(entry, 'published', ''),
+                'published_time': calendar.timegm(published) if published else 0,
+                'source_name': source['name'],
+                'source_id': source['id'],
+                'category': source['category'],
+                'source_weight': source.get('weight', 1.0),
+                'language': 'en'
+            })
+        return articles
+
+    def _new_entries(self, source: Dict, articles: List[Dict]) -> List[Dict]:
+        """只保留以前的运行中未处理过的条目（按发布时间从旧到新）"""
+        if not self.feed_index:
+            return articles
+        try:
+            new_articles = self.feed_index.new_entries(source['id'], articles)
+        except Exception as e:
+            print(f"⚠️ 读取增量抓取索引失败，处理全部条目: {e}")
+            return articles
+        if len(new_articles) < len(articles):
+            print(f"   🆕 {source['name']}: {len(new_articles)}/{len(articles)} 个新条目")
+        return new_articles
+
+    @staticmethod
+    def _entry_key(article: Dict) -> Tuple[str, str]:
+        return article['source_id'], article['guid']
+
+    def _reset_pending_entries(self) -> None:
+        self._pending_entries = []
+        self._retry_entries = set()
+        self._pending_feeds = {}
+
+    def commit_seen_entries(self, published: List[Dict]) -> None:
+        """发帖完成后把本次参与排名的条目记为已处理
+
+        下载失败的条目和通过筛选却未发帖成功（翻译或写库失败）的条目不记录，
+        下次运行重新处理；未入选、正文过短、质量不达标或重复的条目记为已处理。
+        RSS的 ETag / Last-Modified 也在此时才保存，且只保存没有待重试条目的源，
+        否则下次运行会得到 304 而拿不到这些条目。运行中途出错时不调用本方法，
+        所有条目都会在下次运行重新参与排名。
+        """
+        published_keys = {self._entry_key(article) for article in published}
+        retry = self._retry_entries - published_keys
+        seen = [entry for entry in self._pending_entries if self._entry_key(entry) not in retry]
+        self._mark_entries_seen(seen)
+
+        retry_sources = {source_id for source_id, _ in retry}
+        for source_id, (url, headers) in self._pending_feeds.items():
+            if source_id not in retry_sources:
+                self._cache_store(url, headers)
+        self._reset_pending_entries()
+
+    def _mark_entries_seen(self, articles: List[Dict]) -> None:
+        if not self.feed_index:
+            return
+        by_source: Dict[str, List[Dict]] = {}
+        for article in articles:
+            by_source.setdefault(article['source_id'], []).append(article)
+        try:
+            for source_id, entries in by_source.items():
+                self.feed_index.mark_seen(source_id, entries)
+        except Exception as e:
+            print(f"⚠️ 保存增量抓取索引失败: {e}")
+
+    def _rank_candidates(self, articles: List[Dict]) -> List[Dict]:
+        """第一阶段：仅凭RSS元数据筛选并排序候选文章
+
+        跳过本次运行中重复出现的链接、已经发布过的原文链接以及超过
+        ``max_entry_age_hours`` 的旧条目；其余按 :meth:`_metadata_score`
+        （乘以所属源的 ``weight``）和发布时间排序，每个源最多保留 ``max_articles``
+        （未配置时为 ``max_articles_per_source``）篇。
+        """
+        max_age = self.config['max_entry_age_hours'] * 3600
+        now = time.time()
+        seen_links = set()
+        by_source: Dict[str, List[Dict]] = {}
+
+        for article in articles:
+            link = article['link']
+            if link in seen_links or self.near_duplicates.has_link(link):
+                continue
+            seen_links.add(link)
+            if article['published_time'] and now - article['published_time'] > max_age:
+                continue
+            article['metadata_score'] = self._metadata_score(article)
+            by_source.setdefault(article['source_id'], []).append(article)
+
+        rank_key = lambda x: (x['metadata_score'] * x.get('source_weight', 1.0), x['published_time'])
+        candidates = []
+        for source_id, entries in by_source.items():
+            entries.sort(key=rank_key, reverse=True)
+            candidates.extend(entries[:self._source_limit(source_id)])
+        candidates.sort(key=rank_key, reverse=True)
+        return candidates
+
+    def _metadata_score(self, article: Dict) -> float:
+        """估算质量分：规则同 :meth:`_calculate_quality_score`，以RSS描述代替尚未下载的正文"""
+        score = 0.5
+        title = article.get('title', '')
+        if len(title) > 20 and len(title) < 100:
+            score += 0.1
+        for _ in range(_QUALITY_KEYWORDS.count(f"{title}\n{article.get('description', '')}")):
+            score += 0.05
+        return min(score, 1.0)
+
+    def _accept_content(self, article: Dict, content: Optional[str]) -> bool:
+        """正文长度达标时写入正文和质量分；下载失败的条目留到下次运行重试"""
+        if content is None:
+            self._retry_entries.add(self._entry_key(article))
+            return False
+        profile = self._extraction_profile(article)
+        min_length = self.config['min_content_length'] if profile.min_length is None else profile.min_length
+        if len(content) >= min_length:
+            article['content'] = content
+            article['quality_score'] = self._calculate_quality_score(article, profile)
+            return True
+        return False
+    
+    def _extraction_profile(self, article: Dict) -> ExtractionProfile:
+        return self.extraction_profiles.get(article.get('source_id'), article.get('link'))
+
+    def _description_content(self, article: Dict, profile: ExtractionProfile) -> str:
+        """直接使用RSS描述作为正文"""
+        return profile.description_text(article.get('description', ''), self.html_backend)
+
+    @timed('parse')
+    def _parse_article_html(self, html, profile: Optional[ExtractionProfile] = None) -> str:
+        """按新闻源的提取规则从文章HTML中解析正文"""
+        profile = profile or self.extraction_profiles.default
+        return profile.extract(html, self.html_backend)
     
     def _clean_text(self, text: str) -> str:
-        """清理文本内容"""
-        if not text:
-            return ""
-        
-        # 移除多余空白
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # 移除广告和版权信息
-        patterns_to_remove = [
-            r'subscribe to.*?newsletter',
-            r'follow us on.*?twitter',
-            r'copyright.*?\d{4}',
-            r'all rights reserved',
-            r'terms of use',
-            r'privacy policy'
-        ]
-        
-        for pattern in patterns_to_remove:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-        
-        return text.strip()
+        """清理文本内容：折叠空白，移除广告和版权信息"""
+        return _TEXT_CLEANER.clean(text)
     
-    def _calculate_quality_score(self, article: Dict) -> float:
-        """计算文章质量分数"""
+    def _calculate_quality_score(self, article: Dict, profile: Optional[ExtractionProfile] = None) -> float:
+        """计算文章质量分数；长度加分门槛取自该源的提取规则（RSS描述与文章页正文不同）"""
         score = 0.5  # 基础分数
         
         content = article.get('content', '')
         title = article.get('title', '')
+        short, long = (profile or self.extraction_profiles.default).length_bonus
         
         # 内容长度评分
-        if len(content) > 500:
+        if len(content) > short:
             score += 0.2
-        if len(content) > 1000:
+        if len(content) > long:
             score += 0.1
         
         # 标题质量评分
         if len(title) > 20 and len(title) < 100:
             score += 0.1
         
-        # 关键词评分（国际新闻相关）
-        important_keywords = [
-            'politics', 'economy', 'technology', 'science', 'climate',
-            'international', 'global', 'world', 'breaking'
-        ]
-        
-        content_lower = content.lower()
-        for keyword in important_keywords:
-            if keyword in content_lower:
-                score += 0.05
+        # 关键词评分（国际新闻相关）：每个出现的关键词加0.05
+        for _ in range(_QUALITY_KEYWORDS.count(content)):
+            score += 0.05
         
         return min(score, 1.0)  # 最高1.0分
     
-    def translate_to_chinese(self, text: str, text_type: str = "content") -> str:
-        """使用AI API翻译英文为中文"""
-        if not text or not self.config['auto_translate']:
-            return text
-        
-        try:
-            if self.deepseek_key:
-                return self._translate_with_deepseek(text, text_type)
-            elif self.openai_key:
-                return self._translate_with_openai(text, text_type)
-            else:
+    def _translation_providers(self) -> List[str]:
+        """已配置密钥的翻译服务，按优先级排列"""
+        keys = {'deepseek': self.deepseek_key, 'openai': self.openai_key}
+        return [provider for provider in self.config['translation_providers'] if keys.get(provider)]
+
+    def _translation_backend(self) -> Optional[Tuple[str, str]]:
+        """首选翻译服务 (provider, model)，也用作翻译缓存的键；实际请求由路由器分配"""
+        providers = self._translation_providers()
+        return (providers[0], PROVIDER_MODELS[providers[0]]) if providers else None
+
+    def _stream_backend(self) -> Tuple[str, str]:
+        """流式翻译无法对冲，直接使用当前最健康的服务"""
+        provider = self.translation_router.order()[0]
+        return provider, PROVIDER_MODELS[provider]
+
+    def _lookup_translation(self, backend: Tuple[str, str], text: str, text_type: str) -> Tuple[Optional[str], Optional[str]]:
+        """返回 (缓存键, 已缓存的译文)"""
+        if not self.translation_cache:
+            return None, None
+        cache_key = TranslationCache.make_key(backend[0], backend[1], text_type, text)
+        return cache_key, self.translation_cache.get(cache_key)
+
+    def _remember_translation(self, cache_key: Optional[str], text: str, translation: str) -> None:
+        # 各翻译后端失败时返回原文，这种结果不能缓存
+        if cache_key and translation and translation != text:
+            self.translation_cache.set(cache_key, translation)
+
+    def _chat_request(self, backend: Tuple[str, str], text: str, text_type: str) -> Tuple[str, Dict, Dict]:
+        """单条翻译的 (url, headers, payload)，用于直接调用 chat-completions HTTP 接口"""
+        if backend[0] == 'deepseek':
+            return DEEPSEEK_CHAT_URL, self._deepseek_headers(), self._deepseek_payload(text, text_type)
+
+        headers = {
+            'Authorization': f'Bearer {self.openai_key}',
+            'Content-Type': 'application/json'
+        }
+        payload = {
+            "model": OPENAI_MODEL,
+            "messages": self._openai_messages(text, text_type),
+            "temperature": 0.3,
+            "max_tokens": 2000
+        }
+        return OPENAI_CHAT_URL, headers, payload
+
+    @staticmethod
+    def _parse_sse_line(line: str) -> Tuple[bool, str]:
+        """解析一行 SSE，返回 (是否结束, 新增文本)"""
+        if not line.startswith('data:'):
+            return False, ''  # 空行或 ": keep-alive" 注释
+
+        data = line[5:].strip()
+        if data == '[DONE]':
+            return True, ''
+
+        choices = json.loads(data).get('choices') or [{}]
+        return False, (choices[0].get('delta') or {}).get('content') or ''
+
+    def _plan_batches(self, segments: List[Tuple[str, str]]):
+        """返回 (backend, 初始结果, 缓存键, 待请求的分组下标)；缓存命中与空文本直接填入结果"""
+        results = [text for text, _ in segments]
+        cache_keys: List[Optional[str]] = [None] * len(segments)
+        backend = self._translation_backend()
+        if not self.config['auto_translate'] or backend is None:
+            if backend is None and segments:
                 print("⚠️ 未配置AI API密钥，跳过翻译")
-                return text
-                
-        except Exception as e:
-            print(f"翻译失败: {e}")
-            return text
+            return backend, results, cache_keys, []
+
+        pending = []
+        for index, (text, text_type) in enumerate(segments):
+            if not text:
+                continue
+            cache_keys[index], cached = self._lookup_translation(backend, text, text_type)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append(index)
+
+        groups, current, current_chars = [], [], 0
+        for index in pending:
+            length = len(segments[index][0])
+            if current and (len(current) >= self.config['batch_max_segments']
+                            or current_chars + length > self.config['batch_max_chars']):
+                groups.append(current)
+                current, current_chars = [], 0
+            current.append(index)
+            current_chars += length
+        if current:
+            groups.append(current)
+
+        return backend, results, cache_keys, groups
+
+    def _batch_segments(self, articles: List[Dict]) -> List[Tuple[Dict, str, str, str]]:
+        """可批量翻译的片段：所有标题，以及较短的正文"""
+        segments = []
+        for article in articles:
+            segments.append((article, 'title_zh', article['title'], "标题"))
+            content = article.get('content', '')
+            if len(content) <= self.config['batch_body_max_chars']:
+                segments.append((article, 'content_zh', content, self._content_type()))
+        return segments
     
-    def _translate_with_deepseek(self, text: str, text_type: str) -> str:
-        """使用DeepSeek API翻译"""
-        try:
-            headers = {
-                'Authorization': f'Bearer {self.deepseek_key}',
-                'Content-Type': 'application/json'
-            }
-            
-            prompt = f"""请将以下英文新闻{text_type}翻译成自然流畅的中文。要求：
+    def _deepseek_headers(self) -> Dict:
+        return {
+            'Authorization': f'Bearer {self.deepseek_key}',
+            'Content-Type': 'application/json'
+        }
+
+    def _content_type(self) -> str:
+        """正文翻译请求的文本类型：开启 ai_summary 时要求AI在译文后附带摘要"""
+        return CONTENT_WITH_SUMMARY if self.config['ai_summary'] else "内容"
+
+    @staticmethod
+    def _prompt_type(text_type: str) -> Tuple[str, str]:
+        """返回 (提示词中的文本类型, 附加要求)"""
+        if text_type == CONTENT_WITH_SUMMARY:
+            return "内容", AI_SUMMARY_INSTRUCTION
+        return text_type, ''
+
+    def _deepseek_payload(self, text: str, text_type: str) -> Dict:
+        """构建DeepSeek翻译请求体"""
+        text_type, extra = self._prompt_type(text_type)
+        extra = f"\n5. {extra}" if extra else ''
+        prompt = f"""请将以下英文新闻{text_type}翻译成自然流畅的中文。要求：
 1. 保持原文的准确性和完整性
 2. 使用符合中文表达习惯的语言
 3. 保留专有名词（人名、地名、机构名）的常见中文译名
-4. 确保新闻的客观性和专业性
+4. 确保新闻的客观性和专业性{extra}
 
 英文内容：
 {text}
 
 中文翻译："""
 
-            data = {
-                "model": "deepseek-chat",
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.3,
-                "max_tokens": 2000
-            }
-            
-            response = requests.post(
-                'https://api.deepseek.com/v1/chat/completions',
-                headers=headers,
-                json=data,
-                timeout=30
+        return {
+            "model": DEEPSEEK_MODEL,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.3,
+            "max_tokens": 2000
+        }
+
+    @staticmethod
+    def _payload_tokens(payload: Dict) -> int:
+        return request_tokens(payload['messages'], payload.get('max_tokens', 0))
+
+    def _deepseek_content(self, result: Dict) -> str:
+        usage = result.get('usage') or {}
+        self.metrics.add_tokens('deepseek', usage.get('prompt_tokens'), usage.get('completion_tokens'))
+        return result['choices'][0]['message']['content'].strip()
+
+    def _async_openai_client(self, client: "httpx.AsyncClient"):
+        """与异步流水线共用同一个 httpx 客户端（及其连接池）的 AsyncOpenAI"""
+        if self._async_openai is None or self._async_openai[0] is not client:
+            from openai import AsyncOpenAI
+            self._async_openai = (client, AsyncOpenAI(api_key=self.openai_key, http_client=client, max_retries=0))
+        return self._async_openai[1]
+
+    def _openai_content(self, completion) -> str:
+        usage = completion.usage
+        self.metrics.add_tokens('openai', usage and usage.prompt_tokens, usage and usage.completion_tokens)
+        return (completion.choices[0].message.content or '').strip()
+
+    async def _aopenai_chat(self, client: "httpx.AsyncClient", messages: List[Dict], max_tokens: int = 2000,
+                            timeout: float = 30, **options) -> str:
+        """调用OpenAI接口（经限速器发出，429/5xx 自动退避重试），失败时抛出异常；``options`` 直接作为请求参数"""
+        async with self._translation_slots():
+            response = await self.rate_limiters['openai'].acall(
+                sent(lambda: self._async_openai_client(client).chat.completions.with_raw_response.create(
+                    model=OPENAI_MODEL,
+                    messages=messages,
+                    temperature=0.3,
+                    max_tokens=max_tokens,
+                    timeout=timeout,
+                    **options
+                )),
+                request_tokens(messages, max_tokens)
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result['choices'][0]['message']['content'].strip()
-            else:
-                print(f"DeepSeek API错误: {response.status_code}")
-                return text
-                
-        except Exception as e:
-            print(f"DeepSeek翻译失败: {e}")
-            return text
-    
-    def _translate_with_openai(self, text: str, text_type: str) -> str:
-        """使用OpenAI API翻译"""
-        try:
-            import openai
-            openai.api_key = self.openai_key
-            
-            prompt = f"""将以下英文新闻{text_type}翻译成中文，要求准确、流畅、符合中文表达习惯：
+        return self._openai_content(response.parse())
+
+    def _openai_messages(self, text: str, text_type: str) -> List[Dict]:
+        text_type, extra = self._prompt_type(text_type)
+        extra = f"；{extra}" if extra else ''
+        prompt = f"""将以下英文新闻{text_type}翻译成中文，要求准确、流畅、符合中文表达习惯{extra}：
 
 {text}"""
 
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-                max_tokens=2000
-            )
-            
-            return response.choices[0].message.content.strip()
-            
-        except Exception as e:
-            print(f"OpenAI翻译失败: {e}")
-            return text
-    
+        return [{"role": "user", "content": prompt}]
+
+    def _batch_messages(self, segments: List[Tuple[str, str]]) -> List[Dict]:
+        items = [{"id": index, "type": text_type, "text": text} for index, (text, text_type) in enumerate(segments)]
+        extra = ''
+        if any(text_type == CONTENT_WITH_SUMMARY for _, text_type in segments):
+            extra = f"\n6. type 为“{CONTENT_WITH_SUMMARY}”的片段，{AI_SUMMARY_INSTRUCTION}（写在该片段的 text 中）"
+        prompt = f"""请将下面 JSON 数组中的每个英文新闻片段分别翻译成自然流畅的中文。要求：
+1. 保持原文的准确性和完整性
+2. 使用符合中文表达习惯的语言
+3. 保留专有名词（人名、地名、机构名）的常见中文译名
+4. 确保新闻的客观性和专业性
+5. 只输出一个 JSON 对象，格式为 {{"translations": [{{"id": 编号, "text": "中文译文"}}]}}，每个 id 恰好出现一次{extra}
+
+{json.dumps(items, ensure_ascii=False)}"""
+
+        return [{"role": "user", "content": prompt}]
+
+    def _batch_payload(self, segments: List[Tuple[str, str]]) -> Dict:
+        return {
+            "model": DEEPSEEK_MODEL,
+            "messages": self._batch_messages(segments),
+            "temperature": 0.3,
+            "max_tokens": 4000,
+            "response_format": {"type": "json_object"}
+        }
+
+    @staticmethod
+    def _parse_batch_translations(content: str, count: int) -> List[Optional[str]]:
+        """解析批量翻译响应；编号越界、缺失或为空的片段返回 None"""
+        results: List[Optional[str]] = [None] * count
+        content = re.sub(r'^```(?:json)?\s*|\s*```$', '', content.strip())
+        try:
+            data = json.loads(content)
+        except ValueError:
+            return results
+
+        items = data.get('translations') if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            return results
+
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            index, text = item.get('id'), item.get('text')
+            if isinstance(index, int) and 0 <= index < count and isinstance(text, str) and text.strip():
+                results[index] = text.strip()
+        return results
+
+    @timed('summarize')
     def generate_summary(self, content: str) -> str:
-        """生成新闻摘要"""
+        """生成新闻摘要（本地抽取式，按中英文句子边界选句，见 newsbot_summary）"""
         if not content:
             return ""
         
         try:
-            # 提取前3段作为摘要
-            sentences = content.split('.')
-            summary_sentences = sentences[:3]
-            summary = '. '.join(summary_sentences).strip()
-            
-            if len(summary) > 200:
-                summary = summary[:200] + "..."
-            
-            return summary
+            return self.summarizer.summarize(content)
             
         except Exception as e:
             print(f"摘要生成失败: {e}")
             return content[:200] + "..." if len(content) > 200 else content
     
     def is_duplicate(self, title: str, content: str) -> bool:
-        """检查是否为重复文章（简化版）"""
+        """检查文章是否已发布过（基于 news_content_hashes 的内存索引）"""
         try:
-            # 计算内容哈希
-            content_hash = hashlib.md5(title.encode() + content[:500].encode()).hexdigest()
-            
-            # 这里应该查询数据库检查是否已存在
-            # 暂时返回False，实际使用时需要实现数据库查询
-            return False
-            
+            return ContentHashIndex.compute_hash(title, content) in self.dedup_index
         except Exception:
             return False
-    
-    def process_articles(self) -> List[Dict]:
-        """处理所有文章：爬取、翻译、分析"""
-        print("🤖 新闻机器人开始工作...")
-        
-        # 1. 爬取RSS文章
-        articles = self.fetch_rss_articles()
-        print(f"📰 获取到 {len(articles)} 篇高质量文章")
-        
-        processed_articles = []
-        
+
+    @timed('dedup_load')
+    def _load_dedup_index(self) -> None:
+        """每次运行开始时加载一次近期哈希与帖子签名"""
+        count = self.dedup_index.load()
+        print(f"🗂️ 已加载 {count} 条去重哈希")
+
+        since = (datetime.now() - timedelta(days=self.config['near_duplicate_days'])).isoformat()
+        try:
+            self.near_duplicates = NearDuplicateIndex.load_posts(
+                self.supabase, since, self.config['near_duplicate_threshold'],
+                with_signatures=self.config['store_minhash'], is_bot_post=True
+            )
+            print(f"🗂️ 已加载 {self.near_duplicates.size} 个帖子签名")
+        except Exception as e:
+            print(f"⚠️ 加载帖子签名失败，本次仅在内存中做近似去重: {e}")
+            self.near_duplicates = NearDuplicateIndex(self.config['near_duplicate_threshold'])
+
+        # 帖子标题是译文，候选文章是原文标题；按 news_content_hashes 中保存的原文标题精确匹配
+        for title in self.dedup_index.titles():
+            self.near_duplicates.add(None, title=title)
+
+    def record_published(self, articles: List[Dict]) -> int:
+        """把已发布文章的哈希批量写入 news_content_hashes，返回写入条数"""
         for article in articles:
-            try:
-                print(f"📝 处理文章: {article['title'][:50]}...")
-                
-                # 2. 质量过滤
-                if article.get('quality_score', 0) < self.config['quality_threshold']:
-                    print("   ⚠️ 质量不达标，跳过")
-                    continue
-                
-                # 3. 重复检查
-                if self.is_duplicate(article['title'], article.get('content', '')):
-                    print("   ⚠️ 重复内容，跳过")
-                    continue
-                
-                # 4. 翻译标题和内容
-                if self.config['auto_translate']:
-                    print("   🌐 翻译中...")
-                    article['title_zh'] = self.translate_to_chinese(article['title'], "标题")
-                    article['content_zh'] = self.translate_to_chinese(article.get('content', ''), "内容")
-                    article['summary_zh'] = self.generate_summary(article['content_zh'])
-                else:
-                    article['title_zh'] = article['title']
-                    article['content_zh'] = article.get('content', '')
-                    article['summary_zh'] = self.generate_summary(article['content_zh'])
-                
-                # 5. 格式化为论坛帖子
-                formatted_post = self._format_for_forum(article)
-                article['forum_post'] = formatted_post
-                
-                processed_articles.append(article)
-                print("   ✅ 处理完成")
-                
-                time.sleep(1)  # 避免API限制
-                
-            except Exception as e:
-                print(f"   ❌ 处理失败: {e}")
-                continue
-        
-        print(f"🎉 共处理完成 {len(processed_articles)} 篇文章")
-        return processed_articles
+            if article.get('content_hash'):
+                self.dedup_index.record(article['content_hash'], article['title'], article['source_name'])
+        return self.dedup_index.flush()
+    
+    def _passes_filters(self, article: Dict) -> bool:
+        """质量过滤与重复检查"""
+        if article.get('quality_score', 0) < self.config['quality_threshold']:
+            print("   ⚠️ 质量不达标，跳过")
+            return False
+
+        # 登记哈希，同一次运行中不同来源的相同文章也只保留第一篇
+        content_hash = ContentHashIndex.compute_hash(article['title'], article.get('content', ''))
+        if not self.dedup_index.claim(content_hash):
+            print("   ⚠️ 重复内容，跳过")
+            return False
+
+        # 近似去重：不同媒体转载/改写的同一新闻
+        signature = content_signature(article['title'], article.get('content', ''))
+        if not self.near_duplicates.claim(signature, key=article['link'], title=article['title']):
+            print("   ⚠️ 与已有新闻高度相似，跳过")
+            return False
+
+        article['content_hash'] = content_hash
+        article['minhash'] = signature_to_hex(signature)
+        # 发帖成功前不算处理完成（见 commit_seen_entries）
+        self._retry_entries.add(self._entry_key(article))
+        return True
+
+    def _finalize_article(self, article: Dict) -> None:
+        """在翻译完成后生成摘要和论坛帖子；译文附带AI摘要时直接使用"""
+        article['content_zh'], ai_summary = split_ai_summary(article['content_zh'])
+        article['summary_zh'] = ai_summary or self.generate_summary(article['content_zh'])
+        article['forum_post'] = self._format_for_forum(article)
     
+    @timed('format')
     def _format_for_forum(self, article: Dict) -> Dict:
         """格式化文章为论坛帖子格式"""
         title = article['title_zh']
@@ -509,62 +928,528 @@ class EnhancedNewsBot:
             'created_at': datetime.now().isoformat()
         }
     
-    def run_once(self) -> Dict:
-        """执行一次完整的新闻处理流程"""
-        start_time = time.time()
+    # ------------------------------------------------------------------
+    # 异步流水线：抓取、下载、翻译、写库各阶段并发执行
+    # ------------------------------------------------------------------
+
+    def _create_async_client(self) -> "httpx.AsyncClient":
+        return self.http.async_client(
+            max_connections=self.config['max_concurrent_downloads'] + self.config['max_concurrent_translations'],
+            timeout=30,
+            follow_redirects=True
+        )
+
+    @asynccontextmanager
+    async def _client_scope(self) -> AsyncIterator["httpx.AsyncClient"]:
+        """本次运行使用的异步客户端：调用过 :meth:`aopen` 时复用常驻客户端，否则新建并在运行结束时关闭"""
+        if self._async_client is not None:
+            yield self._async_client
+            return
+        async with self._create_async_client() as client:
+            yield client
+
+    async def aopen(self) -> None:
+        """创建跨运行复用的异步客户端，之后的 :meth:`arun_once` 保持长连接（须在同一事件循环中调用）"""
+        if self._async_client is None:
+            self._async_client = self._create_async_client()
+
+    async def aclose(self) -> None:
+        """关闭 :meth:`aopen` 创建的异步客户端"""
+        client, self._async_client = self._async_client, None
+        if client is not None:
+            await client.aclose()
+
+    def _create_stage_limits(self) -> Dict[str, asyncio.Semaphore]:
+        """RSS抓取与正文下载阶段各自的并发上限（AI请求的名额见 :meth:`_translation_slots`）"""
+        return {
+            'feeds': asyncio.Semaphore(max(1, self.config['max_concurrent_sources'])),
+            'downloads': asyncio.Semaphore(max(1, self.config['max_concurrent_downloads']))
+        }
+
+    def _translation_slots(self) -> asyncio.Semaphore:
+        """AI接口请求的并发名额：逐条、分段、批量、流式与对冲请求每个都占一个名额，
+        同时在途的请求数不超过 ``max_concurrent_translations``（文章级任务不占名额）"""
+        loop = asyncio.get_running_loop()
+        size = max(1, self.config['max_concurrent_translations'])
+        if self._ai_slots is None or self._ai_slots[0] is not loop or self._ai_slots[1] != size:
+            self._ai_slots = (loop, size, asyncio.Semaphore(size))
+        return self._ai_slots[2]
+
+    async def _afetch_feeds(self, client: "httpx.AsyncClient", limits: Dict[str, asyncio.Semaphore]) -> List[Dict]:
+        self._reset_pending_entries()
+        sources = self._due_sources()
+        results = await asyncio.gather(*(self._afetch_single_rss(client, source, limits) for source in sources))
+        return [article for articles in results for article in articles]
+
+    async def _afetch_top_articles(self, client: "httpx.AsyncClient", entries: List[Dict],
+                                   limits: Dict[str, asyncio.Semaphore]) -> List[Dict]:
+        """第二阶段：仅凭条目元数据给候选文章排序（见 :meth:`_rank_candidates`），
+        只为排名靠前、还能入选的 ``total_max_articles`` 篇下载正文，下载失败或
+        正文过短时按排名依次递补。
+
+        开启 ``incremental_crawl`` 时只有以前的运行中未处理过的条目参与排名；
+        发帖完成后由 :meth:`commit_seen_entries` 把它们记为已处理。
+        """
+        candidates = self._rank_candidates(entries)
+        all_articles = []
+        limit = self.config['total_max_articles']
+        while candidates and len(all_articles) < limit:
+            batch, candidates = candidates[:limit - len(all_articles)], candidates[limit - len(all_articles):]
+            contents = await asyncio.gather(*(self._aarticle_content(client, article, limits) for article in batch))
+            all_articles.extend(article for article, content in zip(batch, contents) if self._accept_content(article, content))
+
+        self._pending_entries = entries
+        all_articles.sort(key=lambda x: (x.get('quality_score', 0), x.get('published_time', 0)), reverse=True)
+        return all_articles[:limit]
+
+    async def _afetch_single_rss(self, client: "httpx.AsyncClient", source: Dict, limits: Dict[str, asyncio.Semaphore]) -> List[Dict]:
+        try:
+            # 同一主机的请求间隔在获取并发名额之前等待，不占用名额，也不计入抓取耗时
+            await self._host_throttle.async_wait(source['rss_url'])
+            async with limits['feeds']:
+                print(f"📡 正在爬取 {source['name']}...")
+                with self.metrics.stage('feed', source=source['name']):
+                    response = await client.get(source['rss_url'], headers=self._cache_headers(source['rss_url']))
+                    self.metrics.add_bytes('feed', len(response.content))
+                    if response.status_code == 304:
+                        self._cache_touch(source['rss_url'], response.headers)
+                        print(f"   ♻️ {source['name']} 自上次抓取后未更新，跳过")
+                        self.source_scheduler.record(source['id'], True)
+                        return []
+                    response.raise_for_status()
+                    feed = await asyncio.to_thread(self._parse_feed, response)
+                self._pending_feeds[source['id']] = (source['rss_url'], response.headers)
+
+            self.source_scheduler.record(source['id'], True)
+            return self._new_entries(source, self._entries_to_articles(feed, source))
+
+        except Exception as e:
+            print(f"❌ 爬取失败 {source['name']}: {e}")
+            self.source_scheduler.record(source['id'], False)
+            return []
+
+    async def _aarticle_content(self, client: "httpx.AsyncClient", article: Dict, limits: Dict[str, asyncio.Semaphore]) -> Optional[str]:
+        profile = self._extraction_profile(article)
+        with self.metrics.stage('article', source=article['source_name']):
+            if profile.use_description:
+                return self._description_content(article, profile)
+            return await self._aextract_article_content(client, article['link'], limits, profile)
+
+    async def _aextract_article_content(self, client: "httpx.AsyncClient", url: str, limits: Dict[str, asyncio.Semaphore],
+                                        profile: Optional[ExtractionProfile] = None) -> Optional[str]:
+        try:
+            # 同 _afetch_single_rss：先等待主机间隔，再占用下载名额
+            await self._host_throttle.async_wait(url)
+            async with limits['downloads']:
+                with self.metrics.stage('download'):
+                    response = await client.get(url, headers=self._cache_headers(url))
+            self.metrics.add_bytes('article', len(response.content))
+            if response.status_code == 304:
+                self._cache_touch(url, response.headers)
+                return self._cached_payload(url)
+
+            # HTML解析是CPU密集操作，放到线程中避免阻塞事件循环
+            profile = profile or self.extraction_profiles.get(url=url)
+            content = await asyncio.to_thread(self._parse_article_html, response.content, profile)
+            if response.status_code == 200:
+                self._cache_store(url, response.headers, content)
+            return content
+
+        except Exception as e:
+            print(f"内容提取失败 {url}: {e}")
+            return None
+
+    @timed('translate')
+    async def atranslate_to_chinese(self, client: "httpx.AsyncClient", text: str, text_type: str = "content") -> str:
+        """使用AI API翻译英文为中文；长文按段落/句子边界分段并发翻译"""
+        if not text or not self.config['auto_translate']:
+            return text
+
+        backend = self._translation_backend()
+        if backend is None:
+            print("⚠️ 未配置AI API密钥，跳过翻译")
+            return text
+
+        if estimate_tokens(text) > self.config['chunk_max_tokens']:
+            return await self._atranslate_chunked(client, backend, text, self._prompt_type(text_type)[0])
+
+        cache_key, cached = self._lookup_translation(backend, text, text_type)
+        if cached is not None:
+            return cached
+
+        return await self._atranslate_uncached(client, backend, text, text_type, cache_key)
+
+    async def _atranslate_chunked(self, client: "httpx.AsyncClient", backend: Tuple[str, str], text: str, text_type: str) -> str:
+        chunks, paragraph_starts = zip(*split_chunks(text, self.config['chunk_max_tokens']))
+        print(f"   ✂️ 长文分为 {len(chunks)} 段并行翻译")
+
+        async def translate_chunk(chunk: str) -> str:
+            cache_key, cached = self._lookup_translation(backend, chunk, text_type)
+            if cached is not None:
+                return cached
+
+            for attempt in range(self.config['chunk_max_retries'] + 1):
+                translation = await self._atranslate_uncached(client, backend, chunk, text_type, cache_key)
+                if translation and translation != chunk:
+                    return translation
+                print(f"   ⚠️ 分段翻译失败（第 {attempt + 1} 次）")
+            return chunk
+
+        translations = await asyncio.gather(*(translate_chunk(chunk) for chunk in chunks))
+        return join_chunks(translations, paragraph_starts)
+
+    async def _atranslate_uncached(self, client: "httpx.AsyncClient", backend: Tuple[str, str], text: str, text_type: str, cache_key: Optional[str]) -> str:
+        try:
+            translation = await self.translation_router.acall(
+                lambda provider: self._atranslate_via(client, provider, text, text_type)
+            )
+        except Exception as e:
+            print(f"翻译失败: {e}")
+            return text
+
+        self._remember_translation(cache_key, text, translation)
+        return translation
+
+    async def atranslate_to_chinese_stream(self, client: "httpx.AsyncClient", text: str, text_type: str = "content") -> AsyncIterator[str]:
+        """流式翻译：边接收边产出译文片段
+
+        适合需要尽早处理译文的调用方；超过 ``stream_inactivity_timeout`` 秒
+        没有新内容即中止。尚未产出任何内容时失败会产出原文（与
+        :meth:`atranslate_to_chinese` 一致）；已产出部分译文后中断则抛出
+        ``RuntimeError``，避免调用方把半篇译文当成完整结果。
+        """
+        if not text or not self.config['auto_translate']:
+            yield text
+            return
+
+        backend = self._translation_backend()
+        if backend is None:
+            print("⚠️ 未配置AI API密钥，跳过翻译")
+            yield text
+            return
+
+        cache_key, cached = self._lookup_translation(backend, text, text_type)
+        if cached is not None:
+            yield cached
+            return
+
+        produced: List[str] = []
+        try:
+            async for delta in self._astream_chat(client, self._stream_backend(), text, text_type):
+                produced.append(delta)
+                yield delta
+        except Exception as e:
+            print(f"流式翻译中断: {e}")
+            if produced:
+                raise RuntimeError(f"流式翻译在产出部分译文后中断: {e}") from e
+            yield text
+            return
+
+        self._remember_translation(cache_key, text, ''.join(produced).strip())
+
+    async def _astream_chat(self, client: "httpx.AsyncClient", backend: Tuple[str, str], text: str, text_type: str) -> AsyncIterator[str]:
+        import httpx
+
+        url, headers, payload = self._chat_request(backend, text, text_type)
+        inactivity = self.config['stream_inactivity_timeout']
+
+        request = client.build_request('POST', url, headers=headers, json=dict(payload, stream=True),
+                                       timeout=httpx.Timeout(30, read=inactivity))
+        # 读完整个流之前一直占用名额
+        async with self._translation_slots():
+            response = await self.rate_limiters[backend[0]].acall(
+                sent(lambda: client.send(request, stream=True)), self._payload_tokens(payload)
+            )
+            try:
+                response.raise_for_status()
+                lines = response.aiter_lines()
+                last_progress = time.monotonic()
+                while True:
+                    remaining = inactivity - (time.monotonic() - last_progress)
+                    try:
+                        line = await asyncio.wait_for(lines.__anext__(), timeout=max(remaining, 0.001))
+                    except StopAsyncIteration:
+                        raise ConnectionError("流式响应在结束标记前断开")
+                    except asyncio.TimeoutError:
+                        raise TimeoutError(f"流式响应超过 {inactivity} 秒没有新内容")
+
+                    done, delta = self._parse_sse_line(line)
+                    if done:
+                        return
+                    if delta:
+                        last_progress = time.monotonic()
+                        yield delta
+            finally:
+                await response.aclose()
+
+    @timed('translate_batch')
+    async def atranslate_batch(self, client: "httpx.AsyncClient", segments: List[Tuple[str, str]]) -> List[str]:
+        """批量翻译多个 (原文, 类型) 片段，返回与输入等长的译文列表
+
+        已缓存的片段直接复用；其余片段按 ``batch_max_segments`` / ``batch_max_chars``
+        分组，各组请求并发发出。响应校验失败或缺失的片段逐条回退到单独翻译。
+        """
+        backend, results, cache_keys, groups = self._plan_batches(segments)
+        if not groups:
+            return results
+
+        print(f"   🌐 批量翻译 {sum(len(group) for group in groups)} 个片段（{len(groups)} 次请求）")
+
+        async def run_group(group: List[int]) -> None:
+            try:
+                translations = await self._atranslate_batch(client, [segments[i] for i in group])
+            except Exception as e:
+                print(f"批量翻译失败，回退到逐条翻译: {e}")
+                translations = [None] * len(group)
+
+            fallbacks = []
+            for index, translation in zip(group, translations):
+                if translation:
+                    results[index] = translation
+                    self._remember_translation(cache_keys[index], segments[index][0], translation)
+                else:
+                    fallbacks.append(index)
+
+            fallback_results = await asyncio.gather(*(
+                self._atranslate_uncached(client, backend, segments[i][0], segments[i][1], cache_keys[i])
+                for i in fallbacks
+            ))
+            for index, translation in zip(fallbacks, fallback_results):
+                results[index] = translation
+
+        await asyncio.gather(*(run_group(group) for group in groups))
+        return results
+
+    async def _atranslate_batch(self, client: "httpx.AsyncClient", segments: List[Tuple[str, str]]) -> List[Optional[str]]:
+        content = await self.translation_router.acall(
+            lambda provider: self._arequest_batch(client, provider, segments), kind='batch'
+        )
+        return self._parse_batch_translations(content, len(segments))
+
+    async def _arequest_batch(self, client: "httpx.AsyncClient", provider: str, segments: List[Tuple[str, str]]) -> str:
+        if provider == 'deepseek':
+            return await self._adeepseek_chat(client, self._batch_payload(segments), timeout=60)
+        return await self._aopenai_chat(client, self._batch_messages(segments), max_tokens=4000, timeout=60,
+                                        response_format={"type": "json_object"})
+
+    async def _adeepseek_chat(self, client: "httpx.AsyncClient", payload: Dict, timeout: float = 30) -> str:
+        """调用DeepSeek接口（经限速器发出，429/5xx 自动退避重试），HTTP错误时抛出异常"""
+        async with self._translation_slots():
+            response = await self.rate_limiters['deepseek'].acall(
+                sent(lambda: client.post(DEEPSEEK_CHAT_URL, headers=self._deepseek_headers(), json=payload, timeout=timeout)),
+                self._payload_tokens(payload)
+            )
+        response.raise_for_status()
+        return self._deepseek_content(response.json())
+
+    async def _atranslate_via(self, client: "httpx.AsyncClient", provider: str, text: str, text_type: str) -> str:
+        """由指定服务翻译一条文本；失败或译文为空时抛出异常，由路由器切换到其他服务"""
+        if self.config['stream_translations']:
+            backend = (provider, PROVIDER_MODELS[provider])
+            translation = ''.join([delta async for delta in self._astream_chat(client, backend, text, text_type)]).strip()
+        elif provider == 'deepseek':
+            translation = await self._adeepseek_chat(client, self._deepseek_payload(text, text_type))
+        else:
+            translation = await self._aopenai_chat(client, self._openai_messages(text, text_type))
+
+        if not translation:
+            raise ValueError(f"{provider} 返回了空译文")
+        return translation
+
+    async def _aprocess_article(self, client: "httpx.AsyncClient", article: Dict) -> Optional[Dict]:
+        """翻译并格式化单篇文章，失败返回 None"""
         try:
-            # 处理文章
-            articles = self.process_articles()
-            articles_posted = 0
-            bot_user_id = (
-                os.getenv("NEWS_BOT_USER_ID")
-                or os.getenv("NEXT_PUBLIC_NEWS_BOT_USER_ID")
+            if self.config['auto_translate']:
+                print(f"   🌐 翻译中: {article['title'][:50]}...")
+
+                async def translate(field: str, text: str, text_type: str) -> None:
+                    if field in article:  # 已由批量翻译完成
+                        return
+                    # 并发名额在每个AI请求处获取，长文分段后的各段请求与其他文章共用同一组名额
+                    article[field] = await self.atranslate_to_chinese(client, text, text_type)
+
+                await asyncio.gather(
+                    translate('title_zh', article['title'], "标题"),
+                    translate('content_zh', article.get('content', ''), self._content_type())
+                )
+            else:
+                article['title_zh'] = article['title']
+                article['content_zh'] = article.get('content', '')
+
+            self._finalize_article(article)
+            return article
+
+        except Exception as e:
+            print(f"   ❌ 处理失败: {e}")
+            return None
+
+    async def _afetch_candidates(self, client: "httpx.AsyncClient", limits: Dict[str, asyncio.Semaphore]) -> List[Dict]:
+        # 去重数据与RSS同时加载；已发布链接在下载正文之前排除，内容判重发生在任何翻译请求之前
+        load_dedup = asyncio.create_task(asyncio.to_thread(self._load_dedup_index))
+        entries = await self._afetch_feeds(client, limits)
+        await load_dedup
+        articles = await self._afetch_top_articles(client, entries, limits)
+        print(f"📰 获取到 {len(articles)} 篇高质量文章")
+        candidates = [article for article in articles if self._passes_filters(article)]
+
+        if self.config['auto_translate'] and self.config['batch_translation']:
+            segments = self._batch_segments(candidates)
+            translations = await self.atranslate_batch(client, [(text, text_type) for _, _, text, text_type in segments])
+            for (article, field, _, _), translation in zip(segments, translations):
+                article[field] = translation
+
+        return candidates
+
+    def _get_bot_user_id(self) -> str:
+        bot_user_id = (
+            os.getenv("NEWS_BOT_USER_ID")
+            or os.getenv("NEXT_PUBLIC_NEWS_BOT_USER_ID")
+        )
+        if not bot_user_id:
+            raise RuntimeError(
+                "缺少新闻机器人账号 ID。请在部署环境中配置 NEWS_BOT_USER_ID "
+                "（或 NEXT_PUBLIC_NEWS_BOT_USER_ID）以指向具有发帖权限的 Supabase 用户。"
             )
-            if not bot_user_id:
-                raise RuntimeError(
-                    "缺少新闻机器人账号 ID。请在部署环境中配置 NEWS_BOT_USER_ID "
-                    "（或 NEXT_PUBLIC_NEWS_BOT_USER_ID）以指向具有发帖权限的 Supabase 用户。"
+        return bot_user_id
+
+    def _build_post_data(self, article: Dict, bot_user_id: str) -> Dict:
+        data = {
+            "title": article['title_zh'],
+            "content": article['forum_post']['content'],
+            "category": article['category'],
+            "source": article['forum_post']['source'],
+            "original_url": article['forum_post']['original_url'],
+            "user_id": bot_user_id,
+            "is_bot_post": True,
+            "created_at": article['forum_post']['created_at']
+        }
+        # 未迁移的数据库没有 minhash 列，带上该键会让整批 insert 失败
+        if self.config['store_minhash'] and article.get('minhash'):
+            data["minhash"] = article['minhash']
+        return data
+
+    @timed('publish')
+    def publish_posts(self, articles: List[Dict], bot_user_id: str) -> List[Dict]:
+        """批量发帖，返回发帖成功的文章（按数据库返回的行判断）"""
+        if not articles:
+            return []
+        rows = [self._build_post_data(article, bot_user_id) for article in articles]
+        inserted = insert_rows(
+            self.supabase, "posts", rows, match_key="original_url",
+            batch_size=max(1, self.config['insert_batch_size'])
+        )
+
+        published = []
+        for article, row in zip(articles, inserted):
+            if row is None:
+                print(f"❌ 发帖失败: {article['title'][:50]}...")
+                continue
+            article['post_id'] = row.get('id')
+            published.append(article)
+        return published
+
+    async def arun_once(self) -> Dict:
+        """异步执行一次完整的新闻处理流程
+
+        RSS抓取与文章下载跨源并发；筛选出候选文章后，每篇文章的翻译作为独立
+        任务并发执行，全部完成后用多行 insert 一次性发帖。各阶段并发数由
+        ``max_concurrent_*`` 配置控制。
+        """
+        start_time = time.time()
+        started_at = datetime.now()
+        try:
+            bot_user_id = self._get_bot_user_id()
+            if self.translation_cache:
+                self.translation_cache.reset_stats()
+            self.metrics.reset()
+            print("🤖 新闻机器人开始工作...")
+            await asyncio.to_thread(self.refresh_sources)
+            limits = self._create_stage_limits()
+
+            async with self._client_scope() as client:
+                candidates = await self._afetch_candidates(client, limits)
+
+                processed = await asyncio.gather(
+                    *(self._aprocess_article(client, article) for article in candidates)
                 )
 
-            for article in articles:
-                post_data = {
-                    "title": article['title_zh'],
-                    "content": article['forum_post']['content'],
-                    "category": article['category'],
-                    "source": article['source'],
-                    "original_url": article['original_url'],
-                    "user_id": bot_user_id,
-                    "is_bot_post": True,
-                    "created_at": article['forum_post']['created_at']
-                }
-                try:
-                    resp = self.supabase.table("posts").insert(post_data).execute()
-                    if hasattr(resp, 'status_code') and resp.status_code in [200, 201]:
-                        articles_posted += 1
-                except Exception as e:
-                    print(f"❌ 发帖失败: {e}")
+            articles = [article for article in processed if article]
+            published = await asyncio.to_thread(self.publish_posts, articles, bot_user_id)
+            await asyncio.to_thread(self.record_published, published)
+            await asyncio.to_thread(self.commit_seen_entries, published)
+            print(f"🎉 共处理完成 {len(articles)} 篇文章")
+
             # 统计信息
             stats = {
                 'success': True,
                 'articles_processed': len(articles),
-                'articles_posted': articles_posted,
+                'articles_posted': len(published),
                 'processing_time': round(time.time() - start_time, 2),
                 'timestamp': datetime.now().isoformat(),
+                'translation_cache': self.translation_cache.stats() if self.translation_cache else None,
+                'rate_limits': {provider: limiter.stats() for provider, limiter in self.rate_limiters.items()},
+                'connections': self.http.stats(),
+                'translation_providers': self.translation_router.stats(),
+                'sources': {
+                    'origin': self.source_registry.origin,
+                    'enabled': len(self.source_registry.enabled()),
+                    'crawled': self._crawled_sources
+                },
+                'metrics': self.metrics.report(),
                 'articles': articles
             }
             print(f"📊 运行统计:")
             print(f"   处理文章: {stats['articles_processed']} 篇")
             print(f"   成功发帖: {stats['articles_posted']} 篇")
             print(f"   处理时间: {stats['processing_time']} 秒")
-            return stats
+            print(f"   新闻源: 抓取 {stats['sources']['crawled']}/{stats['sources']['enabled']} 个（{stats['sources']['origin']}）")
+            if stats['translation_cache']:
+                cache_stats = stats['translation_cache']
+                print(f"   翻译缓存: 命中 {cache_stats['hits']} 次, 未命中 {cache_stats['misses']} 次")
+            stages = stats['metrics']['stages']
+            if stages:
+                print("   阶段耗时: " + ", ".join(
+                    f"{name} {stage['count']}次/p95 {stage['p95_ms']:.0f}ms" for name, stage in stages.items()
+                ))
         except Exception as e:
-            return {
+            stats = {
                 'success': False,
                 'error': str(e),
                 'processing_time': round(time.time() - start_time, 2),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': datetime.now().isoformat(),
+                'metrics': self.metrics.report()
             }
 
+        await asyncio.to_thread(self._persist_run_report, stats, started_at)
+        return stats
+
+    def _persist_run_report(self, stats: Dict, started_at: datetime) -> None:
+        """开启 persist_metrics 时把运行统计（不含文章内容）写入 news_task_logs"""
+        if not self.config['persist_metrics'] or not self.supabase:
+            return
+        try:
+            self.supabase.table('news_task_logs').insert({
+                'task_name': 'enhanced_newsbot',
+                'task_type': 'crawl',
+                'status': 'completed' if stats['success'] else 'failed',
+                'result_data': {key: value for key, value in stats.items() if key not in ('articles', 'error')},
+                'error_message': stats.get('error'),
+                'started_at': started_at.isoformat(),
+                'completed_at': datetime.now().isoformat()
+            }).execute()
+        except Exception as e:
+            print(f"⚠️ 运行统计写入 news_task_logs 失败: {e}")
+
+    def run_once(self) -> Dict:
+        """执行一次完整的新闻处理流程（同步入口，委托给 :meth:`arun_once`）"""
+        return _run_sync(self.arun_once())
+
+    def close(self) -> None:
+        """关闭本地缓存数据库（进程内共享的连接池不在此关闭）"""
+        for store in (self.http_cache, self.translation_cache, self.feed_index, self.source_scheduler.store):
+            if store is not None:
+                store.close()
+
 # 使用示例
 def main():
     """主函数 - 可以直接运行测试"""
@@ -12,17 +12,22 @@
 import os
 import re
 import json
-import time
-import hashlib
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
 # Supabase 集成
 from supabase import create_client, Client
 
+from newsbot_dedup import NearDuplicateIndex, content_signature, minhash_column_enabled, signature_to_hex
+from newsbot_extract import extract_page, get_backend
+from newsbot_http import get_pools
+from newsbot_publish import insert_rows
+from newsbot_ratelimit import get_limiter, request_tokens
+from newsbot_sources import DEFAULT_PAGE_SOURCES, SourceRegistry, load_registry
+from newsbot_summary import summarize
+
 # 配置
 class NewsBot:
     def __init__(self):
@@ -34,23 +39,25 @@ class NewsBot:
         # AI API 配置
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.deepseek_api_key = os.getenv("DEEPSEEK_API_KEY")
+        # 默认使用本地抽取式摘要；设置 NEWS_BOT_AI_SUMMARY=1 时改为每篇调用AI生成摘要
+        self.use_ai_summary = os.getenv("NEWS_BOT_AI_SUMMARY", "").lower() in ("1", "true", "yes")
         
         # 机器人配置
         self.bot_user_id = os.getenv("NEWS_BOT_USER_ID")  # 需要创建专门的机器人账号
         
-        # 新闻源配置
-        self.news_sources = [
-            {
-                "name": "BBC中文",
-                "url": "https://www.bbc.com/zhongwen/simp",
-                "domain": "bbc.com"
-            },
-            {
-                "name": "央视新闻",
-                "url": "https://news.cctv.com/",
-                "domain": "cctv.com"
-            }
-        ]
+        # 新闻源：与 EnhancedNewsBot 共用注册表（type 为 page 的源），每次任务开始时重新加载
+        self.news_sources = SourceRegistry(DEFAULT_PAGE_SOURCES).enabled('page')
+        
+        # 与 EnhancedNewsBot 共享的HTTP连接池，网页与AI接口请求复用长连接
+        self.session = get_pools().session
+        
+        # 文章页解析后端：可用时使用 selectolax/lxml，否则回退到 BeautifulSoup
+        self.html_backend = get_backend()
+        
+        # 近似去重索引，每次任务开始时重置，首次判重时加载
+        self._near_duplicates: Optional[NearDuplicateIndex] = None
+        # posts.minhash 列已迁移时才读写签名（NEWSBOT_STORE_MINHASH=1）
+        self.store_minhash = minhash_column_enabled()
         
         self.init_supabase()
     
@@ -62,13 +69,21 @@ class NewsBot:
         else:
             print("❌ Supabase 配置缺失")
     
+    def load_sources(self) -> List[Dict]:
+        """从本地文件（NEWSBOT_SOURCES_FILE）或 news_bot_config 表加载启用的首页新闻源，未配置时使用默认源"""
+        path = os.getenv("NEWSBOT_SOURCES_FILE")
+        registry, _ = load_registry(None if path else self.supabase, path, defaults=DEFAULT_PAGE_SOURCES)
+        if not registry.sources('page'):
+            registry = SourceRegistry(DEFAULT_PAGE_SOURCES)
+        return registry.enabled('page')
+
     def fetch_html(self, url: str) -> Optional[str]:
         """获取网页HTML"""
         try:
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0 Safari/537.36"
             }
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self.session.get(url, headers=headers, timeout=30)
             response.raise_for_status()
             return response.text
         except Exception as e:
@@ -108,55 +123,14 @@ class NewsBot:
         html = self.fetch_html(url)
         if not html:
             return None
-            
-        soup = BeautifulSoup(html, "html.parser")
-        
-        # 提取标题
-        title = None
-        for selector in ["h1", "title", '[property="og:title"]']:
-            element = soup.select_one(selector)
-            if element:
-                title = element.get_text(strip=True) or element.get("content")
-                if title:
-                    break
         
-        # 提取正文
-        content = ""
-        for selector in ["article", ".article", ".content", ".post", "#content"]:
-            element = soup.select_one(selector)
-            if element:
-                # 清理无用标签
-                for tag in element.select("script,style,nav,header,footer,aside"):
-                    tag.decompose()
-                
-                paragraphs = element.find_all("p")
-                content = " ".join([p.get_text(strip=True) for p in paragraphs])
-                break
-        
-        if not content:
-            paragraphs = soup.find_all("p")
-            content = " ".join([p.get_text(strip=True) for p in paragraphs])
-        
-        # 提取封面图
-        image_url = None
-        og_image = soup.select_one('[property="og:image"]')
-        if og_image:
-            image_url = og_image.get("content")
-        
-        if not image_url:
-            first_img = soup.select_one("img")
-            if first_img:
-                image_url = urljoin(url, first_img.get("src", ""))
-        
-        return {
-            "title": title,
-            "content": content,
-            "image_url": image_url,
-            "source_url": url
-        }
+        # 标题、正文和封面图的提取规则见 newsbot_extract.extract_page
+        article = extract_page(html, url, backend=self.html_backend)
+        article["source_url"] = url
+        return article
     
     def ai_summarize(self, title: str, content: str, provider: str = "openai") -> Optional[str]:
-        """AI摘要生成"""
+        """AI摘要生成（与翻译共用该服务商的限速器，429/5xx 自动退避重试）"""
         if provider == "deepseek":
             api_key = self.deepseek_api_key
             endpoint = "https://api.deepseek.com/v1/chat/completions"
@@ -197,7 +171,10 @@ class NewsBot:
                 "max_tokens": 300
             }
             
-            response = requests.post(endpoint, headers=headers, json=payload, timeout=30)
+            response = get_limiter(provider).call(
+                lambda: self.session.post(endpoint, headers=headers, json=payload, timeout=30),
+                request_tokens(payload["messages"], payload["max_tokens"])
+            )
             response.raise_for_status()
             
             data = response.json()
@@ -208,70 +185,59 @@ class NewsBot:
             return None
     
     def check_duplicate(self, title: str, content: str) -> bool:
-        """检查是否重复发帖"""
+        """检查是否重复发帖（MinHash 近似重复检测）
+
+        最近7天帖子的签名每次任务只加载一次，之后每篇候选文章只需查询 LSH 索引。
+        未重复的文章会登记到索引中，同一次任务里不同媒体转载的同一新闻只保留一篇。
+        """
         if not self.supabase:
             return False
             
         try:
-            # 生成内容指纹
-            content_hash = hashlib.md5(f"{title}{content}".encode()).hexdigest()
-            
-            # 检查最近7天的帖子
-            week_ago = (datetime.now() - timedelta(days=7)).isoformat()
-            
-            result = self.supabase.table("posts").select("id").eq("user_id", self.bot_user_id).gte("created_at", week_ago).execute()
+            if self._near_duplicates is None:
+                week_ago = (datetime.now() - timedelta(days=7)).isoformat()
+                self._near_duplicates = NearDuplicateIndex.load_posts(
+                    self.supabase, week_ago, with_signatures=self.store_minhash, user_id=self.bot_user_id
+                )
             
-            # 简单检查标题相似度
-            for post in result.data:
-                existing_title = post.get("title", "")
-                if self.text_similarity(title, existing_title) > 0.8:
-                    return True
-            
-            return False
+            # 帖子标题带有 "📰 " 前缀，旧帖子（无签名）按完整标题匹配
+            return not self._near_duplicates.claim(content_signature(title, content), title=f"📰 {title}")
         except Exception as e:
             print(f"❌ 重复检查失败: {e}")
             return False
     
-    def text_similarity(self, text1: str, text2: str) -> float:
-        """简单的文本相似度计算"""
-        set1 = set(text1.replace(" ", ""))
-        set2 = set(text2.replace(" ", ""))
-        
-        if not set1 or not set2:
-            return 0.0
-            
-        intersection = len(set1 & set2)
-        union = len(set1 | set2)
-        
-        return intersection / union if union > 0 else 0.0
+    def _post_data(self, title: str, content: str, image_url: Optional[str] = None,
+                   minhash: Optional[str] = None) -> Dict:
+        data = {
+            "user_id": self.bot_user_id,
+            "title": f"📰 {title}",
+            "content": content,
+            "image_url": image_url,
+            "image_alt": "新闻配图"
+        }
+        # 未迁移的数据库没有 minhash 列，带上该键会让 insert 失败
+        if minhash is not None and self.store_minhash:
+            data["minhash"] = minhash
+        return data
     
-    def post_to_forum(self, title: str, content: str, image_url: Optional[str] = None) -> bool:
+    def post_to_forum(self, title: str, content: str, image_url: Optional[str] = None,
+                      minhash: Optional[str] = None) -> bool:
         """发布到论坛"""
+        return self.post_many_to_forum([self._post_data(title, content, image_url, minhash)])[0]
+    
+    def post_many_to_forum(self, posts: List[Dict]) -> List[bool]:
+        """批量发布到论坛，返回与 ``posts`` 一一对应的发布结果"""
         if not self.supabase or not self.bot_user_id:
             print("❌ Supabase 或机器人账号未配置")
-            return False
+            return [False] * len(posts)
         
-        try:
-            post_data = {
-                "user_id": self.bot_user_id,
-                "title": f"📰 {title}",
-                "content": content,
-                "image_url": image_url,
-                "image_alt": "新闻配图"
-            }
-            
-            result = self.supabase.table("posts").insert(post_data).execute()
-            
-            if result.data:
-                print(f"✅ 成功发帖: {title}")
-                return True
+        inserted = insert_rows(self.supabase, "posts", posts, match_key="title")
+        for post, row in zip(posts, inserted):
+            if row:
+                print(f"✅ 成功发帖: {post['title']}")
             else:
-                print(f"❌ 发帖失败: {title}")
-                return False
-                
-        except Exception as e:
-            print(f"❌ 发帖异常: {e}")
-            return False
+                print(f"❌ 发帖失败: {post['title']}")
+        return [row is not None for row in inserted]
     
     def run_daily_news(self, max_posts: int = 5) -> Dict:
         """执行每日新闻抓取和发布"""
@@ -286,8 +252,10 @@ class NewsBot:
         }
         
         all_articles = []
+        self._near_duplicates = None
         
         # 1. 从各新闻源抓取链接
+        self.news_sources = self.load_sources()
         for source in self.news_sources:
             print(f"🔍 抓取新闻源: {source['name']}")
             
@@ -299,7 +267,7 @@ class NewsBot:
             results["total_links"] += len(links)
             
             # 2. 提取文章内容
-            for link in links[:10]:  # 每个源最多处理10篇
+            for link in links[:source.get("max_articles") or 10]:  # 每个源默认最多处理10篇
                 article = self.extract_article_content(link["url"])
                 if article and len(article.get("content", "")) > 200:
                     article["source_name"] = source["name"]
@@ -310,10 +278,10 @@ class NewsBot:
         all_articles.sort(key=lambda x: len(x.get("content", "")), reverse=True)
         selected_articles = all_articles[:max_posts * 2]  # 多选一些备用
         
-        # 4. AI摘要和发布
-        posted_count = 0
+        # 4. 生成摘要，收集帖子后一次性批量发布
+        posts = []
         for article in selected_articles:
-            if posted_count >= max_posts:
+            if len(posts) >= max_posts:
                 break
                 
             title = article.get("title", "")
@@ -325,8 +293,10 @@ class NewsBot:
                 results["skipped"] += 1
                 continue
             
-            # AI摘要
-            summary = self.ai_summarize(title, content)
+            # 摘要：AI摘要未开启或失败时使用抽取式摘要
+            summary = self.ai_summarize(title, content) if self.use_ai_summary else None
+            if not summary:
+                summary = summarize(content, max_sentences=3, max_chars=150)
             if not summary:
                 results["errors"] += 1
                 continue
@@ -341,13 +311,14 @@ class NewsBot:
 ---
 *本内容由新闻机器人自动抓取整理*"""
             
-            # 发布到论坛
-            if self.post_to_forum(title, post_content, article.get("image_url")):
-                posted_count += 1
-                results["posted"] += 1
-                time.sleep(2)  # 避免频繁发帖
-            else:
-                results["errors"] += 1
+            signature = signature_to_hex(content_signature(title, content))
+            posts.append(self._post_data(title, post_content, article.get("image_url"), minhash=signature))
+        
+        # 5. 发布到论坛
+        if posts:
+            published = self.post_many_to_forum(posts)
+            results["posted"] += sum(published)
+            results["errors"] += len(published) - sum(published)
         
         print(f"✅ 每日新闻任务完成: {results}")
         return results
@@ -0,0 +1,173 @@
+"""
+新闻机器人常驻运行模式
+
+``python main.py newsbot --daemon`` 在一个进程中持续运行同一个
+EnhancedNewsBot 实例：HTTP 连接池、异步客户端、限速器、翻译服务统计、
+进程内翻译缓存与本地 SQLite 数据库在各轮之间保持，不必每次冷启动。
+
+下一轮的时间由 :meth:`SourceScheduler.seconds_until_due` 决定——最早一个
+新闻源按其 ``fetch_interval_minutes`` 到期时就运行一轮，只抓取到期的源；
+两轮之间至少间隔 ``min_interval`` 秒。运行失败时按指数退避延后下一轮。
+
+收到 SIGTERM / SIGINT 后不再开始新的一轮，等待当前这一轮完成（最多
+``shutdown_timeout`` 秒，超时或再次收到信号则取消），然后关闭客户端与本地
+数据库后退出。
+"""
+
+import asyncio
+import signal
+import time
+from typing import Dict, Optional
+
+
+class NewsBotDaemon:
+    """在事件循环中反复调用 ``bot.arun_once()``，直到收到停止信号"""
+
+    def __init__(self, bot, min_interval: float = 120, max_sleep: float = 300,
+                 reload_interval: float = 300, shutdown_timeout: float = 120,
+                 max_error_backoff: float = 1800):
+        self.bot = bot
+        self.min_interval = min_interval            # 两轮开始时间的最小间隔（秒）
+        self.max_sleep = max_sleep                  # 单次休眠上限，醒来后重新计算下一轮时间
+        self.reload_interval = reload_interval      # 空闲时重新加载新闻源注册表的间隔
+        self.shutdown_timeout = shutdown_timeout    # 停止时等待当前一轮完成的最长时间
+        self.max_error_backoff = max_error_backoff  # 连续失败时的最长退避
+        self.cycles = 0
+        self.failures = 0
+        self._last_cycle = float('-inf')
+        self._last_reload = float('-inf')
+        self._stop: Optional[asyncio.Event] = None
+        self._current: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ------------------------------------------------------------------
+    # 停止
+    # ------------------------------------------------------------------
+
+    def stop(self) -> None:
+        """请求停止（可在信号处理函数或其他线程中调用）；第二次调用时取消当前这一轮"""
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._request_stop)
+
+    def _request_stop(self) -> None:
+        if self._stop.is_set():
+            if self._current and not self._current.done():
+                print("⛔ 再次收到停止信号，取消当前运行")
+                self._current.cancel()
+            return
+        print("🛑 收到停止信号，当前一轮结束后退出")
+        self._stop.set()
+
+    def _install_signal_handlers(self) -> None:
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                self._loop.add_signal_handler(sig, self._request_stop)
+            except (NotImplementedError, RuntimeError):
+                # Windows 的事件循环不支持 add_signal_handler
+                signal.signal(sig, lambda *_: self.stop())
+
+    def _remove_signal_handlers(self) -> None:
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                self._loop.remove_signal_handler(sig)
+            except (NotImplementedError, RuntimeError):
+                signal.signal(sig, signal.SIG_DFL)
+
+    # ------------------------------------------------------------------
+    # 调度
+    # ------------------------------------------------------------------
+
+    def _next_wait(self) -> float:
+        """距下一轮还需等待的秒数"""
+        now = time.monotonic()
+        wait = self.min_interval - (now - self._last_cycle)
+        if self.failures:
+            backoff = min(self.min_interval * 2 ** self.failures, self.max_error_backoff)
+            wait = max(wait, backoff - (now - self._last_cycle))
+        if self.bot.config['source_scheduling']:
+            wait = max(wait, self.bot.source_scheduler.seconds_until_due(self.bot.source_registry.enabled()))
+        return max(0.0, wait)
+
+    async def _sleep(self, seconds: float) -> None:
+        """休眠，收到停止信号时提前醒来"""
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _reload_sources(self) -> None:
+        """空闲期间定期重新加载注册表，新增的源或修改的间隔无需等到下一轮运行才生效"""
+        if time.monotonic() - self._last_reload < self.reload_interval:
+            return
+        self._last_reload = time.monotonic()
+        try:
+            await asyncio.to_thread(self.bot.refresh_sources)
+        except Exception as e:
+            print(f"⚠️ 重新加载新闻源失败: {e}")
+
+    # ------------------------------------------------------------------
+    # 运行
+    # ------------------------------------------------------------------
+
+    async def _run_cycle(self) -> Optional[Dict]:
+        """运行一轮；收到停止信号时最多再等 ``shutdown_timeout`` 秒"""
+        self._current = asyncio.create_task(self.bot.arun_once())
+        stopping = asyncio.create_task(self._stop.wait())
+        try:
+            await asyncio.wait({self._current, stopping}, return_when=asyncio.FIRST_COMPLETED)
+            if not self._current.done():
+                print(f"⏳ 等待当前一轮完成（最多 {self.shutdown_timeout:g} 秒）...")
+                try:
+                    await asyncio.wait_for(asyncio.shield(self._current), timeout=self.shutdown_timeout)
+                except asyncio.TimeoutError:
+                    print("⛔ 等待超时，取消当前运行")
+                    self._current.cancel()
+            await asyncio.gather(self._current, return_exceptions=True)
+        finally:
+            stopping.cancel()
+
+        if self._current.cancelled():
+            return None
+        error = self._current.exception()
+        if error is not None:
+            return {'success': False, 'error': str(error)}
+        return self._current.result()
+
+    def _report(self, stats: Dict, started: float) -> None:
+        if stats.get('success'):
+            self.failures = 0
+            sources = stats.get('sources', {})
+            print(f"🔁 第 {self.cycles} 轮完成: 发帖 {stats['articles_posted']} 篇，"
+                  f"抓取 {sources.get('crawled', 0)}/{sources.get('enabled', 0)} 个源，"
+                  f"用时 {time.monotonic() - started:.1f} 秒")
+        else:
+            self.failures += 1
+            print(f"❌ 第 {self.cycles} 轮失败（连续 {self.failures} 次）: {stats.get('error')}")
+
+    async def run(self) -> None:
+        """持续运行，直到 :meth:`stop` 被调用或收到 SIGTERM / SIGINT"""
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._install_signal_handlers()
+        await self.bot.aopen()
+        print(f"🤖 新闻机器人常驻运行中（两轮最小间隔 {self.min_interval:g} 秒）")
+        try:
+            while not self._stop.is_set():
+                wait = self._next_wait()
+                if wait > 0:
+                    await self._sleep(min(wait, self.max_sleep))
+                    if not self._stop.is_set():
+                        await self._reload_sources()
+                    continue
+
+                self.cycles += 1
+                started = self._last_cycle = self._last_reload = time.monotonic()
+                stats = await self._run_cycle()
+                if stats is not None:
+                    self._report(stats, started)
+        finally:
+            self._remove_signal_handlers()
+            await self.bot.aclose()
+            self.bot.close()
+            print(f"👋 新闻机器人已停止，共运行 {self.cycles} 轮")
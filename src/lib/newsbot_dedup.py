@@ -0,0 +1,269 @@
+"""
+新闻机器人去重
+
+ContentHashIndex 基于 supabase/newsbot-schema.sql 中的 news_content_hashes 表：
+每次运行开始时一次性加载近期哈希到内存，候选文章在本地判重，
+运行结束时把新发布文章的哈希批量写回。
+
+NearDuplicateIndex 用 MinHash 签名识别改写、转载的同一新闻（例如 BBC、
+Reuters、AP 的同一条通稿），签名保存在 posts.minhash 列中。该列需先执行
+supabase/newsbot-schema.sql 中的迁移，再设置 ``NEWSBOT_STORE_MINHASH=1`` 启用。
+未启用时跨运行只按原文链接（posts.original_url）和原文标题
+（news_content_hashes.title，未翻译的源语言标题）精确判重，运行内仍用签名判重。
+"""
+
+import hashlib
+import os
+import random
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def minhash_column_enabled() -> bool:
+    """posts 表已添加 minhash 列（NEWSBOT_STORE_MINHASH=1）时才读写签名，否则写入未知列会被拒绝"""
+    return os.getenv("NEWSBOT_STORE_MINHASH", "").lower() in ("1", "true", "yes")
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE_RE.sub(' ', text or '').strip().lower()
+
+
+class ContentHashIndex:
+    """news_content_hashes 的内存索引"""
+
+    table = "news_content_hashes"
+    page_size = 1000  # PostgREST 默认单次最多返回 1000 行
+
+    def __init__(self, supabase, window_days: int = 30):
+        self.supabase = supabase
+        self.window_days = window_days
+        self._lock = threading.Lock()
+        self._known: Set[str] = set()
+        self._titles: Set[str] = set()
+        self._pending: Dict[str, Dict] = {}
+
+    @staticmethod
+    def compute_hash(title: str, content: str) -> str:
+        """标题 + 正文前500字符（规范化空白和大小写后）的 MD5"""
+        fingerprint = _normalize(title) + '\n' + _normalize(content)[:500]
+        return hashlib.md5(fingerprint.encode('utf-8')).hexdigest()
+
+    def load(self) -> int:
+        """从数据库加载时间窗口内的全部哈希及原文标题，返回加载数量；失败时保留内存中的数据。"""
+        since = (datetime.now(timezone.utc) - timedelta(days=self.window_days)).isoformat()
+        hashes: Set[str] = set()
+        titles: Set[str] = set()
+        try:
+            start = 0
+            while True:
+                resp = (
+                    self.supabase.table(self.table)
+                    .select("content_hash,title")
+                    .gte("created_at", since)
+                    .range(start, start + self.page_size - 1)
+                    .execute()
+                )
+                rows = resp.data or []
+                hashes.update(row['content_hash'] for row in rows)
+                titles.update(row['title'] for row in rows if row.get('title'))
+                if len(rows) < self.page_size:
+                    break
+                start += self.page_size
+        except Exception as e:
+            print(f"⚠️ 加载去重哈希失败，本次仅在内存中去重: {e}")
+            return len(self._known)
+
+        with self._lock:
+            self._known = hashes | set(self._pending)
+            self._titles = titles | {row['title'] for row in self._pending.values()}
+        return len(hashes)
+
+    def titles(self) -> List[str]:
+        """已加载的原文标题（翻译前的源语言标题），供近似去重按标题精确匹配"""
+        with self._lock:
+            return list(self._titles)
+
+    def __contains__(self, content_hash: str) -> bool:
+        with self._lock:
+            return content_hash in self._known
+
+    def claim(self, content_hash: str) -> bool:
+        """登记一个候选哈希；已存在时返回 False（重复），否则返回 True。"""
+        with self._lock:
+            if content_hash in self._known:
+                return False
+            self._known.add(content_hash)
+            return True
+
+    def record(self, content_hash: str, title: str, source: str) -> None:
+        """记录已发布文章的哈希，等待 :meth:`flush` 批量写入"""
+        with self._lock:
+            self._known.add(content_hash)
+            self._pending[content_hash] = {'content_hash': content_hash, 'title': title, 'source': source}
+
+    def flush(self) -> int:
+        """批量写入待保存的哈希，返回写入条数；已存在的哈希会被忽略。"""
+        with self._lock:
+            rows: List[Dict] = list(self._pending.values())
+        if not rows:
+            return 0
+
+        try:
+            self.supabase.table(self.table).upsert(
+                rows, on_conflict="content_hash", ignore_duplicates=True
+            ).execute()
+        except Exception as e:
+            print(f"⚠️ 保存去重哈希失败: {e}")
+            return 0
+
+        with self._lock:
+            for row in rows:
+                self._pending.pop(row['content_hash'], None)
+        return len(rows)
+
+
+# ----------------------------------------------------------------------
+# 近似重复检测：MinHash 签名 + 分段 LSH 索引
+# ----------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(r'[一-鿿]|[a-z0-9]+')
+NUM_PERMUTATIONS = 64
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(20240101)  # 固定种子：签名需要跨进程、跨运行保持一致
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERMUTATIONS)
+]
+del _rng
+
+
+def _shingles(text: str, size: int = 2) -> Set[str]:
+    """中文按字、英文按词切分后取连续 ``size`` 个 token 作为 shingle"""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) <= size:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def minhash(text: str, shingle_size: int = 2) -> Tuple[int, ...]:
+    """计算 MinHash 签名；两个签名相同位置相等的比例近似于 shingle 集合的 Jaccard 相似度"""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for shingle in _shingles(text, shingle_size)
+    ]
+    if not hashes:
+        return (_MAX_HASH,) * NUM_PERMUTATIONS
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def content_signature(title: str, content: str) -> Tuple[int, ...]:
+    """文章签名：标题 + 正文开头（转载稿件的导语基本一致）"""
+    return minhash(f"{title}\n{(content or '')[:3000]}")
+
+
+def estimate_similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def signature_to_hex(signature: Tuple[int, ...]) -> str:
+    return ''.join(f"{value:08x}" for value in signature)
+
+
+def signature_from_hex(value: str) -> Optional[Tuple[int, ...]]:
+    if not value or len(value) != NUM_PERMUTATIONS * 8:
+        return None
+    return tuple(int(value[i:i + 8], 16) for i in range(0, len(value), 8))
+
+
+class NearDuplicateIndex:
+    """MinHash 的分段 LSH 索引
+
+    签名分成 ``bands`` 段，任意一段完全相同的文章才作为候选，再用签名估算
+    相似度确认。查询只访问同一分段桶内的文章，开销与已索引的文章总数基本
+    无关。默认 21 段 × 3 行：相似度 0.55 的文章成为候选的概率约 98%，
+    相似度 0.1 的无关文章约 2%。
+    """
+
+    def __init__(self, threshold: float = 0.5, bands: int = 21):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERMUTATIONS // bands
+        self._buckets: List[Dict[Tuple[int, ...], List[Tuple[Tuple[int, ...], object]]]] = [{} for _ in range(bands)]
+        self._titles: Set[str] = set()
+        self._links: Set[str] = set()
+        self._lock = threading.Lock()
+        self.size = 0
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        return (signature[i * self.rows:(i + 1) * self.rows] for i in range(self.bands))
+
+    def add(self, signature: Optional[Tuple[int, ...]], key: object = None, title: str = '',
+            link: Optional[str] = None) -> None:
+        with self._lock:
+            self._add(signature, key, title, link)
+
+    def _add(self, signature: Optional[Tuple[int, ...]], key: object, title: str, link: Optional[str]) -> None:
+        if title:
+            self._titles.add(_normalize(title))
+        if link:
+            self._links.add(link)
+        if signature is None:
+            return
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(band_key, []).append((signature, key))
+        self.size += 1
+
+    def has_link(self, link: str) -> bool:
+        """原文链接是否已经发布过；下载正文之前即可判重"""
+        with self._lock:
+            return link in self._links
+
+    def _find(self, signature: Tuple[int, ...], title: str) -> Optional[object]:
+        """返回近似重复文章的 key（标题完全相同时返回标题），没有则返回 None"""
+        if title and _normalize(title) in self._titles:
+            return title
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            for candidate, key in buckets.get(band_key, ()):
+                if estimate_similarity(signature, candidate) >= self.threshold:
+                    return key if key is not None else title
+        return None
+
+    def claim(self, signature: Tuple[int, ...], key: object = None, title: str = '') -> bool:
+        """不存在近似重复时登记并返回 True；否则返回 False
+
+        查询与登记在同一把锁内完成，并发判重的同一新闻只有一篇能登记成功。
+        """
+        with self._lock:
+            if self._find(signature, title) is not None:
+                return False
+            self._add(signature, key, title, None)
+        return True
+
+    @classmethod
+    def load_posts(cls, supabase, since: str, threshold: float = 0.5, page_size: int = 1000,
+                   with_signatures: bool = True, **filters) -> "NearDuplicateIndex":
+        """一次性加载时间窗口内帖子的签名和原文链接；没有签名的旧帖子按标题精确匹配
+
+        ``with_signatures`` 为 False 时不读取 minhash 列（数据库尚未迁移）。
+        """
+        index = cls(threshold)
+        columns = "id,title,minhash,original_url" if with_signatures else "id,title,original_url"
+        start = 0
+        while True:
+            query = supabase.table("posts").select(columns).gte("created_at", since)
+            for column, value in filters.items():
+                query = query.eq(column, value)
+            rows = query.range(start, start + page_size - 1).execute().data or []
+            for row in rows:
+                index.add(signature_from_hex(row.get('minhash')), row.get('id'), row.get('title') or '',
+                          row.get('original_url'))
+            if len(rows) < page_size:
+                return index
+            start += page_size
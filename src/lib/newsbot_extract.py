@@ -0,0 +1,353 @@
+"""
+新闻机器人正文提取
+
+HTML 解析后端可插拔：优先使用 C 实现的 selectolax（Lexbor），其次 lxml
+（需要 cssselect），都未安装时回退到 BeautifulSoup。解析前先用正则剔除
+script、style 等与正文无关的大块内容，解析器只需处理页面结构和文字。
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Union
+from urllib.parse import urljoin, urlparse
+
+from newsbot_text import BOILERPLATE_PATTERNS, TextCleaner
+
+Markup = Union[str, bytes]
+
+# 文章页中与正文无关的标签：解析前整体剔除（内联脚本常占新闻页体积的大半）
+_NOISE_RE = re.compile(
+    r'<(script|style|noscript|template|svg)\b[^>]*>.*?</\1\s*>|<!--.*?-->|<\?xml[^>]*\?>',
+    re.IGNORECASE | re.DOTALL
+)
+_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w-]+)', re.IGNORECASE)
+
+# 文章页正文的内容选择器，按顺序尝试
+CONTENT_SELECTORS = (
+    '[data-component="text-block"]',  # BBC
+    '.article-content',               # 通用
+    '.story-body',                    # CNN
+    '.article-body',                  # Guardian
+    '.StandardArticleBody_body',      # Reuters
+)
+
+# 解析后再从正文区域移除的结构性标签
+ARTICLE_NOISE_TAGS = ("nav", "footer", "aside")
+PAGE_NOISE_TAGS = ("nav", "header", "footer", "aside")
+
+
+def decode_html(html: Markup) -> str:
+    """按 <meta charset> 声明解码字节内容，未声明时按 UTF-8"""
+    if isinstance(html, str):
+        return html
+    match = _CHARSET_RE.search(html[:2048])
+    if match:
+        try:
+            return html.decode(match.group(1).decode('ascii'), errors='replace')
+        except LookupError:
+            pass
+    return html.decode('utf-8', errors='replace')
+
+
+def strip_noise(html: Markup) -> str:
+    return _NOISE_RE.sub('', decode_html(html))
+
+
+class _Backend:
+    """解析后端接口：只包含正文提取用到的几个操作"""
+
+    name = ''
+
+    def parse(self, html: str):
+        raise NotImplementedError
+
+    def remove(self, node, tags: Sequence[str]) -> None:
+        raise NotImplementedError
+
+    def select(self, node, selector: str) -> List:
+        raise NotImplementedError
+
+    def select_one(self, node, selector: str):
+        found = self.select(node, selector)
+        return found[0] if found else None
+
+    def text(self, node, strip: bool = False) -> str:
+        """节点的全部文字；``strip`` 时逐个文本片段去除空白后直接拼接"""
+        raise NotImplementedError
+
+    def attr(self, node, name: str) -> Optional[str]:
+        raise NotImplementedError
+
+
+class _SelectolaxBackend(_Backend):
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    def parse(self, html: str):
+        return self._parser(html)
+
+    def remove(self, node, tags: Sequence[str]) -> None:
+        node.strip_tags(list(tags))
+
+    def select(self, node, selector: str) -> List:
+        return node.css(selector)
+
+    def select_one(self, node, selector: str):
+        return node.css_first(selector)
+
+    def text(self, node, strip: bool = False) -> str:
+        return node.text(deep=True, separator='', strip=strip)
+
+    def attr(self, node, name: str) -> Optional[str]:
+        return node.attributes.get(name)
+
+
+class _LxmlBackend(_Backend):
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+        from lxml.cssselect import CSSSelector
+        self._document_fromstring = lxml.html.document_fromstring
+        self._strip_elements = etree.strip_elements
+        self._css_selector = CSSSelector
+        self._local = threading.local()  # 编译后的选择器按线程缓存
+
+    def parse(self, html: str):
+        return self._document_fromstring(html if html.strip() else '<html></html>')
+
+    def remove(self, node, tags: Sequence[str]) -> None:
+        self._strip_elements(node, *tags, with_tail=False)
+
+    def select(self, node, selector: str) -> List:
+        cache = getattr(self._local, 'selectors', None)
+        if cache is None:
+            cache = self._local.selectors = {}
+        compiled = cache.get(selector)
+        if compiled is None:
+            compiled = cache[selector] = self._css_selector(selector, translator='html')
+        return compiled(node)
+
+    def text(self, node, strip: bool = False) -> str:
+        if strip:
+            return ''.join(part.strip() for part in node.itertext())
+        return node.text_content()
+
+    def attr(self, node, name: str) -> Optional[str]:
+        return node.get(name)
+
+
+class _BeautifulSoupBackend(_Backend):
+    name = 'bs4'
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        self._soup = BeautifulSoup
+
+    def parse(self, html: str):
+        return self._soup(html, 'html.parser')
+
+    def remove(self, node, tags: Sequence[str]) -> None:
+        for tag in node(list(tags)):
+            tag.decompose()
+
+    def select(self, node, selector: str) -> List:
+        return node.select(selector)
+
+    def select_one(self, node, selector: str):
+        return node.select_one(selector)
+
+    def text(self, node, strip: bool = False) -> str:
+        return node.get_text(strip=strip)
+
+    def attr(self, node, name: str) -> Optional[str]:
+        return node.get(name)
+
+
+# 'auto' 按顺序选择第一个可用的后端
+BACKENDS = {
+    'selectolax': _SelectolaxBackend,
+    'lxml': _LxmlBackend,
+    'bs4': _BeautifulSoupBackend,
+}
+_instances: Dict[str, _Backend] = {}
+
+
+def available_backends() -> List[str]:
+    names = []
+    for name in BACKENDS:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_backend(name: str = 'auto') -> _Backend:
+    """返回解析后端实例；指定的后端未安装时 'auto' 会自动回退，其余抛出 ImportError"""
+    if name == 'auto':
+        for candidate in BACKENDS:
+            try:
+                return get_backend(candidate)
+            except ImportError:
+                continue
+    if name not in BACKENDS:
+        raise ValueError(f"未知的 HTML 解析后端: {name}")
+
+    backend = _instances.get(name)
+    if backend is None:
+        backend = _instances[name] = BACKENDS[name]()
+    return backend
+
+
+def extract_text(html: Markup, selectors: Sequence[str], backend: Optional[_Backend] = None,
+                 max_paragraphs: int = 10, limit: Optional[int] = None) -> str:
+    """按顺序尝试 ``selectors``，返回第一个命中的选择器下（最多 ``limit`` 个）元素的文字；
+    都未命中时取前 ``max_paragraphs`` 个段落。"""
+    backend = backend or get_backend()
+    root = backend.parse(strip_noise(html))
+    backend.remove(root, ARTICLE_NOISE_TAGS)
+
+    for selector in selectors:
+        elements = backend.select(root, selector)
+        if elements:
+            return ' '.join(backend.text(element).strip() for element in elements[:limit])
+
+    paragraphs = backend.select(root, 'p')[:max_paragraphs]
+    return ' '.join(backend.text(p).strip() for p in paragraphs)
+
+
+def html_to_text(html: Markup, backend: Optional[_Backend] = None) -> str:
+    """HTML 片段（如 RSS 描述）的纯文字"""
+    backend = backend or get_backend()
+    return backend.text(backend.parse(strip_noise(html)))
+
+
+def extract_page(html: Markup, url: str, backend: Optional[_Backend] = None) -> Dict[str, Optional[str]]:
+    """提取网页的标题、正文段落和封面图"""
+    backend = backend or get_backend()
+    root = backend.parse(strip_noise(html))
+
+    title = None
+    for selector in ("h1", "title", '[property="og:title"]'):
+        element = backend.select_one(root, selector)
+        if element is not None:
+            title = backend.text(element, strip=True) or backend.attr(element, "content")
+            if title:
+                break
+
+    content = ""
+    for selector in ("article", ".article", ".content", ".post", "#content"):
+        element = backend.select_one(root, selector)
+        if element is not None:
+            backend.remove(element, PAGE_NOISE_TAGS)
+            content = " ".join(backend.text(p, strip=True) for p in backend.select(element, "p"))
+            break
+
+    if not content:
+        content = " ".join(backend.text(p, strip=True) for p in backend.select(root, "p"))
+
+    image_url = None
+    og_image = backend.select_one(root, '[property="og:image"]')
+    if og_image is not None:
+        image_url = backend.attr(og_image, "content")
+
+    if not image_url:
+        first_img = backend.select_one(root, "img")
+        if first_img is not None:
+            image_url = urljoin(url, backend.attr(first_img, "src") or "")
+
+    return {"title": title, "content": content, "image_url": image_url}
+
+
+# 正文长度超过这两个门槛时质量分分别加 0.2 / 0.1；RSS 描述比文章页正文短得多，门槛也相应降低
+ARTICLE_LENGTH_BONUS = (500, 1000)
+DESCRIPTION_LENGTH_BONUS = (120, 250)
+# 使用RSS描述作为正文时的默认最小长度
+DESCRIPTION_MIN_LENGTH = 80
+
+
+class ExtractionProfile:
+    """单个新闻源的正文提取规则
+
+    ``selectors`` 只包含该站点自己的选择器；``boilerplate`` 与通用的样板规则
+    一起在创建时编译，提取出的正文一次清理完成；``max_paragraphs`` 限制取用的
+    正文段落数；``use_description`` 为真时直接使用 RSS 描述作为正文，不再下载
+    文章页。
+
+    RSS 描述通常只有一两百字，``min_length``（未设置时沿用全局
+    ``min_content_length``，使用描述时默认 :data:`DESCRIPTION_MIN_LENGTH`）与
+    ``length_bonus``（质量分的长度加分门槛）按正文来源分别取值。
+    """
+
+    def __init__(self, selectors: Sequence[str] = CONTENT_SELECTORS, boilerplate: Sequence[str] = (),
+                 max_paragraphs: Optional[int] = None, use_description: bool = False,
+                 min_length: Optional[int] = None):
+        self.selectors = tuple(selectors)
+        self.cleaner = TextCleaner(tuple(boilerplate) + BOILERPLATE_PATTERNS)
+        self.max_paragraphs = max_paragraphs
+        self.use_description = use_description
+        self.min_length = DESCRIPTION_MIN_LENGTH if min_length is None and use_description else min_length
+        self.length_bonus = DESCRIPTION_LENGTH_BONUS if use_description else ARTICLE_LENGTH_BONUS
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "ExtractionProfile":
+        return cls(
+            selectors=config.get('selectors') or CONTENT_SELECTORS,
+            boilerplate=config.get('boilerplate', ()),
+            max_paragraphs=config.get('max_paragraphs'),
+            use_description=config.get('use_description', False),
+            min_length=config.get('min_length')
+        )
+
+    def extract(self, html: Markup, backend: Optional[_Backend] = None) -> str:
+        """提取并清理正文"""
+        text = extract_text(html, self.selectors, backend, max_paragraphs=self.max_paragraphs or 10,
+                            limit=self.max_paragraphs)
+        return self.cleaner.clean(text)
+
+    def description_text(self, description: str, backend: Optional[_Backend] = None) -> str:
+        return self.cleaner.clean(html_to_text(description, backend)) if description else ''
+
+
+DEFAULT_PROFILE = ExtractionProfile()
+
+
+class ProfileRegistry:
+    """按新闻源 id 或文章域名查找提取规则，都未登记时使用通用规则"""
+
+    def __init__(self, default: ExtractionProfile = DEFAULT_PROFILE):
+        self.default = default
+        self._by_source: Dict[str, ExtractionProfile] = {}
+        self._by_domain: Dict[str, ExtractionProfile] = {}
+
+    def register(self, profile: ExtractionProfile, source_id: Optional[str] = None,
+                 domains: Sequence[str] = ()) -> None:
+        if source_id:
+            self._by_source[source_id] = profile
+        for domain in domains:
+            self._by_domain[domain.lower()] = profile
+
+    @classmethod
+    def from_sources(cls, sources: Sequence[Dict]) -> "ProfileRegistry":
+        """由 news_sources 配置中各源的 ``extraction`` 字段构建"""
+        registry = cls()
+        for source in sources:
+            config = source.get('extraction')
+            if config:
+                registry.register(ExtractionProfile.from_config(config), source.get('id'), config.get('domains', ()))
+        return registry
+
+    def get(self, source_id: Optional[str] = None, url: Optional[str] = None) -> ExtractionProfile:
+        profile = self._by_source.get(source_id) if source_id else None
+        if profile is None and url:
+            host = (urlparse(url).hostname or '').lower()
+            while host and profile is None:
+                profile = self._by_domain.get(host)
+                host = host.partition('.')[2]
+        return profile or self.default
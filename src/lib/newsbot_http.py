@@ -0,0 +1,163 @@
+"""
+新闻机器人 HTTP 连接池
+
+进程内共享一组长连接：同步请求使用同一个 ``requests.Session``（按主机
+挂载连接池大小不同的适配器，连接错误和幂等请求的 502/503/504 自动重试），
+异步流水线使用配置相同的 ``httpx.AsyncClient``（可选 HTTP/2）。翻译、摘要、
+RSS 与文章页请求都复用已建立的 TCP/TLS 连接，``stats()`` 按主机报告请求数
+与新建连接数，可以直接看出连接复用情况。``requests`` 在首次使用同步会话时
+才导入，只走异步流水线的进程（如 Serverless 函数）不承担其导入开销；
+``httpx`` 同样在创建异步客户端时才导入。
+"""
+
+import threading
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# AI 接口的请求并发较高，单独给出较大的连接池；其余主机使用 ``pool_maxsize``
+DEFAULT_HOST_POOL_SIZES = {
+    'api.deepseek.com': 8,
+    'api.openai.com': 8,
+}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401  httpx 的 HTTP/2 支持依赖 h2
+    except ImportError:
+        return False
+    return True
+
+
+class ConnectionPools:
+    """共享的同步/异步连接池
+
+    ``retries`` 只作用于连接阶段的错误和 GET/HEAD 的 502/503/504；
+    POST 请求（AI 接口、写库）的 429/5xx 由调用方的限速器退避重试，
+    避免两层重试叠加。
+    """
+
+    def __init__(self, pool_maxsize: int = 10, host_pool_sizes: Optional[Dict[str, int]] = None,
+                 retries: int = 2, backoff_factor: float = 0.5, http2: bool = False,
+                 user_agent: str = DEFAULT_USER_AGENT):
+        self.pool_maxsize = pool_maxsize
+        self.host_pool_sizes = dict(DEFAULT_HOST_POOL_SIZES if host_pool_sizes is None else host_pool_sizes)
+        self.http2 = http2 and _http2_available()
+        self.user_agent = user_agent
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._lock = threading.Lock()
+        self._async_stats: Dict[str, Dict[str, int]] = {}
+        self._session: Optional["requests.Session"] = None
+
+    @property
+    def session(self) -> "requests.Session":
+        """同步请求共用的会话，首次访问时创建"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _adapter(self, pool_maxsize: int):
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=self.retries, connect=self.retries, read=1, status=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({'GET', 'HEAD'}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        # pool_connections 是缓存的主机连接池个数，新闻源、文章页主机较多，取大一些
+        return HTTPAdapter(pool_connections=32, pool_maxsize=pool_maxsize, max_retries=retry)
+
+    def _create_session(self) -> "requests.Session":
+        import requests
+
+        session = requests.Session()
+        session.headers.update({'User-Agent': self.user_agent})
+        default = self._adapter(self.pool_maxsize)
+        session.mount('https://', default)
+        session.mount('http://', default)
+        for host, size in self.host_pool_sizes.items():
+            session.mount(f'https://{host}/', self._adapter(size))
+        return session
+
+    def async_client(self, max_connections: Optional[int] = None, **kwargs) -> "httpx.AsyncClient":
+        """创建使用相同配置的异步客户端（绑定调用时的事件循环，由调用方负责关闭）"""
+        import httpx
+
+        max_connections = max_connections or self.pool_maxsize + sum(self.host_pool_sizes.values())
+        # httpx 传输层的 retries 只重试建立连接失败
+        transport = httpx.AsyncHTTPTransport(
+            http2=self.http2,
+            retries=self.retries,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+        return httpx.AsyncClient(
+            headers={'User-Agent': self.user_agent},
+            transport=transport,
+            event_hooks={'request': [self._trace_request]},
+            **kwargs
+        )
+
+    async def _trace_request(self, request: "httpx.Request") -> None:
+        """通过 httpcore 的 trace 扩展统计异步请求数与新建连接数"""
+        host = request.url.host
+        self._count_async(host, 'requests')
+
+        async def trace(event: str, info: Dict) -> None:
+            if event == 'connection.connect_tcp.complete':
+                self._count_async(host, 'connections')
+
+        request.extensions['trace'] = trace
+
+    def _count_async(self, host: str, field: str) -> None:
+        with self._lock:
+            counts = self._async_stats.setdefault(host, {'requests': 0, 'connections': 0})
+            counts[field] += 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """按主机汇总同步与异步请求的请求数、新建连接数和复用次数"""
+        with self._lock:
+            totals = {host: dict(counts) for host, counts in self._async_stats.items()}
+
+        adapters = self._session.adapters.values() if self._session is not None else ()
+        for adapter in set(adapters):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                counts = totals.setdefault(pool.host, {'requests': 0, 'connections': 0})
+                counts['requests'] += pool.num_requests
+                counts['connections'] += pool.num_connections
+
+        for counts in totals.values():
+            counts['reused'] = max(0, counts['requests'] - counts['connections'])
+        return totals
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+
+_pools: Optional[ConnectionPools] = None
+_pools_lock = threading.Lock()
+
+
+def get_pools(**options) -> ConnectionPools:
+    """返回进程内共享的连接池；``options`` 只在首次创建时生效"""
+    global _pools
+    with _pools_lock:
+        if _pools is None:
+            _pools = ConnectionPools(**options)
+        return _pools
@@ -0,0 +1,135 @@
+"""
+新闻机器人运行指标
+
+记录一次运行中各阶段（RSS抓取、文章下载、正文解析、翻译、摘要、格式化、
+写库）的耗时分布、每个新闻源的耗时、下载字节数以及 AI 接口的 token 用量。
+用 ``with metrics.stage('download'):`` 计时一段代码，或用 ``@timed('translate')``
+装饰 ``self.metrics`` 所在对象的方法（同步与异步方法均可）。开销仅为每次
+计时一次 ``perf_counter`` 调用和一次加锁。
+"""
+
+import bisect
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# 耗时直方图的桶上界（毫秒）
+BUCKET_BOUNDS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class Histogram:
+    """耗时直方图：固定分桶计数，另保留最近 ``max_samples`` 个样本用于计算分位数"""
+
+    def __init__(self, max_samples: int = 1000):
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples: List[float] = []
+        self._max_samples = max_samples
+
+    def observe(self, ms: float) -> None:
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        if len(self._samples) < self._max_samples:
+            self._samples.append(ms)
+        else:
+            self._samples[self.count % self._max_samples] = ms
+
+    def percentile(self, q: float) -> float:
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(q * len(samples)))] if samples else 0.0
+
+    def summary(self) -> Dict:
+        labels = [f'<={bound}ms' for bound in BUCKET_BOUNDS_MS] + [f'>{BUCKET_BOUNDS_MS[-1]}ms']
+        return {
+            'count': self.count,
+            'total_ms': round(self.total, 1),
+            'mean_ms': round(self.total / self.count, 1) if self.count else 0.0,
+            'p50_ms': round(self.percentile(0.5), 1),
+            'p95_ms': round(self.percentile(0.95), 1),
+            'max_ms': round(self.max, 1),
+            'buckets': {label: n for label, n in zip(labels, self.buckets) if n}
+        }
+
+
+class RunMetrics:
+    """一次运行的指标（线程安全）；每次运行开始时调用 :meth:`reset`"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._started = time.perf_counter()
+            self._stages: Dict[str, Histogram] = {}
+            self._sources: Dict[str, Dict[str, Histogram]] = {}
+            self._bytes: Dict[str, int] = {}
+            self._tokens: Dict[str, Dict[str, int]] = {}
+
+    def observe(self, stage: str, ms: float, source: Optional[str] = None) -> None:
+        with self._lock:
+            self._stages.setdefault(stage, Histogram()).observe(ms)
+            if source:
+                self._sources.setdefault(source, {}).setdefault(stage, Histogram()).observe(ms)
+
+    @contextmanager
+    def stage(self, name: str, source: Optional[str] = None):
+        """计时一段代码（无论是否抛出异常都会记录）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000, source)
+
+    def add_bytes(self, stage: str, size: int) -> None:
+        with self._lock:
+            self._bytes[stage] = self._bytes.get(stage, 0) + size
+
+    def add_tokens(self, provider: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+        with self._lock:
+            usage = self._tokens.setdefault(provider, {'requests': 0, 'prompt_tokens': 0, 'completion_tokens': 0})
+            usage['requests'] += 1
+            usage['prompt_tokens'] += prompt_tokens or 0
+            usage['completion_tokens'] += completion_tokens or 0
+
+    def report(self) -> Dict:
+        """可直接序列化为 JSON 的运行报告"""
+        with self._lock:
+            return {
+                'wall_ms': round((time.perf_counter() - self._started) * 1000, 1),
+                'stages': {name: histogram.summary() for name, histogram in self._stages.items()},
+                'sources': {
+                    source: {stage: {'count': h.count, 'total_ms': round(h.total, 1), 'max_ms': round(h.max, 1)}
+                             for stage, h in stages.items()}
+                    for source, stages in self._sources.items()
+                },
+                'bytes_downloaded': dict(self._bytes, total=sum(self._bytes.values())),
+                'tokens': {provider: dict(usage) for provider, usage in self._tokens.items()}
+            }
+
+
+def timed(stage: str):
+    """方法装饰器：把调用耗时记入 ``self.metrics`` 的 ``stage`` 阶段"""
+
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                with self.metrics.stage(stage):
+                    return await method(self, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.stage(stage):
+                return method(self, *args, **kwargs)
+        return wrapper
+
+    return decorator
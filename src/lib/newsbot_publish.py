@@ -0,0 +1,39 @@
+"""
+新闻机器人发帖
+
+把一次运行的所有帖子合并成少量多行 insert 请求写入 Supabase，
+并把返回的行对应回每篇文章，便于统计和定位失败的行。
+"""
+
+from typing import Dict, List, Optional
+
+
+def insert_rows(supabase, table: str, rows: List[Dict], match_key: str,
+                batch_size: int = 50) -> List[Optional[Dict]]:
+    """分块批量插入 ``rows``，返回与输入一一对应的已插入行（失败为 None）
+
+    多行 insert 在数据库中是单条语句，任意一行出错会导致整块失败；
+    此时对该块逐行重试，只让真正有问题的行失败。返回的行按 ``match_key``
+    对应回输入。
+    """
+    results: List[Optional[Dict]] = [None] * len(rows)
+
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start:start + batch_size]
+        try:
+            inserted = supabase.table(table).insert(chunk).execute().data or []
+        except Exception as e:
+            print(f"⚠️ 批量写入失败，逐条重试以定位失败的行: {e}")
+            for offset, row in enumerate(chunk):
+                try:
+                    data = supabase.table(table).insert(row).execute().data
+                    results[start + offset] = data[0] if data else None
+                except Exception as row_error:
+                    print(f"❌ 写入失败 ({row.get(match_key)}): {row_error}")
+            continue
+
+        by_key = {row.get(match_key): row for row in inserted}
+        for offset, row in enumerate(chunk):
+            results[start + offset] = by_key.get(row.get(match_key))
+
+    return results
@@ -0,0 +1,262 @@
+"""
+新闻机器人 AI 接口限速
+
+每个服务商（DeepSeek、OpenAI）一个共享的令牌桶限速器，同时限制每分钟
+请求数（RPM）和每分钟 token 数（TPM）。额度充足时请求立即发出，不再固定
+等待；服务商返回的 x-ratelimit-* 响应头会用来校正本地额度，遇到 429 或
+5xx 时按带抖动的指数退避重试，并让同一服务商的其他请求一起暂停。
+
+同步（requests/线程池）与异步（httpx）调用共用同一个限速器实例。
+"""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from newsbot_text import estimate_tokens
+
+# 未配置时使用的每分钟额度，0 表示不限制
+DEFAULT_BUDGETS = {
+    'deepseek': {'rpm': 120, 'tpm': 200000},
+    'openai': {'rpm': 500, 'tpm': 60000},
+}
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_DURATION_RE = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+
+def request_tokens(messages: List[Dict], max_tokens: int = 0) -> int:
+    """一次请求占用的 token 额度：提示词估算值加上 ``max_tokens``（服务商按此预留额度）"""
+    return sum(estimate_tokens(message.get('content') or '') for message in messages) + max_tokens
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """解析 ``retry-after`` / ``x-ratelimit-reset-*``：支持 "2"、"1.5s"、"6m0s"、"20ms" 等格式"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def _header_float(headers, name: str) -> Optional[float]:
+    try:
+        return float(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+def _error_status(error: Exception) -> Optional[int]:
+    """异常对应的 HTTP 状态码（requests/httpx 的 HTTPError 以及 openai SDK 的异常）"""
+    response = getattr(error, 'response', None)
+    return (getattr(response, 'status_code', None) or getattr(error, 'status_code', None)
+            or getattr(error, 'http_status', None))
+
+
+def _error_headers(error: Exception):
+    response = getattr(error, 'response', None)
+    return getattr(response, 'headers', None) or getattr(error, 'headers', None) or {}
+
+
+class TokenBucket:
+    """每分钟额度为 ``per_minute`` 的令牌桶，桶容量即一分钟的额度
+
+    采用预约方式：``reserve`` 立即扣除额度并返回需要等待的秒数，余额可以为负，
+    后来的请求排在其后，因此并发调用者不会同时醒来争抢同一份额度。
+    ``clock`` 为初始时间的来源，之后的时间由调用者传入。
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.set_budget(per_minute)
+        self._level = self.capacity
+        self._updated = clock()
+
+    def set_budget(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+
+    def _refill(self, now: float) -> None:
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        if self.capacity <= 0:
+            return 0.0
+        self._refill(now)
+        self._level -= min(amount, self.capacity)  # 超过整桶的请求最多等满一桶
+        return max(0.0, -self._level / self.rate)
+
+    def sync(self, remaining: float, now: float) -> None:
+        """服务商报告的剩余额度比本地估计少时，以服务商为准"""
+        if self.capacity <= 0:
+            return
+        self._refill(now)
+        self._level = min(self._level, remaining)
+
+
+class ProviderRateLimiter:
+    """单个服务商的 RPM/TPM 限速与退避重试（线程安全，同步和异步调用共用）
+
+    ``clock`` / ``sleep`` 默认为 ``time.monotonic`` / ``time.sleep``，测试时可替换为假时钟。
+    """
+
+    def __init__(self, name: str, rpm: float = 0, tpm: float = 0, max_retries: int = 4,
+                 base_delay: float = 1.0, max_delay: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.name = name
+        self._clock = clock
+        self._sleep = sleep
+        self.requests = TokenBucket(rpm, clock)
+        self.tokens = TokenBucket(tpm, clock)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self._stats = {'requests': 0, 'retries': 0, 'wait_seconds': 0.0}
+
+    def set_budget(self, rpm: Optional[float] = None, tpm: Optional[float] = None) -> None:
+        with self._lock:
+            if rpm is not None:
+                self.requests.set_budget(rpm)
+            if tpm is not None:
+                self.tokens.set_budget(tpm)
+
+    def reserve(self, tokens: int = 0) -> float:
+        """预约一次请求的额度，返回发出请求前需要等待的秒数"""
+        with self._lock:
+            now = self._clock()
+            delay = max(
+                self.requests.reserve(1, now),
+                self.tokens.reserve(tokens, now),
+                self._paused_until - now
+            )
+            self._stats['requests'] += 1
+            self._stats['wait_seconds'] += max(delay, 0.0)
+        return max(delay, 0.0)
+
+    def acquire(self, tokens: int = 0) -> None:
+        delay = self.reserve(tokens)
+        if delay > 0:
+            self._sleep(delay)
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def update_from_headers(self, headers) -> None:
+        """按 x-ratelimit-* 响应头校正额度：limit 更新每分钟预算，remaining 校正当前余额"""
+        if not headers:
+            return
+        with self._lock:
+            now = self._clock()
+            for kind, bucket in (('requests', self.requests), ('tokens', self.tokens)):
+                limit = _header_float(headers, f'x-ratelimit-limit-{kind}')
+                if limit and limit != bucket.capacity:
+                    bucket.set_budget(limit)
+                remaining = _header_float(headers, f'x-ratelimit-remaining-{kind}')
+                if remaining is not None:
+                    bucket.sync(remaining, now)
+
+    def backoff(self, attempt: int, headers=None) -> float:
+        """第 ``attempt`` 次重试前的等待秒数，并让该服务商的其他请求同样暂停
+
+        优先使用服务商给出的 retry-after；否则为 ``base_delay * 2^attempt``
+        内的随机值（full jitter），避免多个请求在同一时刻重试。
+        """
+        headers = headers or {}
+        delay = parse_duration(headers.get('retry-after'))
+        if delay is None:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        delay = min(delay, self.max_delay)
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + delay)
+            self._stats['retries'] += 1
+        return delay
+
+    def _retry_delay(self, attempt: int, status: Optional[int], headers) -> Optional[float]:
+        if status not in RETRY_STATUSES or attempt >= self.max_retries:
+            return None
+        delay = self.backoff(attempt, headers)
+        print(f"⏳ {self.name} 返回 {status}，{delay:.1f} 秒后重试（第 {attempt + 1} 次）")
+        return delay
+
+    def call(self, send: Callable, tokens: int = 0):
+        """限速后调用 ``send()``；响应或异常为 429/5xx 时退避重试，重试耗尽后原样返回或抛出
+
+        ``send`` 可以返回 requests/httpx 的响应，也可以返回 SDK 的结果对象
+        （没有 ``status_code`` 时视为成功）。
+        """
+        attempt = 0
+        while True:
+            self.acquire(tokens)
+            try:
+                response = send()
+            except Exception as e:
+                delay = self._retry_delay(attempt, _error_status(e), _error_headers(e))
+                if delay is None:
+                    raise
+            else:
+                headers = getattr(response, 'headers', None)
+                self.update_from_headers(headers)
+                delay = self._retry_delay(attempt, getattr(response, 'status_code', None), headers)
+                if delay is None:
+                    return response
+                response.close()
+            attempt += 1
+
+    async def acall(self, send: Callable, tokens: int = 0):
+        """异步版 :meth:`call`，``send`` 为返回协程的无参函数"""
+        attempt = 0
+        while True:
+            await self.aacquire(tokens)
+            try:
+                response = await send()
+            except Exception as e:
+                delay = self._retry_delay(attempt, _error_status(e), _error_headers(e))
+                if delay is None:
+                    raise
+            else:
+                headers = getattr(response, 'headers', None)
+                self.update_from_headers(headers)
+                delay = self._retry_delay(attempt, getattr(response, 'status_code', None), headers)
+                if delay is None:
+                    return response
+                await response.aclose()
+            attempt += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._stats, wait_seconds=round(self._stats['wait_seconds'], 3))
+
+
+_limiters: Dict[str, ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str, rpm: Optional[float] = None, tpm: Optional[float] = None) -> ProviderRateLimiter:
+    """返回该服务商在进程内共享的限速器；传入预算时更新已有实例的预算"""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            budget = DEFAULT_BUDGETS.get(provider, {})
+            limiter = _limiters[provider] = ProviderRateLimiter(
+                provider,
+                rpm=budget.get('rpm', 0) if rpm is None else rpm,
+                tpm=budget.get('tpm', 0) if tpm is None else tpm
+            )
+            return limiter
+    if rpm is not None or tpm is not None:
+        limiter.set_budget(rpm, tpm)
+    return limiter
@@ -0,0 +1,293 @@
+"""
+新闻机器人翻译服务路由
+
+在多个 AI 服务商之间分配翻译请求：按配置的优先级选择健康的服务商，
+失败时自动切换到下一个；连续失败或错误率过高的服务商暂停一段时间。
+可选的对冲请求：首选服务商的耗时超过其历史 p95 时，向下一个服务商再发
+一份相同请求，先返回的结果胜出。
+
+耗时从请求真正发出时算起：``send`` 在取得并发名额和限速令牌之后调用
+:func:`sent` 包装的函数，排队等待的时间不计入耗时，也不触发对冲——否则
+负载高时 p95 量的是排队时间，对冲只会让费用翻倍。
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Union
+
+
+class _Attempt:
+    """发往某个服务商的一次请求；``started`` 在请求真正发出时置为当时的时间"""
+
+    def __init__(self, started: Union[Future, asyncio.Future]):
+        self.started = started
+        self.created = time.monotonic()
+
+    def mark(self) -> None:
+        if not self.started.done():
+            self.started.set_result(time.monotonic())
+
+    def start_time(self) -> float:
+        """发出时间；``send`` 没有标记时退回到调用 ``send`` 的时间"""
+        return self.started.result() if self.started.done() else self.created
+
+
+_current_attempt: ContextVar[Optional[_Attempt]] = ContextVar('translation_attempt', default=None)
+
+
+def sent(send: Callable):
+    """包装交给限速器的无参发送函数：被调用（已取得名额和令牌）时标记当前请求开始计时"""
+    def wrapper():
+        attempt = _current_attempt.get()
+        if attempt is not None:
+            attempt.mark()
+        return send()
+    return wrapper
+
+
+class ProviderHealth:
+    """单个服务商最近若干次请求的耗时与成败"""
+
+    def __init__(self, window: int = 100):
+        self.latencies: Dict[str, Deque[float]] = {}
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.window = window
+        self.consecutive_failures = 0
+        self.paused_until = 0.0
+        self.counts = {'requests': 0, 'errors': 0, 'hedges': 0, 'wins': 0}
+
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def percentile(self, kind: str, q: float) -> Optional[float]:
+        samples = sorted(self.latencies.get(kind, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class TranslationRouter:
+    """按优先级、健康状况和耗时在服务商之间路由请求（线程安全，同步和异步共用）
+
+    ``providers`` 按优先级排列。同一类请求（``kind``，如单条翻译与批量翻译）
+    的耗时分别统计；某服务商的样本少于 ``hedge_min_samples`` 时不发对冲请求。
+    连续失败 ``max_consecutive_failures`` 次，或最近错误率超过 ``error_threshold``
+    时，该服务商暂停 ``cooldown`` 秒，期间只在其他服务商都失败时才会被使用。
+    """
+
+    def __init__(self, providers: Sequence[str], hedge: bool = True, hedge_min_samples: int = 20,
+                 error_threshold: float = 0.5, max_consecutive_failures: int = 3, cooldown: float = 60.0):
+        self.providers = list(providers)
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.error_threshold = error_threshold
+        self.max_consecutive_failures = max_consecutive_failures
+        self.cooldown = cooldown
+        self._health = {provider: ProviderHealth() for provider in self.providers}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def order(self) -> List[str]:
+        """本次请求依次尝试的服务商：未暂停的按优先级在前，暂停中的排在最后"""
+        now = time.monotonic()
+        with self._lock:
+            return sorted(self.providers, key=lambda provider: self._health[provider].paused_until > now)
+
+    def hedge_delay(self, provider: str, kind: str) -> Optional[float]:
+        """首选服务商等待多久后发出对冲请求；样本不足时返回 None"""
+        if not self.hedge:
+            return None
+        with self._lock:
+            health = self._health[provider]
+            if len(health.latencies.get(kind, ())) < self.hedge_min_samples:
+                return None
+            return health.percentile(kind, 0.95)
+
+    def record(self, provider: str, kind: str, latency: float, ok: bool) -> None:
+        with self._lock:
+            health = self._health[provider]
+            health.counts['requests'] += 1
+            health.outcomes.append(ok)
+            if ok:
+                health.consecutive_failures = 0
+                health.latencies.setdefault(kind, deque(maxlen=health.window)).append(latency)
+                return
+
+            health.counts['errors'] += 1
+            health.consecutive_failures += 1
+            if (health.consecutive_failures >= self.max_consecutive_failures
+                    or (len(health.outcomes) >= 5 and health.error_rate() > self.error_threshold)):
+                if health.paused_until <= time.monotonic():
+                    print(f"⚠️ 翻译服务 {provider} 连续出错，暂停 {self.cooldown:.0f} 秒")
+                health.paused_until = time.monotonic() + self.cooldown
+                health.outcomes.clear()
+
+    def _count(self, provider: str, field: str) -> None:
+        with self._lock:
+            self._health[provider].counts[field] += 1
+
+    def _timed(self, provider: str, kind: str, send: Callable[[str], str], attempt: Optional[_Attempt] = None) -> str:
+        attempt = attempt or _Attempt(Future())
+        token = _current_attempt.set(attempt)
+        try:
+            result = send(provider)
+        except Exception:
+            self.record(provider, kind, time.monotonic() - attempt.start_time(), False)
+            raise
+        finally:
+            _current_attempt.reset(token)
+        self.record(provider, kind, time.monotonic() - attempt.start_time(), True)
+        return result
+
+    async def _atimed(self, provider: str, kind: str, send: Callable[[str], Awaitable[str]], attempt: _Attempt) -> str:
+        _current_attempt.set(attempt)  # 每个请求在单独的任务（上下文副本）中运行
+        try:
+            result = await send(provider)
+        except asyncio.CancelledError:
+            raise  # 对冲中落败被取消，不计入统计
+        except Exception:
+            self.record(provider, kind, time.monotonic() - attempt.start_time(), False)
+            raise
+        self.record(provider, kind, time.monotonic() - attempt.start_time(), True)
+        return result
+
+    def _submit(self, *args):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="translate-hedge")
+        return self._executor.submit(self._timed, *args)
+
+    @staticmethod
+    def _hedge_wait(attempt: _Attempt, delay: float, waiters: set) -> Optional[float]:
+        """首选请求已发出时返回距对冲的剩余秒数；尚在排队时返回 None，并等待它发出"""
+        if attempt.started.done():
+            return max(0.0, attempt.started.result() + delay - time.monotonic())
+        waiters.add(attempt.started)
+        return None
+
+    def call(self, send: Callable[[str], str], kind: str = 'single') -> str:
+        """依次调用 ``send(provider)`` 直到成功；全部失败时抛出最后一个异常
+
+        同一时刻最多两个请求在途：首选请求超过 p95 未返回时发出一个对冲请求，
+        先成功的结果胜出，另一个请求在后台结束（同步请求无法中途取消）。
+        """
+        queue = self.order()
+        if not queue:
+            raise RuntimeError("没有可用的翻译服务")
+
+        provider = queue.pop(0)
+        delay = self.hedge_delay(provider, kind) if queue else None
+        if delay is None:
+            return self._failover(provider, queue, send, kind)
+
+        primary = _Attempt(Future())
+        pending = {self._submit(provider, kind, send, primary): provider}
+        hedged, last_error = False, None
+        while pending:
+            waiters = set(pending)
+            timeout = self._hedge_wait(primary, delay, waiters) if queue and not hedged else None
+            done, _ = wait(waiters, timeout=timeout, return_when=FIRST_COMPLETED)
+            done.discard(primary.started)
+            if not done and timeout is None:
+                continue  # 首选请求刚刚发出，开始计算对冲等待
+            if not done:
+                hedged = True
+                backup = queue.pop(0)
+                print(f"   ⏱️ {provider} 超过 p95（{delay:.1f} 秒）未返回，对冲请求 {backup}")
+                self._count(backup, 'hedges')
+                pending[self._submit(backup, kind, send, None)] = backup
+                continue
+
+            for future in done:
+                winner = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    last_error = e
+                    continue
+                if hedged:
+                    self._count(winner, 'wins')
+                return result
+
+            if not pending and queue:
+                backup = queue.pop(0)
+                print(f"   ↪️ 翻译失败，切换服务商 {backup}: {last_error}")
+                pending[self._submit(backup, kind, send, None)] = backup
+
+        raise last_error
+
+    def _failover(self, provider: str, queue: List[str], send: Callable[[str], str], kind: str) -> str:
+        """不对冲时在当前线程内依次尝试"""
+        candidates = [provider] + queue
+        for index, candidate in enumerate(candidates):
+            try:
+                return self._timed(candidate, kind, send)
+            except Exception as e:
+                if index == len(candidates) - 1:
+                    raise
+                print(f"   ↪️ {candidate} 翻译失败，切换服务商: {e}")
+
+    async def acall(self, send: Callable[[str], Awaitable[str]], kind: str = 'single') -> str:
+        """异步版 :meth:`call`，对冲胜出后取消落败的请求"""
+        queue = self.order()
+        if not queue:
+            raise RuntimeError("没有可用的翻译服务")
+
+        provider = queue.pop(0)
+        delay = self.hedge_delay(provider, kind) if queue else None
+        loop = asyncio.get_running_loop()
+        primary = _Attempt(loop.create_future())
+        pending = {asyncio.ensure_future(self._atimed(provider, kind, send, primary)): provider}
+        hedged, last_error = False, None
+        try:
+            while pending:
+                waiters = set(pending)
+                timeout = None
+                if delay is not None and queue and not hedged:
+                    timeout = self._hedge_wait(primary, delay, waiters)
+                done, _ = await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                done.discard(primary.started)
+                if not done and timeout is None:
+                    continue  # 首选请求刚刚发出，开始计算对冲等待
+                if not done:
+                    hedged = True
+                    backup = queue.pop(0)
+                    print(f"   ⏱️ {provider} 超过 p95（{delay:.1f} 秒）未返回，对冲请求 {backup}")
+                    self._count(backup, 'hedges')
+                    pending[asyncio.ensure_future(self._atimed(backup, kind, send, _Attempt(loop.create_future())))] = backup
+                    continue
+
+                for task in done:
+                    winner = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    if hedged:
+                        self._count(winner, 'wins')
+                    return result
+
+                if not pending and queue:
+                    backup = queue.pop(0)
+                    print(f"   ↪️ 翻译失败，切换服务商 {backup}: {last_error}")
+                    pending[asyncio.ensure_future(self._atimed(backup, kind, send, _Attempt(loop.create_future())))] = backup
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise last_error
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            result = {}
+            for provider, health in self._health.items():
+                result[provider] = dict(health.counts, error_rate=round(health.error_rate(), 3))
+                for kind in health.latencies:
+                    result[provider][f'{kind}_p50'] = round(health.percentile(kind, 0.5), 3)
+                    result[provider][f'{kind}_p95'] = round(health.percentile(kind, 0.95), 3)
+            return result
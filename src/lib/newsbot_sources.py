@@ -0,0 +1,296 @@
+"""
+新闻机器人新闻源注册表与抓取调度
+
+新闻源不再写死在代码中：优先从本地 JSON 文件（``NEWSBOT_SOURCES_FILE``）
+读取，否则从 Supabase 的 ``news_bot_config`` 表读取 ``news_sources`` 配置项，
+两者都没有时使用内置的默认源。文件内容与配置表同构——一个以 config_key
+为键的 JSON 对象，也可以直接是新闻源数组。
+
+每个源除 RSS 地址与提取规则外还有：
+
+- ``enabled``：是否启用
+- ``weight``：候选文章排序时乘到元数据评分上的权重
+- ``priority``：调度优先级，数值大的先抓取
+- ``fetch_interval_minutes``：两次抓取的最小间隔
+- ``max_articles``：每次最多入选的文章数（默认用 ``max_articles_per_source``）
+
+:class:`SourceScheduler` 根据本地记录的上次抓取时间选出到期的源，每次运行
+最多抓取 ``max_sources_per_run`` 个；连续失败的源按指数退避延后，源数量
+很多时每次运行只处理其中到期的一部分。
+
+常驻进程（见 newsbot_daemon）用 :meth:`SourceScheduler.seconds_until_due` 决定
+下一次运行的时间，各源按自己的间隔被抓取。
+"""
+
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from newsbot_store import SourceSchedule
+
+CONFIG_TABLE = 'news_bot_config'
+SOURCES_KEY = 'news_sources'
+
+# news_bot_config 中已有的配置项与爬取配置键的对应关系；crawler_config 可整体覆盖爬取配置
+REMOTE_CONFIG_KEYS = {
+    'max_articles_per_run': 'total_max_articles',
+    'quality_threshold': 'quality_threshold',
+    'auto_translate': 'auto_translate',
+}
+
+SOURCE_DEFAULTS = {
+    'type': 'rss',                  # rss：RSS源；page：抓取首页链接（NewsBot 使用）
+    'category': '国际新闻',
+    'enabled': True,
+    'weight': 1.0,
+    'priority': 0,
+    'fetch_interval_minutes': 60,
+}
+
+# 英美新闻源配置 - 使用RSS确保稳定性
+# extraction: 该源的正文提取规则（见 newsbot_extract.ExtractionProfile）——
+# domains / selectors / boilerplate / max_paragraphs，以及 use_description
+# （RSS 描述已足够时设为 True，跳过文章页下载）与 min_length（该源正文的最小长度）
+DEFAULT_SOURCES = [
+    {
+        'id': 'bbc_world',
+        'name': 'BBC World News',
+        'rss_url': 'http://feeds.bbci.co.uk/news/world/rss.xml',
+        'category': '国际新闻',
+        'enabled': True,
+        'extraction': {
+            'domains': ['bbc.co.uk', 'bbc.com'],
+            'selectors': ['[data-component="text-block"]'],
+            'boilerplate': [r'sign up for our [^.]{0,60}?newsletter[^.]*\.?']
+        }
+    },
+    {
+        'id': 'cnn_world',
+        'name': 'CNN World',
+        'rss_url': 'http://rss.cnn.com/rss/cnn_world.rss',
+        'category': '国际新闻',
+        'enabled': True,
+        'extraction': {
+            'domains': ['cnn.com'],
+            'selectors': ['.article__content .paragraph', '.story-body'],
+            'boilerplate': [r'CNN’s [^.]{0,80}? contributed to this report\.?']
+        }
+    },
+    {
+        'id': 'reuters_world',
+        'name': 'Reuters World',
+        'rss_url': 'https://www.reuters.com/tools/rss/world',
+        'category': '国际新闻',
+        'enabled': True,
+        'extraction': {
+            'domains': ['reuters.com'],
+            'selectors': ['[data-testid^="paragraph-"]', '.StandardArticleBody_body'],
+            'boilerplate': [r'(?:Reporting|Editing|Writing) by [^.]*\.', r'Our Standards: The Thomson Reuters Trust Principles\.?']
+        }
+    },
+    {
+        'id': 'guardian_world',
+        'name': 'Guardian World',
+        'rss_url': 'https://www.theguardian.com/world/rss',
+        'category': '国际新闻',
+        'enabled': True,
+        'extraction': {
+            'domains': ['theguardian.com'],
+            'selectors': ['.article-body-commercial-selector p', '.article-body'],
+            'boilerplate': [r'sign up to [^.]{0,80}?newsletter[^.]*\.?'],
+            'max_paragraphs': 40  # 直播稿正文极长，只取前面部分
+        }
+    },
+    {
+        'id': 'ap_news',
+        'name': 'Associated Press',
+        'rss_url': 'https://apnews.com/index.rss',
+        'category': '国际新闻',
+        'enabled': True,
+        'extraction': {
+            'domains': ['apnews.com'],
+            'selectors': ['.RichTextStoryBody p', '.Article p'],
+            'boilerplate': [r'Associated Press writers? [^.]{0,120}? contributed[^.]*\.']
+        }
+    }
+]
+
+# NewsBot 抓取首页链接的中文新闻源
+DEFAULT_PAGE_SOURCES = [
+    {
+        'id': 'bbc_zhongwen',
+        'type': 'page',
+        'name': 'BBC中文',
+        'url': 'https://www.bbc.com/zhongwen/simp',
+        'domain': 'bbc.com'
+    },
+    {
+        'id': 'cctv_news',
+        'type': 'page',
+        'name': '央视新闻',
+        'url': 'https://news.cctv.com/',
+        'domain': 'cctv.com'
+    }
+]
+
+
+def normalize_source(source: Dict) -> Optional[Dict]:
+    """补全默认字段；缺少 id 或地址的条目返回 None"""
+    source = dict(SOURCE_DEFAULTS, **source)
+    address = source.get('rss_url') if source['type'] == 'rss' else source.get('url')
+    if not source.get('id') or not address:
+        print(f"⚠️ 忽略无效的新闻源配置（缺少 id 或地址）: {source.get('name') or source.get('id')}")
+        return None
+    source.setdefault('name', source['id'])
+    if source['type'] == 'page':
+        source.setdefault('domain', urlparse(address).hostname)
+    source['weight'] = float(source['weight'])
+    source['priority'] = int(source['priority'])
+    source['fetch_interval_minutes'] = float(source['fetch_interval_minutes'])
+    return source
+
+
+def read_config_table(supabase) -> Dict[str, Any]:
+    """读取 news_bot_config 表的全部配置项（config_key → config_value）"""
+    rows = supabase.table(CONFIG_TABLE).select("config_key,config_value").execute().data or []
+    return {row['config_key']: row['config_value'] for row in rows}
+
+
+def read_config_file(path: str) -> Dict[str, Any]:
+    """读取本地配置文件：与配置表同构的 JSON 对象，或直接是新闻源数组"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return {SOURCES_KEY: data} if isinstance(data, list) else data
+
+
+def remote_config(values: Dict[str, Any]) -> Dict[str, Any]:
+    """把配置项转换为爬取配置的覆盖值"""
+    overrides = {target: values[key] for key, target in REMOTE_CONFIG_KEYS.items() if key in values}
+    if isinstance(values.get('crawler_config'), dict):
+        overrides.update(values['crawler_config'])
+    return overrides
+
+
+def _name_matches(source: Dict, names: Sequence[str]) -> bool:
+    """配置表中旧的 ``sources`` 项只列出媒体简称（如 "BBC"、"AP"），按 id 前缀匹配"""
+    keys = {source['id'].lower(), source['id'].split('_')[0].lower(), source['name'].lower()}
+    return any(str(name).lower() in keys for name in names)
+
+
+class SourceRegistry:
+    """全部已登记的新闻源；``origin`` 说明来源（file / database / builtin）"""
+
+    def __init__(self, sources: Sequence[Dict], origin: str = 'builtin'):
+        self.origin = origin
+        self._sources: Dict[str, Dict] = {}
+        for source in sources:
+            source = normalize_source(source)
+            if source:
+                self._sources[source['id']] = source
+
+    @classmethod
+    def from_values(cls, values: Dict[str, Any], origin: str,
+                    defaults: Sequence[Dict] = DEFAULT_SOURCES) -> "SourceRegistry":
+        """由配置项构建：有 ``news_sources`` 时使用它，否则使用默认源并按旧的 ``sources`` 名单启用RSS源"""
+        sources = values.get(SOURCES_KEY)
+        if isinstance(sources, list):
+            return cls(sources, origin)
+
+        registry = cls(defaults, 'builtin')
+        names = values.get('sources')
+        if isinstance(names, list):
+            for source in registry.sources('rss'):
+                source['enabled'] = source['enabled'] and _name_matches(source, names)
+        return registry
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def get(self, source_id: str) -> Optional[Dict]:
+        return self._sources.get(source_id)
+
+    def sources(self, kind: str = 'rss') -> List[Dict]:
+        return [source for source in self._sources.values() if source['type'] == kind]
+
+    def enabled(self, kind: str = 'rss') -> List[Dict]:
+        return [source for source in self.sources(kind) if source['enabled']]
+
+
+def load_registry(supabase=None, path: Optional[str] = None,
+                  defaults: Sequence[Dict] = DEFAULT_SOURCES) -> Tuple[SourceRegistry, Dict[str, Any]]:
+    """加载新闻源注册表与爬取配置覆盖值：本地文件 > news_bot_config 表 > 内置默认源
+
+    读取失败时打印警告并回退到内置默认源。
+    """
+    values: Dict[str, Any] = {}
+    origin = 'builtin'
+    try:
+        if path:
+            values, origin = read_config_file(path), 'file'
+        elif supabase is not None:
+            values, origin = read_config_table(supabase), 'database'
+    except Exception as e:
+        print(f"⚠️ 读取新闻源配置失败，使用内置新闻源: {e}")
+        values, origin = {}, 'builtin'
+    return SourceRegistry.from_values(values, origin, defaults), remote_config(values)
+
+
+class SourceScheduler:
+    """选出本次运行应抓取的源
+
+    距上次抓取超过 ``fetch_interval_minutes``（留 ``slack`` 比例的余量，以免
+    运行时间的少许抖动让源整整错过一轮）的源到期；连续失败 n 次的源间隔乘以
+    2^n，最长 ``max_backoff`` 秒。到期的源按优先级、逾期程度、权重排序。
+    """
+
+    def __init__(self, store: Optional[SourceSchedule] = None, slack: float = 0.1,
+                 max_backoff: float = 24 * 3600):
+        self.store = store
+        self.slack = slack
+        self.max_backoff = max_backoff
+
+    def next_due(self, source: Dict, last_fetched: float, failures: int) -> float:
+        interval = source['fetch_interval_minutes'] * 60 * (1 - self.slack)
+        if failures:
+            interval = min(interval * 2 ** failures, max(self.max_backoff, interval))
+        return last_fetched + interval
+
+    def due(self, sources: Sequence[Dict], limit: Optional[int] = None, now: Optional[float] = None) -> List[Dict]:
+        now = now or time.time()
+        states = self.store.states() if self.store else {}
+        ranked = []
+        for source in sources:
+            if not source.get('enabled', True):
+                continue
+            state = states.get(source['id'])
+            if state is None:
+                ranked.append((source, float('inf')))  # 从未抓取过
+                continue
+            next_due = self.next_due(source, *state)
+            if next_due <= now:
+                interval = max(source['fetch_interval_minutes'] * 60, 1.0)
+                ranked.append((source, (now - next_due) / interval))
+
+        # 同优先级、同逾期程度时随机排序，避免截断时总是同一批源落选
+        ranked.sort(key=lambda item: (-item[0].get('priority', 0), -item[1], -item[0].get('weight', 1.0), random.random()))
+        selected = [source for source, _ in ranked]
+        return selected[:limit] if limit else selected
+
+    def seconds_until_due(self, sources: Sequence[Dict], now: Optional[float] = None) -> float:
+        """距最早一个源到期还有多少秒（已有到期的源时为 0，没有启用的源时为 inf）"""
+        now = now or time.time()
+        states = self.store.states() if self.store else {}
+        waits = [
+            self.next_due(source, *states[source['id']]) - now if source['id'] in states else 0.0
+            for source in sources if source.get('enabled', True)
+        ]
+        return max(0.0, min(waits)) if waits else float('inf')
+
+    def record(self, source_id: str, ok: bool) -> None:
+        if self.store:
+            try:
+                self.store.record(source_id, ok)
+            except Exception as e:
+                print(f"⚠️ 保存抓取调度状态失败: {e}")
@@ -0,0 +1,306 @@
+"""
+新闻机器人本地持久化存储 (SQLite)
+
+Serverless 环境中只有临时目录可写，默认数据库放在系统临时目录下，
+可通过 NEWSBOT_CACHE_DB 环境变量指定其他位置。同一容器内的多次运行
+会复用这些数据；即使数据丢失也只会退化为"无缓存"行为。
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+def default_cache_path() -> str:
+    return os.getenv("NEWSBOT_CACHE_DB") or os.path.join(tempfile.gettempdir(), "newsbot_cache.sqlite3")
+
+
+class _SQLiteStore:
+    """线程安全的 SQLite 存储基类，子类通过 ``_schema`` 声明建表语句。"""
+
+    _schema = ""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_cache_path()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self._schema)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class HTTPCache(_SQLiteStore):
+    """HTTP 条件请求缓存
+
+    按 URL 保存服务器返回的 ETag / Last-Modified，下次请求时携带
+    If-None-Match / If-Modified-Since。``payload`` 用于保存解析后的结果
+    （例如提取好的正文），服务器返回 304 时可直接复用而无需重新解析。
+    """
+
+    _schema = """
+        create table if not exists http_cache (
+            url text primary key,
+            etag text,
+            last_modified text,
+            payload text,
+            updated_at real not null
+        );
+    """
+
+    def __init__(self, path: Optional[str] = None, max_age: float = 7 * 24 * 3600):
+        super().__init__(path)
+        self.max_age = max_age
+        self.prune()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        with self._lock:
+            row = self._conn.execute(
+                "select etag, last_modified from http_cache where url = ?", (url,)
+            ).fetchone()
+
+        headers = {}
+        if row:
+            etag, last_modified = row
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def payload(self, url: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("select payload from http_cache where url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def store(self, url: str, headers, payload: Optional[str] = None) -> None:
+        """保存响应的校验信息；服务器未提供 ETag/Last-Modified 时不缓存。"""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "insert or replace into http_cache (url, etag, last_modified, payload, updated_at) "
+                "values (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, payload, time.time()),
+            )
+
+    def touch(self, url: str, headers=None) -> None:
+        """服务器返回 304 时刷新记录的时间（304 带有新的 ETag/Last-Modified 时一并更新），
+        仍然有效的缓存不会因为一直未变化而被 :meth:`prune` 清除。"""
+        headers = headers or {}
+        with self._lock:
+            self._conn.execute(
+                "update http_cache set etag = coalesce(?, etag), last_modified = coalesce(?, last_modified), "
+                "updated_at = ? where url = ?",
+                (headers.get("ETag"), headers.get("Last-Modified"), time.time(), url),
+            )
+
+    def prune(self) -> None:
+        with self._lock:
+            self._conn.execute("delete from http_cache where updated_at < ?", (time.time() - self.max_age,))
+
+
+class TranslationCache(_SQLiteStore):
+    """翻译结果缓存：进程内 LRU + SQLite 持久层，两层都按 TTL 过期
+
+    缓存键由 (provider, model, text_type, 原文 SHA-256) 组成，
+    同一篇新闻在多次运行中只需翻译一次。
+    """
+
+    _schema = """
+        create table if not exists translation_cache (
+            cache_key text primary key,
+            translation text not null,
+            created_at real not null
+        );
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 512, ttl: float = 7 * 24 * 3600):
+        super().__init__(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self.reset_stats()
+        with self._lock:
+            self._conn.execute("delete from translation_cache where created_at < ?", (time.time() - ttl,))
+
+    @staticmethod
+    def make_key(provider: str, model: str, text_type: str, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{provider}:{model}:{text_type}:{digest}"
+
+    def get(self, key: str) -> Optional[str]:
+        expires_before = time.time() - self.ttl
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                translation, created_at = cached
+                if created_at >= expires_before:
+                    self._memory.move_to_end(key)
+                    self._hits_memory += 1
+                    return translation
+                del self._memory[key]
+
+            row = self._conn.execute(
+                "select translation, created_at from translation_cache where cache_key = ? and created_at >= ?",
+                (key, expires_before),
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+
+            self._hits_disk += 1
+            self._remember(key, row[0], row[1])
+            return row[0]
+
+    def set(self, key: str, translation: str) -> None:
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, translation, created_at)
+            self._conn.execute(
+                "insert or replace into translation_cache (cache_key, translation, created_at) values (?, ?, ?)",
+                (key, translation, created_at),
+            )
+
+    def _remember(self, key: str, translation: str, created_at: float) -> None:
+        self._memory[key] = (translation, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def reset_stats(self) -> None:
+        self._hits_memory = 0
+        self._hits_disk = 0
+        self._misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self._hits_memory + self._hits_disk + self._misses
+        hits = self._hits_memory + self._hits_disk
+        return {
+            "hits": hits,
+            "memory_hits": self._hits_memory,
+            "disk_hits": self._hits_disk,
+            "misses": self._misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+class FeedIndex(_SQLiteStore):
+    """RSS 增量抓取索引：每个源的游标与已处理条目的 GUID
+
+    游标是该源已处理条目中最新的发布时间。早于 ``游标 - grace`` 的条目
+    视为旧条目直接跳过；其余条目再按 GUID 判断是否处理过（个别源会晚于
+    发布时间才把条目加入 RSS，``grace`` 用于容纳这种情况）。
+    """
+
+    _schema = """
+        create table if not exists feed_entries (
+            feed_id text not null,
+            guid text not null,
+            published_time real,
+            seen_at real not null,
+            primary key (feed_id, guid)
+        );
+        create table if not exists feed_cursors (
+            feed_id text primary key,
+            published_time real not null,
+            updated_at real not null
+        );
+    """
+
+    def __init__(self, path: Optional[str] = None, grace: float = 6 * 3600, max_age: float = 30 * 24 * 3600):
+        super().__init__(path)
+        self.grace = grace
+        with self._lock:
+            self._conn.execute("delete from feed_entries where seen_at < ?", (time.time() - max_age,))
+
+    def cursor(self, feed_id: str) -> float:
+        with self._lock:
+            row = self._conn.execute(
+                "select published_time from feed_cursors where feed_id = ?", (feed_id,)
+            ).fetchone()
+        return row[0] if row else 0.0
+
+    def new_entries(self, feed_id: str, entries: List[Dict]) -> List[Dict]:
+        """返回未处理过的条目，按发布时间从旧到新排列
+
+        条目需包含 ``guid`` 与 ``published_time``（未知时为 0，这类条目只按 GUID 判断）。
+        """
+        oldest = self.cursor(feed_id) - self.grace
+        recent = [entry for entry in entries if not entry['published_time'] or entry['published_time'] > oldest]
+        guids = [entry['guid'] for entry in recent]
+
+        seen = set()
+        with self._lock:
+            # SQLite 默认最多 999 个绑定参数
+            for start in range(0, len(guids), 900):
+                chunk = guids[start:start + 900]
+                rows = self._conn.execute(
+                    f"select guid from feed_entries where feed_id = ? and guid in ({','.join('?' * len(chunk))})",
+                    (feed_id, *chunk),
+                ).fetchall()
+                seen.update(row[0] for row in rows)
+
+        return sorted((entry for entry in recent if entry['guid'] not in seen), key=lambda entry: entry['published_time'])
+
+    def mark_seen(self, feed_id: str, entries: List[Dict]) -> None:
+        """记录已处理的条目并推进游标"""
+        if not entries:
+            return
+        now = time.time()
+        newest = max(entry['published_time'] for entry in entries)
+        with self._lock:
+            self._conn.execute("begin")
+            try:
+                self._conn.executemany(
+                    "insert or ignore into feed_entries (feed_id, guid, published_time, seen_at) values (?, ?, ?, ?)",
+                    [(feed_id, entry['guid'], entry['published_time'], now) for entry in entries],
+                )
+                self._conn.execute(
+                    "insert into feed_cursors (feed_id, published_time, updated_at) values (?, ?, ?) "
+                    "on conflict(feed_id) do update set "
+                    "published_time = max(published_time, excluded.published_time), updated_at = excluded.updated_at",
+                    (feed_id, newest, now),
+                )
+                self._conn.execute("commit")
+            except Exception:
+                self._conn.execute("rollback")
+                raise
+
+
+class SourceSchedule(_SQLiteStore):
+    """每个新闻源最近一次抓取的时间与连续失败次数，供调度器判断哪些源到期"""
+
+    _schema = """
+        create table if not exists source_schedule (
+            source_id text primary key,
+            last_fetched real not null,
+            failures integer not null default 0
+        );
+    """
+
+    def states(self) -> Dict[str, Tuple[float, int]]:
+        """全部源的 (上次抓取时间, 连续失败次数)"""
+        with self._lock:
+            rows = self._conn.execute("select source_id, last_fetched, failures from source_schedule").fetchall()
+        return {source_id: (last_fetched, failures) for source_id, last_fetched, failures in rows}
+
+    def record(self, source_id: str, ok: bool, now: Optional[float] = None) -> None:
+        """记录一次抓取：成功时清零失败次数，失败时加一"""
+        with self._lock:
+            self._conn.execute(
+                "insert into source_schedule (source_id, last_fetched, failures) values (?, ?, ?) "
+                "on conflict(source_id) do update set last_fetched = excluded.last_fetched, "
+                "failures = case when excluded.failures = 0 then 0 else source_schedule.failures + 1 end",
+                (source_id, now or time.time(), 0 if ok else 1),
+            )
@@ -0,0 +1,159 @@
+"""
+新闻机器人摘要
+
+本地抽取式摘要：按中英文句末标点切句，以 TF-IDF 余弦相似度构建句子图，
+用带导语偏置的 TextRank 给句子打分（新闻的要点通常在开头），在字数预算内
+选出得分最高且互不重复的句子，按原文顺序拼接。全程不调用 AI 接口。
+
+也可以在翻译正文的同一次请求中让 AI 附带摘要：译文之后另起一行，以
+``AI_SUMMARY_MARKER`` 开头；:func:`split_ai_summary` 把两部分拆开。
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from newsbot_text import split_sentences
+
+AI_SUMMARY_MARKER = '【摘要】'
+AI_SUMMARY_INSTRUCTION = f'译文之后另起一行，以“{AI_SUMMARY_MARKER}”开头，用不超过150字概括全文要点'
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_CJK_RUN_RE = re.compile(r'[㐀-䶿一-鿿]+')
+_CJK_END = frozenset('。！？；…」』”')
+_PARAGRAPH_RE = re.compile(r'\n+')
+_STOPWORDS = frozenset("""
+a an and are as at be been but by for from had has have he her his i in into is it its of on or
+our said says she that the their them they this to was we were which who will with would you
+""".split())
+
+
+def split_ai_summary(text: str) -> Tuple[str, Optional[str]]:
+    """拆分 "译文 + 【摘要】..." 形式的AI输出，返回 (译文, 摘要)；没有摘要时摘要为 None"""
+    if not text or AI_SUMMARY_MARKER not in text:
+        return text, None
+    body, _, summary = text.rpartition(AI_SUMMARY_MARKER)
+    return body.strip(), summary.strip() or None
+
+
+def _terms(sentence: str) -> List[str]:
+    """句子的检索词：英文单词（去停用词）与中文相邻两字组合"""
+    terms = [word for word in _WORD_RE.findall(sentence.lower()) if len(word) > 1 and word not in _STOPWORDS]
+    for run in _CJK_RUN_RE.findall(sentence):
+        if len(run) == 1:
+            terms.append(run)
+        else:
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+def _sentences(text: str) -> List[str]:
+    return [sentence for paragraph in _PARAGRAPH_RE.split(text) for sentence in split_sentences(paragraph)]
+
+
+def _join(sentences: List[str]) -> str:
+    """中文句子直接相连，英文句子之间加空格"""
+    result = ''
+    for sentence in sentences:
+        if result and result[-1] not in _CJK_END:
+            result += ' '
+        result += sentence
+    return result
+
+
+class ExtractiveSummarizer:
+    """抽取式摘要器
+
+    ``max_sentences`` / ``max_chars`` 限制摘要的句数和字数；``lead_bias``
+    为随机跳转时偏向前几句的程度（0 即标准 TextRank）；与已选句子的相似度
+    超过 ``redundancy`` 的句子不再入选。只对前 ``max_candidates`` 句建图，
+    长篇报道的耗时因此有上限（句子图的构建与句数成平方关系）。
+    """
+
+    def __init__(self, max_sentences: int = 3, max_chars: int = 200, damping: float = 0.85,
+                 lead_bias: float = 1.0, redundancy: float = 0.6, iterations: int = 30,
+                 max_candidates: int = 60):
+        self.max_sentences = max_sentences
+        self.max_chars = max_chars
+        self.damping = damping
+        self.lead_bias = lead_bias
+        self.redundancy = redundancy
+        self.iterations = iterations
+        self.max_candidates = max_candidates
+
+    @staticmethod
+    def _vectors(sentences: List[str]) -> List[Dict[str, float]]:
+        """每个句子的 TF-IDF 向量（已归一化）"""
+        counts = [Counter(_terms(sentence)) for sentence in sentences]
+        document_frequency = Counter(term for count in counts for term in count)
+        total = len(sentences)
+        vectors = []
+        for count in counts:
+            vector = {term: tf * math.log(1 + total / document_frequency[term]) for term, tf in count.items()}
+            norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+            vectors.append({term: weight / norm for term, weight in vector.items()})
+        return vectors
+
+    @staticmethod
+    def _similarity(a: Dict[str, float], b: Dict[str, float]) -> float:
+        if len(a) > len(b):
+            a, b = b, a
+        return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+    def rank(self, vectors: List[Dict[str, float]]) -> List[float]:
+        """带导语偏置的 TextRank 得分"""
+        n = len(vectors)
+        weights = [[0.0] * n for _ in range(n)]
+        for i in range(n):
+            for j in range(i + 1, n):
+                weights[i][j] = weights[j][i] = self._similarity(vectors[i], vectors[j])
+        out_weight = [sum(row) or 1.0 for row in weights]
+        incoming = [[(j, weights[j][i] / out_weight[j]) for j in range(n) if weights[j][i]] for i in range(n)]
+
+        prior = [1.0 / (i + 1) ** self.lead_bias for i in range(n)]
+        prior_total = sum(prior)
+        prior = [p / prior_total for p in prior]
+
+        scores = prior[:]
+        for _ in range(self.iterations):
+            scores = [
+                (1 - self.damping) * prior[i]
+                + self.damping * sum(weight * scores[j] for j, weight in incoming[i])
+                for i in range(n)
+            ]
+        return scores
+
+    def summarize(self, text: str) -> str:
+        if not text:
+            return ""
+
+        sentences = _sentences(text)[:self.max_candidates]
+        if len(sentences) <= 1:
+            return self._truncate(text.strip())
+
+        vectors = self._vectors(sentences)
+        scores = self.rank(vectors)
+
+        chosen: List[int] = []
+        length = 0
+        for index in sorted(range(len(sentences)), key=lambda i: -scores[i]):
+            if len(chosen) >= self.max_sentences:
+                break
+            if length + len(sentences[index]) > self.max_chars:
+                continue
+            if any(self._similarity(vectors[index], vectors[other]) > self.redundancy for other in chosen):
+                continue
+            chosen.append(index)
+            length += len(sentences[index]) + 1
+
+        if not chosen:  # 每句都超过字数预算：截断得分最高的一句
+            return self._truncate(sentences[max(range(len(sentences)), key=lambda i: scores[i])])
+        return _join([sentences[i] for i in sorted(chosen)])
+
+    def _truncate(self, text: str) -> str:
+        return text[:self.max_chars] + "..." if len(text) > self.max_chars else text
+
+
+def summarize(text: str, max_sentences: int = 3, max_chars: int = 200) -> str:
+    return ExtractiveSummarizer(max_sentences, max_chars).summarize(text)
@@ -0,0 +1,183 @@
+"""
+新闻机器人文本工具
+
+提供中英文通用的句子切分、token 估算以及按 token 预算分段，
+供长文翻译等需要控制单次请求长度的场景使用；以及每篇抓取文章都要
+经过的正文清理和关键词计数。
+"""
+
+import re
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+_CJK_RE = re.compile(r'[　-〿㐀-䶿一-鿿＀-￯]')
+_PARAGRAPH_RE = re.compile(r'\n\s*\n|\r?\n')
+# 英文句末标点后需有空白（可带一个右引号）；中文句末标点后直接切分
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+|(?<=[.!?]["\'”’])\s+|(?<=[。！？；])')
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算 token 数：中日韩字符约 1 字 1 token，其余约 4 字符 1 token。"""
+    cjk = len(_CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in _SENTENCE_SPLIT_RE.split(text) if sentence and sentence.strip()]
+
+
+def _hard_split(sentence: str, max_tokens: int) -> Iterator[str]:
+    """超长句子按词（无空格时按字符）强制切开"""
+    words = sentence.split(' ')
+    if len(words) == 1:
+        step = max(1, max_tokens)
+        for start in range(0, len(sentence), step):
+            yield sentence[start:start + step]
+        return
+
+    current: List[str] = []
+    current_tokens = 0
+    for word in words:
+        tokens = estimate_tokens(word) + 1
+        if current and current_tokens + tokens > max_tokens:
+            yield ' '.join(current)
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += tokens
+    if current:
+        yield ' '.join(current)
+
+
+def _pieces(text: str, max_tokens: int) -> Iterator[Tuple[str, bool]]:
+    """按段落 → 句子 → 词的顺序拆分，返回 (片段, 是否为新段落开头)"""
+    for paragraph in _PARAGRAPH_RE.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if estimate_tokens(paragraph) <= max_tokens:
+            yield paragraph, True
+            continue
+
+        first = True
+        for sentence in split_sentences(paragraph):
+            parts = [sentence] if estimate_tokens(sentence) <= max_tokens else _hard_split(sentence, max_tokens)
+            for part in parts:
+                yield part, first
+                first = False
+
+
+def split_chunks(text: str, max_tokens: int) -> List[Tuple[str, bool]]:
+    """把文本切成每段不超过 ``max_tokens`` 的块，尽量在段落、句子边界处切分；
+    返回 (块, 是否从新段落开始)，供 :func:`join_chunks` 按原样拼回。"""
+    chunks: List[Tuple[str, bool]] = []
+    current = ''
+    current_tokens = 0
+    starts_paragraph = True
+
+    for piece, new_paragraph in _pieces(text, max_tokens):
+        tokens = estimate_tokens(piece)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append((current, starts_paragraph))
+            current, current_tokens = '', 0
+
+        if current:
+            current += ('\n\n' if new_paragraph else ' ') + piece
+        else:
+            current, starts_paragraph = piece, new_paragraph
+        current_tokens += tokens
+
+    if current:
+        chunks.append((current, starts_paragraph))
+    return chunks
+
+
+def join_chunks(chunks: Sequence[str], paragraph_starts: Sequence[bool]) -> str:
+    """拼接（翻译后的）分块：在段落边界切开的用空行连接；段落中间切开的，
+    两侧都是中日韩字符时直接相连，否则（如翻译失败保留的英文原文）用空格分隔"""
+    parts: List[str] = []
+    for index, (chunk, new_paragraph) in enumerate(zip(chunks, paragraph_starts)):
+        if index and parts[-1] and chunk:
+            if new_paragraph:
+                parts.append('\n\n')
+            elif not (_CJK_RE.match(parts[-1][-1]) and _CJK_RE.match(chunk[0])):
+                parts.append(' ')
+        parts.append(chunk)
+    return ''.join(parts)
+
+
+# ----------------------------------------------------------------------
+# 文本规范化：空白折叠、样板文字移除、关键词计数
+# ----------------------------------------------------------------------
+
+# 广告和版权信息（作用于空白已折叠的文本）
+BOILERPLATE_PATTERNS = (
+    r'subscribe to.*?newsletter',
+    r'follow us on.*?twitter',
+    r'copyright.*?\d{4}',
+    r'all rights reserved',
+    r'terms of use',
+    r'privacy policy',
+)
+
+_REGEX_SPECIAL = frozenset('.^$*+?{}[]\\|()')
+
+
+def _literal_prefix(pattern: str) -> Optional[str]:
+    """正则开头的字面量（小写），文本中不含它时该正则不可能匹配；无法确定时返回 None"""
+    if '|' in pattern:
+        return None
+    end = 0
+    while end < len(pattern) and pattern[end] not in _REGEX_SPECIAL:
+        end += 1
+    if end < len(pattern) and pattern[end] in '*?{':
+        end -= 1  # 量词作用于前一个字符，它不是必需的
+    return pattern[:end].lower() or None
+
+
+class TextCleaner:
+    """空白折叠和样板文字移除
+
+    每个样板正则只编译一次。正则开头的字面量作为锚点，先在小写文本中做
+    子串查找：锚点未出现的正则直接跳过，出现了的正则也只从锚点首次出现的
+    位置开始匹配。不区分大小写的正则逐字符扫描，代价远高于子串查找；
+    把所有规则合并成一个交替表达式也不例外（实测比逐个扫描更慢）。
+    """
+
+    def __init__(self, patterns: Sequence[str] = BOILERPLATE_PATTERNS):
+        self._patterns: List[Tuple[Optional[str], re.Pattern]] = [
+            (_literal_prefix(pattern), re.compile(pattern, re.IGNORECASE)) for pattern in patterns
+        ]
+
+    def clean(self, text: str) -> str:
+        if not text:
+            return ""
+        text = ' '.join(text.split())
+        lowered = text.lower()
+        for anchor, pattern in self._patterns:
+            start = 0
+            if anchor is not None:
+                start = lowered.find(anchor)
+                if start < 0:
+                    continue
+                if len(lowered) != len(text):
+                    start = 0  # 少数字符小写后长度会变，位置无法对应时整篇匹配
+            tail, removed = pattern.subn('', text[start:])
+            if removed:
+                text = text[:start] + tail
+                lowered = lowered[:start] + tail.lower()
+        return text.strip()
+
+
+class KeywordCounter:
+    """统计文本中出现了多少个不同的关键词（子串匹配，不区分大小写）
+
+    对小写文本逐个做子串查找：Python 的 ``in`` 比任何等价的正则交替表达式都快。
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(keyword.lower() for keyword in keywords))
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        lowered = text.lower()
+        return sum(1 for keyword in self.keywords if keyword in lowered)
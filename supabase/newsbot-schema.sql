@@ -8,7 +8,8 @@ add column if not exists image_alt text,
 add column if not exists source text,
 add column if not exists original_url text,
 add column if not exists category text default '一般',
-add column if not exists is_bot_post boolean default false;
+add column if not exists is_bot_post boolean default false,
+add column if not exists minhash text; -- 新闻机器人近似去重签名（MinHash，十六进制）
 
 -- 新闻机器人专用表：新闻抓取历史
 create table if not exists public.news_crawl_history (
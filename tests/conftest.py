@@ -0,0 +1,29 @@
+"""pytest 公共配置：让测试能按模块名导入 src/lib 下的实现"""
+
+import os
+import sys
+
+import pytest
+
+_SRC_LIB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "lib")
+if _SRC_LIB_PATH not in sys.path:
+    sys.path.insert(0, _SRC_LIB_PATH)
+
+
+@pytest.fixture
+def make_bot(monkeypatch, tmp_path):
+    """构造不连接外部服务的 EnhancedNewsBot；缓存数据库放在临时目录"""
+    monkeypatch.setenv("SUPABASE_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("SUPABASE_SERVICE_ROLE_KEY", "a.b.c")
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test-key")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("NEWSBOT_SOURCES_FILE", raising=False)
+
+    from enhanced_newsbot import EnhancedNewsBot
+
+    def factory(**config):
+        config.setdefault('cache_db_path', str(tmp_path / "newsbot_cache.db"))
+        config.setdefault('remote_config', False)
+        return EnhancedNewsBot(config)
+
+    return factory
@@ -0,0 +1,91 @@
+"""批量翻译：响应解析与逐条翻译回退"""
+
+import asyncio
+
+from enhanced_newsbot import EnhancedNewsBot
+
+parse = EnhancedNewsBot._parse_batch_translations
+
+
+def test_parse_complete_response():
+    content = '{"translations": [{"id": 0, "text": "标题"}, {"id": 1, "text": " 正文 "}]}'
+    assert parse(content, 2) == ["标题", "正文"]
+
+
+def test_parse_fenced_response():
+    content = '```json\n{"translations": [{"id": 0, "text": "标题"}]}\n```'
+    assert parse(content, 1) == ["标题"]
+
+
+def test_parse_bare_list():
+    assert parse('[{"id": 0, "text": "标题"}]', 1) == ["标题"]
+
+
+def test_parse_out_of_order():
+    content = '{"translations": [{"id": 2, "text": "三"}, {"id": 0, "text": "一"}, {"id": 1, "text": "二"}]}'
+    assert parse(content, 3) == ["一", "二", "三"]
+
+
+def test_parse_partial_response():
+    content = '{"translations": [{"id": 1, "text": "二"}]}'
+    assert parse(content, 3) == [None, "二", None]
+
+
+def test_parse_malformed_json():
+    assert parse('{"translations": [{"id": 0, "text": "一"}', 2) == [None, None]
+    assert parse('抱歉，我无法完成翻译', 2) == [None, None]
+    assert parse('{"translations": "一"}', 1) == [None]
+
+
+def test_parse_ignores_invalid_items():
+    content = ('{"translations": [{"id": 5, "text": "越界"}, {"id": -1, "text": "负数"}, '
+               '{"id": "0", "text": "字符串id"}, {"id": 0, "text": ""}, {"id": 1, "text": null}, "x"]}')
+    assert parse(content, 2) == [None, None]
+
+
+def _fallback_bot(make_bot, monkeypatch, batch):
+    bot = make_bot(translation_cache=False, rate_limits={'deepseek': {}})
+    single_calls = []
+
+    async def fake_batch(client, segments):
+        return batch(segments)
+
+    async def fake_single(client, backend, text, text_type, cache_key):
+        single_calls.append((text, text_type))
+        return f"单条:{text}"
+
+    monkeypatch.setattr(bot, '_atranslate_batch', fake_batch)
+    monkeypatch.setattr(bot, '_atranslate_uncached', fake_single)
+    return bot, single_calls
+
+
+def test_missing_items_fall_back_to_single_requests(make_bot, monkeypatch):
+    bot, single_calls = _fallback_bot(make_bot, monkeypatch, lambda segments: ["批量:一", None, "批量:三"])
+    segments = [("one", "标题"), ("two", "正文"), ("three", "标题")]
+
+    results = asyncio.run(bot.atranslate_batch(None, segments))
+
+    assert results == ["批量:一", "单条:two", "批量:三"]
+    assert single_calls == [("two", "正文")]
+
+
+def test_failed_batch_falls_back_for_every_segment(make_bot, monkeypatch):
+    def fail(segments):
+        raise RuntimeError("boom")
+
+    bot, single_calls = _fallback_bot(make_bot, monkeypatch, fail)
+    segments = [("one", "标题"), ("two", "正文")]
+
+    results = asyncio.run(bot.atranslate_batch(None, segments))
+
+    assert results == ["单条:one", "单条:two"]
+    assert sorted(single_calls) == [("one", "标题"), ("two", "正文")]
+
+
+def test_empty_segments_are_not_requested(make_bot, monkeypatch):
+    bot, single_calls = _fallback_bot(make_bot, monkeypatch, lambda segments: [f"批量:{t}" for t, _ in segments])
+
+    results = asyncio.run(bot.atranslate_batch(None, [("", "正文"), ("one", "标题")]))
+
+    assert results == ["", "批量:one"]
+    assert single_calls == []
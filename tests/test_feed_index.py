@@ -0,0 +1,99 @@
+"""增量抓取索引：条目只在发帖完成后记为已处理"""
+
+from newsbot_store import FeedIndex
+
+HOUR = 3600
+NOW = 1_700_000_000
+
+
+def entry(guid, published_time, source_id='bbc'):
+    return {'guid': guid, 'link': f"https://example.com/{guid}", 'source_id': source_id,
+            'published_time': published_time}
+
+
+def guids(entries):
+    return [e['guid'] for e in entries]
+
+
+def test_new_entries_sorted_oldest_first(tmp_path):
+    index = FeedIndex(str(tmp_path / "feeds.db"))
+    entries = [entry('b', NOW), entry('a', NOW - HOUR), entry('c', 0)]
+    assert guids(index.new_entries('bbc', entries)) == ['c', 'a', 'b']
+
+
+def test_mark_seen_filters_by_guid_and_cursor(tmp_path):
+    index = FeedIndex(str(tmp_path / "feeds.db"), grace=6 * HOUR)
+    index.mark_seen('bbc', [entry('a', NOW)])
+    assert index.cursor('bbc') == NOW
+
+    entries = [
+        entry('a', NOW),                    # 已处理
+        entry('late', NOW - 2 * HOUR),      # 在宽限期内，按GUID判断
+        entry('old', NOW - 7 * HOUR),       # 早于游标减宽限期
+        entry('undated', 0),                # 无发布时间，只按GUID判断
+        entry('new', NOW + HOUR),
+    ]
+    assert guids(index.new_entries('bbc', entries)) == ['undated', 'late', 'new']
+    # 各源的索引互不影响
+    assert guids(index.new_entries('cnn', [entry('a', NOW, 'cnn')])) == ['a']
+
+
+def test_cursor_never_moves_backwards(tmp_path):
+    index = FeedIndex(str(tmp_path / "feeds.db"))
+    index.mark_seen('bbc', [entry('a', NOW)])
+    index.mark_seen('bbc', [entry('b', NOW - HOUR)])
+    assert index.cursor('bbc') == NOW
+
+
+def test_index_persists_across_instances(tmp_path):
+    path = str(tmp_path / "feeds.db")
+    FeedIndex(path).mark_seen('bbc', [entry('a', NOW)])
+    assert FeedIndex(path).new_entries('bbc', [entry('a', NOW)]) == []
+
+
+def _run_entries(bot, entries, passed):
+    """模拟一次运行：entries 参与排名，passed 通过筛选等待发帖"""
+    bot._pending_entries = entries
+    bot._retry_entries = {bot._entry_key(e) for e in passed}
+
+
+def test_entries_marked_seen_only_after_commit(make_bot):
+    bot = make_bot()
+    entries = [entry('a', NOW), entry('b', NOW)]
+    _run_entries(bot, entries, passed=entries)
+
+    assert guids(bot._new_entries({'id': 'bbc', 'name': 'BBC'}, entries)) == ['a', 'b']
+
+    bot.commit_seen_entries(entries)
+    assert bot._new_entries({'id': 'bbc', 'name': 'BBC'}, entries) == []
+    assert bot._pending_entries == [] and bot._retry_entries == set()
+
+
+def test_failed_publish_keeps_entries_eligible(make_bot):
+    bot = make_bot()
+    source = {'id': 'bbc', 'name': 'BBC'}
+    entries = [entry('posted', NOW), entry('rejected', NOW), entry('failed', NOW)]
+
+    # 下载失败的条目同样留到下次运行
+    bot._pending_entries = entries
+    bot._retry_entries = {bot._entry_key(entries[0])}
+    assert bot._accept_content(entries[2], None) is False
+    # 发帖全部失败：只有未通过筛选的条目记为已处理
+    bot.commit_seen_entries([])
+    assert guids(bot._new_entries(source, entries)) == ['posted', 'failed']
+
+    # 下次运行发帖成功后不再处理
+    retry = [entries[0], entries[2]]
+    _run_entries(bot, retry, passed=retry)
+    bot.commit_seen_entries(retry)
+    assert bot._new_entries(source, entries) == []
+
+
+def test_partial_publish_only_marks_published(make_bot):
+    bot = make_bot()
+    source = {'id': 'bbc', 'name': 'BBC'}
+    entries = [entry('a', NOW), entry('b', NOW)]
+    _run_entries(bot, entries, passed=entries)
+
+    bot.commit_seen_entries([entries[1]])
+    assert guids(bot._new_entries(source, entries)) == ['a']
@@ -0,0 +1,188 @@
+"""AI 接口限速：令牌桶补充、RPM/TPM 额度与退避重试（使用假时钟）"""
+
+import asyncio
+
+import pytest
+
+from newsbot_ratelimit import ProviderRateLimiter, TokenBucket, parse_duration
+
+
+class FakeClock:
+    """``sleep`` 只推进时间并记录等待秒数"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    async def aclose(self):
+        self.closed = True
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = FakeResponse(status_code, headers)
+
+
+def make_limiter(clock, **kwargs):
+    return ProviderRateLimiter('test', clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_bucket_refills_at_per_minute_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock)
+
+    assert bucket.reserve(60, clock.now) == 0
+    # 桶已空，每秒补充 1 个
+    assert bucket.reserve(1, clock.now) == pytest.approx(1.0)
+    clock.now += 31
+    assert bucket.reserve(1, clock.now) == 0
+    # 补充不会超过桶容量
+    clock.now += 3600
+    assert bucket.reserve(60, clock.now) == 0
+    assert bucket.reserve(1, clock.now) == pytest.approx(1.0)
+
+
+def test_bucket_oversized_request_waits_at_most_one_bucket():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock)
+    bucket.reserve(60, clock.now)
+    assert bucket.reserve(1000, clock.now) == pytest.approx(60.0)
+
+
+def test_bucket_zero_budget_is_unlimited():
+    clock = FakeClock()
+    bucket = TokenBucket(0, clock)
+    assert bucket.reserve(10 ** 6, clock.now) == 0
+
+
+def test_rpm_limits_requests():
+    clock = FakeClock()
+    limiter = make_limiter(clock, rpm=2)
+
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.sleeps == []
+    # 第三个请求排到 30 秒后，第四个再往后 30 秒
+    assert limiter.reserve() == pytest.approx(30.0)
+    assert limiter.reserve() == pytest.approx(60.0)
+
+
+def test_tpm_limits_tokens():
+    clock = FakeClock()
+    limiter = make_limiter(clock, tpm=600)
+
+    limiter.acquire(tokens=600)
+    limiter.acquire(tokens=100)
+    assert clock.sleeps == [pytest.approx(10.0)]
+    assert limiter.stats()['wait_seconds'] == pytest.approx(10.0)
+
+
+def test_headers_correct_local_budget():
+    clock = FakeClock()
+    limiter = make_limiter(clock, rpm=60)
+
+    limiter.update_from_headers({'x-ratelimit-limit-requests': '120', 'x-ratelimit-remaining-requests': '0'})
+    assert limiter.requests.capacity == 120
+    assert limiter.reserve() == pytest.approx(0.5)
+
+
+def test_call_retries_with_retry_after():
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+    responses = [FakeResponse(429, {'retry-after': '2'}), FakeResponse(503, {'retry-after': '1.5s'}), FakeResponse(200)]
+
+    result = limiter.call(lambda: responses.pop(0))
+
+    assert result.status_code == 200
+    assert clock.sleeps == [2.0, 1.5]
+    assert limiter.stats()['retries'] == 2
+
+
+def test_backoff_pauses_other_requests():
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+    limiter.backoff(0, {'retry-after': '5'})
+    assert limiter.reserve() == pytest.approx(5.0)
+    clock.now += 5
+    assert limiter.reserve() == 0
+
+
+def test_backoff_uses_jittered_exponential_delay(monkeypatch):
+    clock = FakeClock()
+    limiter = make_limiter(clock, base_delay=1.0, max_delay=10.0)
+    bounds = []
+    monkeypatch.setattr('newsbot_ratelimit.random.uniform', lambda low, high: bounds.append(high) or high)
+
+    assert [limiter.backoff(attempt) for attempt in range(5)] == [1, 2, 4, 8, 10]
+    assert bounds == [1, 2, 4, 8, 10]
+
+
+def test_call_gives_up_after_max_retries():
+    clock = FakeClock()
+    limiter = make_limiter(clock, max_retries=2)
+    responses = []
+
+    def send():
+        responses.append(FakeResponse(429, {'retry-after': '1'}))
+        return responses[-1]
+
+    result = limiter.call(send)
+
+    assert result.status_code == 429 and len(responses) == 3
+    assert [response.closed for response in responses] == [True, True, False]
+    assert clock.sleeps == [1.0, 1.0]
+
+
+def test_call_retries_errors_and_raises_others():
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+    calls = []
+
+    def send():
+        calls.append(None)
+        if len(calls) == 1:
+            raise HTTPError(502, {'retry-after': '1'})
+        raise HTTPError(400)
+
+    with pytest.raises(HTTPError):
+        limiter.call(send)
+    assert len(calls) == 2 and clock.sleeps == [1.0]
+
+
+def test_acall_retries():
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+    responses = [FakeResponse(429, {'retry-after': '0'}), FakeResponse(200)]
+
+    async def send():
+        return responses.pop(0)
+
+    result = asyncio.run(limiter.acall(send))
+    assert result.status_code == 200
+    assert limiter.stats() == {'requests': 2, 'retries': 1, 'wait_seconds': 0.0}
+
+
+def test_parse_duration():
+    assert parse_duration('2') == 2.0
+    assert parse_duration('6m0s') == 360.0
+    assert parse_duration('20ms') == pytest.approx(0.02)
+    assert parse_duration('soon') is None
+    assert parse_duration(None) is None
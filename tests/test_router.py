@@ -0,0 +1,163 @@
+"""翻译服务路由：失败切换、对冲请求与落败请求的取消（使用假服务商）"""
+
+import asyncio
+import time
+
+import pytest
+
+from newsbot_router import TranslationRouter, sent
+
+
+class ProviderError(Exception):
+    pass
+
+
+class FakeProviders:
+    """按服务商配置耗时与是否失败；请求经 :func:`sent` 发出，与真实调用方式一致"""
+
+    def __init__(self, latency=None, fail=(), queue_delay=0.0):
+        self.latency = latency or {}
+        self.fail = set(fail)
+        self.queue_delay = queue_delay  # 模拟等待并发名额和限速令牌的时间
+        self.calls = []
+        self.cancelled = []
+        self.finished = []
+
+    def _result(self, provider):
+        if provider in self.fail:
+            raise ProviderError(provider)
+        self.finished.append(provider)
+        return f"{provider}:译文"
+
+    def send(self, provider):
+        self.calls.append(provider)
+        time.sleep(self.queue_delay)
+
+        def request():
+            time.sleep(self.latency.get(provider, 0))
+            return self._result(provider)
+        return sent(request)()
+
+    async def asend(self, provider):
+        self.calls.append(provider)
+        await asyncio.sleep(self.queue_delay)
+
+        async def request():
+            try:
+                await asyncio.sleep(self.latency.get(provider, 0))
+            except asyncio.CancelledError:
+                self.cancelled.append(provider)
+                raise
+            return self._result(provider)
+        return await sent(request)()
+
+
+def hedging_router(p95=0.02, samples=3):
+    router = TranslationRouter(['deepseek', 'openai'], hedge_min_samples=samples)
+    for _ in range(samples):
+        router.record('deepseek', 'single', p95, True)
+    return router
+
+
+def test_failover_on_error():
+    router = TranslationRouter(['deepseek', 'openai'])
+    providers = FakeProviders(fail={'deepseek'})
+
+    assert router.call(providers.send) == "openai:译文"
+    assert providers.calls == ['deepseek', 'openai']
+    assert router.stats()['deepseek']['errors'] == 1
+
+
+def test_async_failover_on_error():
+    router = TranslationRouter(['deepseek', 'openai'])
+    providers = FakeProviders(fail={'deepseek'})
+
+    assert asyncio.run(router.acall(providers.asend)) == "openai:译文"
+    assert providers.calls == ['deepseek', 'openai']
+    assert router.stats()['deepseek']['errors'] == 1
+
+
+def test_all_providers_failing_raises_last_error():
+    router = TranslationRouter(['deepseek', 'openai'])
+    providers = FakeProviders(fail={'deepseek', 'openai'})
+
+    with pytest.raises(ProviderError, match='openai'):
+        router.call(providers.send)
+    with pytest.raises(ProviderError, match='openai'):
+        asyncio.run(router.acall(providers.asend))
+
+
+def test_failing_provider_is_paused():
+    router = TranslationRouter(['deepseek', 'openai'], max_consecutive_failures=2, cooldown=60)
+    providers = FakeProviders(fail={'deepseek'})
+
+    router.call(providers.send)
+    router.call(providers.send)
+    assert router.order() == ['openai', 'deepseek']
+    providers.calls.clear()
+    router.call(providers.send)
+    assert providers.calls == ['openai']
+
+
+def test_no_hedge_without_enough_samples():
+    router = hedging_router(samples=3)
+    router.hedge_min_samples = 10
+    providers = FakeProviders(latency={'deepseek': 0.1})
+
+    assert asyncio.run(router.acall(providers.asend)) == "deepseek:译文"
+    assert providers.calls == ['deepseek']
+
+
+def test_hedge_fires_and_loser_is_cancelled():
+    router = hedging_router(p95=0.02)
+    providers = FakeProviders(latency={'deepseek': 5.0, 'openai': 0.0})
+
+    started = time.monotonic()
+    assert asyncio.run(router.acall(providers.asend)) == "openai:译文"
+
+    assert time.monotonic() - started < 1.0
+    assert providers.calls == ['deepseek', 'openai']
+    assert providers.cancelled == ['deepseek']
+    stats = router.stats()
+    assert stats['openai']['hedges'] == 1 and stats['openai']['wins'] == 1
+    # 被取消的请求不计入统计
+    assert stats['deepseek']['requests'] == 3
+
+
+def test_hedge_loser_cancelled_when_primary_wins():
+    router = hedging_router(p95=0.02)
+    providers = FakeProviders(latency={'deepseek': 0.1, 'openai': 5.0})
+
+    assert asyncio.run(router.acall(providers.asend)) == "deepseek:译文"
+    assert providers.cancelled == ['openai']
+    assert router.stats()['openai']['hedges'] == 1
+    assert router.stats()['deepseek']['wins'] == 1
+
+
+def test_queue_time_does_not_trigger_hedge():
+    router = hedging_router(p95=0.05)
+    # 排队 0.2 秒远超 p95，但请求发出后 0.01 秒即返回
+    providers = FakeProviders(latency={'deepseek': 0.01}, queue_delay=0.2)
+
+    assert asyncio.run(router.acall(providers.asend)) == "deepseek:译文"
+    assert providers.calls == ['deepseek']
+    # 记录的耗时从请求发出时算起
+    assert router.stats()['deepseek']['single_p95'] < 0.2
+
+
+def test_sync_hedge_fires():
+    router = hedging_router(p95=0.02)
+    providers = FakeProviders(latency={'deepseek': 0.5, 'openai': 0.0})
+
+    assert router.call(providers.send) == "openai:译文"
+    assert providers.calls == ['deepseek', 'openai']
+    stats = router.stats()
+    assert stats['openai']['hedges'] == 1 and stats['openai']['wins'] == 1
+
+
+def test_hedge_failure_falls_back_to_primary():
+    router = hedging_router(p95=0.02)
+    providers = FakeProviders(latency={'deepseek': 0.1}, fail={'openai'})
+
+    assert asyncio.run(router.acall(providers.asend)) == "deepseek:译文"
+    assert router.stats()['openai']['errors'] == 1